@@ -60,6 +60,11 @@ class Action(Element):
         raise NotImplementedError(
             "Base action class does not implement behavior")
 
+    def get_required_fields(self):
+        """Return the set of top level resource fields the action uses,
+        None if it may use any part of the resource."""
+        return None
+
     def _run_api(self, cmd, *args, **kw):
         try:
             return cmd(*args, **kw)
@@ -5,40 +5,61 @@ multiple policies on the same resource type.
 """
 import pickle  # nosec nosemgrep
 
+from collections import Counter, OrderedDict
 from datetime import datetime, timedelta
+import json
 import os
 import logging
 import sqlite3
+import threading
+import time
+
+from c7n.utils import chunks
 
 log = logging.getLogger('custodian.cache')
 
 CACHE_NOTIFY = False
 
 
-def factory(config):
+def factory(config, stats=None):
 
     global CACHE_NOTIFY
 
     if not config:
-        return NullCache(None)
+        return NullCache(None, stats)
 
     if not config.cache or not config.cache_period:
         if not CACHE_NOTIFY:
             log.debug("Disabling cache")
             CACHE_NOTIFY = True
-        return NullCache(config)
+        return NullCache(config, stats)
     elif config.cache == 'memory':
         if not CACHE_NOTIFY:
             log.debug("Using in-memory cache")
             CACHE_NOTIFY = True
-        return InMemoryCache(config)
-    return SqlKvCache(config)
+        return InMemoryCache(config, stats)
+    return SqlKvCache(config, stats)
+
+
+def get_max_size(config):
+    """Cache size budget in bytes, from the cache_max_size option in MB."""
+    max_size = getattr(config, 'cache_max_size', None)
+    if not max_size:
+        return None
+    return int(max_size * 1024 * 1024)
 
 
 class Cache:
+    """Cache interface.
 
-    def __init__(self, config):
+    Caches record their effectiveness into stats, a counter of hits,
+    misses, evictions and bytes read/written, which is typically shared
+    across the caches of a policy execution.
+    """
+
+    def __init__(self, config, stats=None):
         self.config = config
+        self.stats = Counter() if stats is None else stats
 
     def load(self):
         return False
@@ -49,6 +70,21 @@ class Cache:
     def save(self, key, data):
         pass
 
+    def get_resources(self, key, ids, id_key):
+        """Get the cached resources of a population with the given ids."""
+        resources = self.get(key)
+        if resources is None:
+            return None
+        id_set = set(ids)
+        return [r for r in resources if r[id_key] in id_set]
+
+    def save_resources(self, key, resources, id_key):
+        """Save a resource population, indexed by the resources' id_key."""
+        return self.save(key, resources)
+
+    def invalidate(self, key, ids=None, id_key=None):
+        """Drop a cached population, or just the resources with the given ids."""
+
     def size(self):
         return 0
 
@@ -69,30 +105,114 @@ class NullCache(Cache):
 
 class InMemoryCache(Cache):
     # Running in a temporary environment, so keep as a cache.
-
-    __shared_state = {}
-
-    def __init__(self, config):
-        super().__init__(config)
+    #
+    # The state is shared for the life of the process (ie. a warm lambda
+    # container or a c7n-org worker), so entries expire per the cache
+    # period, and least recently used entries are evicted to stay
+    # within the cache_max_size budget if one is configured.
+
+    __shared_state = OrderedDict()
+    # encoded key -> (save time, size in bytes)
+    __shared_meta = {}
+    __lock = threading.Lock()
+
+    def __init__(self, config, stats=None):
+        super().__init__(config, stats)
         self.data = self.__shared_state
+        self.meta = self.__shared_meta
+        self.cache_period = getattr(config, 'cache_period', None)
+        self.max_size = get_max_size(config)
 
     def load(self):
         return True
 
     def get(self, key):
-        return self.data.get(encode(key))
+        ekey = encode(key)
+        with self.__lock:
+            value = self.data.get(ekey)
+            if value is not None and self._expired(ekey):
+                self._evict(ekey)
+                value = None
+            if value is None:
+                self.stats['misses'] += 1
+                return None
+            self.data.move_to_end(ekey)
+            self.stats['hits'] += 1
+        return value
 
     def save(self, key, data):
-        self.data[encode(key)] = data
+        ekey = encode(key)
+        # sizing requires serializing, so only pay for it with a budget
+        nbytes = self.max_size and len(encode(data)) or 0
+        with self.__lock:
+            self.data[ekey] = data
+            self.data.move_to_end(ekey)
+            self.meta[ekey] = (time.time(), nbytes)
+            self.stats['bytes-written'] += nbytes
+            if self.max_size:
+                self._evict_to(self.max_size)
+
+    def invalidate(self, key, ids=None, id_key=None):
+        ekey = encode(key)
+        with self.__lock:
+            if ids is None or ekey not in self.data:
+                self.data.pop(ekey, None)
+                self.meta.pop(ekey, None)
+                return
+            id_set = set(ids)
+            self.data[ekey] = [r for r in self.data[ekey] if r[id_key] not in id_set]
 
     def size(self):
         return sum(map(len, self.data.values()))
 
+    def _expired(self, ekey):
+        if not self.cache_period or ekey not in self.meta:
+            return False
+        return time.time() - self.meta[ekey][0] > self.cache_period * 60
+
+    def _evict(self, ekey):
+        self.data.pop(ekey, None)
+        self.meta.pop(ekey, None)
+        self.stats['evictions'] += 1
+
+    def _evict_to(self, max_size):
+        total = sum(nbytes for _, nbytes in self.meta.values())
+        while total > max_size and len(self.data) > 1:
+            ekey = next(iter(self.data))
+            total -= self.meta.get(ekey, (0, 0))[1]
+            self._evict(ekey)
+
 
 def encode(key):
     return pickle.dumps(key, protocol=pickle.HIGHEST_PROTOCOL)  # nosemgrep
 
 
+class ResourceEncoder(json.JSONEncoder):
+    """Json encoding for cached resources which round trips datetimes."""
+
+    def default(self, obj):
+        if isinstance(obj, datetime):
+            return {DATETIME_TAG: obj.isoformat()}
+        return super().default(obj)
+
+
+DATETIME_TAG = '__c7n_datetime__'
+
+
+def _decode_object(obj):
+    if len(obj) == 1 and DATETIME_TAG in obj:
+        return datetime.fromisoformat(obj[DATETIME_TAG])
+    return obj
+
+
+def encode_resource(resource):
+    return json.dumps(resource, cls=ResourceEncoder, separators=(',', ':'))
+
+
+def decode_resource(value):
+    return json.loads(value, object_hook=_decode_object)
+
+
 def resolve_path(path):
     return os.path.abspath(
         os.path.expanduser(
@@ -100,6 +220,13 @@ def resolve_path(path):
 
 
 class SqlKvCache(Cache):
+    """Sqlite backed cache.
+
+    Resource populations are stored a row per resource as json, indexed by
+    their id, so lookups of a few resources by id don't need to decode the
+    whole population, and individual resources can be invalidated. Other
+    values are pickled into a key value table.
+    """
 
     create_table = """
     create table if not exists c7n_cache (
@@ -109,10 +236,31 @@ class SqlKvCache(Cache):
     )
     """
 
-    def __init__(self, config):
-        super().__init__(config)
+    create_resource_table = """
+    create table if not exists c7n_resource_cache (
+        key blob,
+        seq integer,
+        rid text,
+        value text,
+        primary key (key, seq)
+    )
+    """
+
+    create_resource_index = """
+    create index if not exists c7n_resource_cache_rid on c7n_resource_cache (key, rid)
+    """
+
+    # key value marker for populations stored in the resource table
+    resource_marker = b'c7n:resource-rows'
+
+    # sqlite's default host parameter limit is 999
+    lookup_chunk_size = 500
+
+    def __init__(self, config, stats=None):
+        super().__init__(config, stats)
         self.cache_period = config.cache_period
         self.cache_path = resolve_path(config.cache)
+        self.max_size = get_max_size(config)
         self.conn = None
 
     def init(self):
@@ -128,39 +276,149 @@ class SqlKvCache(Cache):
             os.makedirs(os.path.dirname(self.cache_path))
         self.conn = sqlite3.connect(self.cache_path)
         self.conn.execute(self.create_table)
+        self.conn.execute(self.create_resource_table)
+        self.conn.execute(self.create_resource_index)
         with self.conn as cursor:
             result = cursor.execute(
                 'delete from c7n_cache where create_date < ?',
                 [datetime.utcnow() - timedelta(minutes=self.cache_period)])
             if result.rowcount:
                 log.debug('expired %d stale cache entries', result.rowcount)
+            cursor.execute(
+                'delete from c7n_resource_cache where key not in '
+                '(select key from c7n_cache where value = ?)',
+                [sqlite3.Binary(self.resource_marker)])
 
     def load(self):
         if not self.conn:
             self.init()
         return True
 
+    def _get_value(self, cursor, key):
+        r = cursor.execute(
+            'select value, create_date from c7n_cache where key = ?',
+            [sqlite3.Binary(key)]
+        )
+        row = r.fetchone()
+        if row is None:
+            return None
+        value, create_date = row
+        create_date = sqlite3.converters['TIMESTAMP'](create_date.encode('utf8'))
+        if (datetime.utcnow() - create_date).total_seconds() / 60.0 > self.cache_period:
+            return None
+        return value
+
     def get(self, key):
+        ekey = encode(key)
         with self.conn as cursor:
-            r = cursor.execute(
-                'select value, create_date from c7n_cache where key = ?',
-                [sqlite3.Binary(encode(key))]
-            )
-            row = r.fetchone()
-            if row is None:
-                return None
-            value, create_date = row
-            create_date = sqlite3.converters['TIMESTAMP'](create_date.encode('utf8'))
-            if (datetime.utcnow() - create_date).total_seconds() / 60.0 > self.cache_period:
+            value = self._get_value(cursor, ekey)
+            if value is None:
+                self.stats['misses'] += 1
                 return None
+            self.stats['hits'] += 1
+            if value == self.resource_marker:
+                rows = [v for v, in cursor.execute(
+                    'select value from c7n_resource_cache where key = ? order by seq',
+                    [sqlite3.Binary(ekey)])]
+                self.stats['bytes-read'] += sum(map(len, rows))
+                return [decode_resource(v) for v in rows]
+            self.stats['bytes-read'] += len(value)
             return pickle.loads(value)  # nosec nosemgrep
 
+    def get_resources(self, key, ids, id_key):
+        ekey = encode(key)
+        with self.conn as cursor:
+            value = self._get_value(cursor, ekey)
+            if value is None:
+                self.stats['misses'] += 1
+                return None
+            self.stats['hits'] += 1
+            if value != self.resource_marker:
+                self.stats['bytes-read'] += len(value)
+                id_set = set(ids)
+                return [r for r in pickle.loads(value) if r[id_key] in id_set]  # nosec nosemgrep
+            results = []
+            for id_set in chunks(set(map(str, ids)), self.lookup_chunk_size):
+                results.extend(cursor.execute(
+                    'select seq, value from c7n_resource_cache where key = ? and rid in (%s)' % (
+                        ', '.join('?' * len(id_set))),
+                    [sqlite3.Binary(ekey), *id_set]))
+            self.stats['bytes-read'] += sum(len(v) for _, v in results)
+            return [decode_resource(v) for _, v in sorted(results)]
+
     def save(self, key, data, timestamp=None):
         with self.conn as cursor:
             timestamp = timestamp or datetime.utcnow()
+            value = encode(data)
             cursor.execute(
                 'replace into c7n_cache (key, value, create_date) values (?, ?, ?)',
-                (sqlite3.Binary(encode(key)), sqlite3.Binary(encode(data)), timestamp))
+                (sqlite3.Binary(encode(key)), sqlite3.Binary(value), timestamp))
+            self.stats['bytes-written'] += len(value)
+            self._evict_to(cursor)
+
+    def save_resources(self, key, resources, id_key, timestamp=None):
+        try:
+            rows = [(i, str(r[id_key]), encode_resource(r)) for i, r in enumerate(resources)]
+        except (TypeError, KeyError, ValueError):
+            # non dict resources or values without a json encoding
+            return self.save(key, resources, timestamp)
+        with self.conn as cursor:
+            timestamp = timestamp or datetime.utcnow()
+            ekey = sqlite3.Binary(encode(key))
+            cursor.execute('delete from c7n_resource_cache where key = ?', [ekey])
+            cursor.executemany(
+                'insert into c7n_resource_cache (key, seq, rid, value) values (?, ?, ?, ?)',
+                [(ekey, *row) for row in rows])
+            cursor.execute(
+                'replace into c7n_cache (key, value, create_date) values (?, ?, ?)',
+                (ekey, sqlite3.Binary(self.resource_marker), timestamp))
+            self.stats['bytes-written'] += sum(len(r[2]) for r in rows)
+            self._evict_to(cursor)
+
+    def _evict_to(self, cursor):
+        """Evict the oldest entries while stored values exceed the size budget."""
+        if not self.max_size:
+            return
+        sizes = cursor.execute(
+            'select c.key, length(c.value) + coalesce(sum(length(r.value)), 0) '
+            'from c7n_cache c left join c7n_resource_cache r on c.key = r.key '
+            'group by c.key order by c.create_date desc').fetchall()
+        total = 0
+        for idx, (key, size) in enumerate(sizes):
+            total += size
+            # always keep the most recent entry
+            if total > self.max_size and idx:
+                break
+        else:
+            return
+        evicted = [key for key, _ in sizes[idx:]]
+        for key_set in chunks(evicted, self.lookup_chunk_size):
+            params = ', '.join('?' * len(key_set))
+            cursor.execute('delete from c7n_cache where key in (%s)' % params, key_set)
+            cursor.execute(
+                'delete from c7n_resource_cache where key in (%s)' % params, key_set)
+        self.stats['evictions'] += len(evicted)
+        log.debug('evicted %d cache entries over size budget', len(evicted))
+
+    def invalidate(self, key, ids=None, id_key=None):
+        ekey = sqlite3.Binary(encode(key))
+        with self.conn as cursor:
+            if ids is None:
+                cursor.execute('delete from c7n_cache where key = ?', [ekey])
+                cursor.execute('delete from c7n_resource_cache where key = ?', [ekey])
+                return
+            value = self._get_value(cursor, ekey)
+            if value is None:
+                return
+            if value != self.resource_marker:
+                # pickled populations can't be partially invalidated
+                cursor.execute('delete from c7n_cache where key = ?', [ekey])
+                return
+            for id_set in chunks(set(map(str, ids)), self.lookup_chunk_size):
+                cursor.execute(
+                    'delete from c7n_resource_cache where key = ? and rid in (%s)' % (
+                        ', '.join('?' * len(id_set))),
+                    [ekey, *id_set])
 
     def size(self):
         return os.path.exists(self.cache_path) and os.path.getsize(self.cache_path) or 0
@@ -97,6 +97,10 @@ def _default_options(p, exclude=[]):
         p.add_argument(
             "--cache-period", default=15, type=int,
             help="Cache validity in minutes (default %(default)i)")
+        p.add_argument(
+            "--cache-max-size", default=None, type=int,
+            help="Cache size budget in MB, least recently used entries are evicted "
+            "beyond it (default unbounded)")
     else:
         p.add_argument("--cache", default=None, help=argparse.SUPPRESS)
     if 'session-policy' not in exclude:
@@ -231,6 +235,43 @@ def setup_parser():
         "--skip-validation",
         action="store_true",
         help="Skips validation of policies (assumes you've run the validate command seperately).")
+    run.add_argument(
+        "--workers", type=int, default=1,
+        help="Number of policies to execute concurrently (default %(default)i)")
+    run.add_argument(
+        "--region-workers", type=int, default=None,
+        help="Max policies executing concurrently per region (default --workers)")
+    run.add_argument(
+        "--service-workers", type=int, default=None,
+        help="Max policies executing concurrently per service and region (default --workers)")
+    run.add_argument(
+        "--provision-workers", type=int, default=None,
+        help="Max serverless policies provisioning concurrently per region, "
+        "to stay within lambda api rate limits (default 4)")
+    run.add_argument(
+        "--batch-size", type=int, default=None,
+        help="Stream resources through augment and filters in batches of this size, "
+        "bounding memory to the batch instead of the resource population")
+    run.add_argument(
+        "--metric-data", action="store_true", default=False,
+        help="Retrieve metrics filter data with batched CloudWatch GetMetricData requests")
+    run.add_argument(
+        "--child-workers", type=int, default=None,
+        help="Enumerate child resources (ecs services, route53 records, ...) for this many "
+        "parents concurrently, backing off when the service throttles")
+    run.add_argument(
+        "--augment-workers", type=int, default=None,
+        help="Fetch per resource details (lambda, sqs, sns, kms, ...) with up to this many "
+        "concurrent calls, backing off when the service throttles")
+    run.add_argument(
+        "--minimal-augment", action="store_true", default=False,
+        help="Skip resource augmentation (tags, detail calls, s3 bucket attributes) that "
+        "the policy's filters, actions and report fields don't use. Resource output is "
+        "limited to the fields fetched")
+    run.add_argument(
+        "--prefetch-tags", action="store_true", default=False,
+        help="Fetch tags for every universally tagged resource type the policies use in "
+        "one sweep per region, shared across policies, instead of per resource lookups")
 
     metrics_help = ("Emit metrics to provider metrics. Specify 'aws', 'gcp', or 'azure'. "
             "For more details on aws metrics options, see: "
@@ -1,6 +1,7 @@
 # Copyright The Cloud Custodian Authors.
 # SPDX-License-Identifier: Apache-2.0
 from collections import Counter, defaultdict
+from concurrent.futures import FIRST_COMPLETED, wait
 from datetime import timedelta, datetime
 from functools import wraps
 import json
@@ -16,10 +17,14 @@ from yaml.constructor import ConstructorError
 
 from c7n import deprecated
 from c7n.exceptions import ClientError, PolicyValidationError
+from c7n.executor import ThreadPoolExecutor
 from c7n.loader import SourceLocator
 from c7n.provider import clouds
 from c7n.policy import Policy, PolicyCollection, load as policy_load
+from c7n.query import ResourceFetchPlan
+from c7n.resolver import DocumentRegistry
 from c7n.schema import ElementSchema, StructureParser, generate
+from c7n.tags import TagPrefetch
 from c7n.utils import load_file, local_session, SafeLoader, yaml_dump
 from c7n.config import Bag, Config
 from c7n.resources import (
@@ -288,8 +293,6 @@ def validate(options):
 
 @policy_command
 def run(options, policies: List[Policy]) -> None:
-    exit_code = 0
-
     # AWS - Sanity check that we have an assumable role before executing policies
     # Todo - move this behind provider interface
     if options.assume_role and [p for p in policies if p.provider_name == 'aws']:
@@ -302,22 +305,107 @@ def run(options, policies: List[Policy]) -> None:
             log.exception("Unable to assume role %s", options.assume_role)
             sys.exit(1)
 
+    # Policies sharing a resource type, region and query fetch it once.
+    fetch_plan = ResourceFetchPlan(policies)
+    if getattr(options, 'prefetch_tags', False):
+        # Tags for universally tagged types are swept once per region.
+        TagPrefetch(policies)
+    # value_from urls are fetched and parsed once for the run.
+    DocumentRegistry().register(policies)
+
     errored_policies: List[str] = []
-    for policy in policies:
-        try:
-            policy()
-        except Exception:
-            exit_code = 2
-            errored_policies.append(policy.name)
-            if options.debug:
-                raise
-            log.exception(
-                "Error while executing policy %s, continuing" % (
-                    policy.name))
-    if exit_code != 0:
+    if getattr(options, 'workers', 1) > 1:
+        errored_policies = _run_concurrent(options, policies, fetch_plan)
+    else:
+        for policy in policies:
+            try:
+                _run_policy(policy, fetch_plan)
+            except Exception:
+                errored_policies.append(policy.name)
+                if options.debug:
+                    raise
+                log.exception(
+                    "Error while executing policy %s, continuing" % (
+                        policy.name))
+
+    if errored_policies:
         log.error("The following policies had errors while executing\n - %s" % (
             "\n - ".join(errored_policies)))
-        sys.exit(exit_code)
+        sys.exit(2)
+
+
+def _run_policy(policy, fetch_plan):
+    try:
+        policy()
+    finally:
+        fetch_plan.release(policy)
+
+
+# Serverless policies provisioning within a region share its function api limits.
+PROVISION_SLOT = 'provision'
+PROVISION_WORKERS = 4
+
+
+def _policy_slots(policy):
+    """Concurrency slots held by a policy while it executes."""
+    region = policy.options.region
+    if policy.execution_mode != 'pull':
+        return region, (region, PROVISION_SLOT)
+    service = getattr(
+        policy.resource_manager.resource_type, 'service', None) or policy.resource_type
+    return region, (region, service)
+
+
+def _run_concurrent(options, policies, fetch_plan):
+    """Execute policies on a bounded thread pool.
+
+    Overall concurrency is capped by ``--workers``, policies are
+    additionally limited per region and per service within a region to
+    avoid tripping api rate limits, with serverless policies limited to
+    ``--provision-workers`` per region. Policies are dispatched in order as
+    slots free up, and the names of errored policies are returned in
+    policy order regardless of completion order.
+    """
+    workers = options.workers
+    region_limit = getattr(options, 'region_workers', None) or workers
+    service_limit = getattr(options, 'service_workers', None) or workers
+    provision_limit = getattr(options, 'provision_workers', None) or PROVISION_WORKERS
+
+    queue = list(policies)
+    running = {}
+    active = Counter()
+    errored = set()
+
+    with ThreadPoolExecutor(max_workers=workers) as w:
+        while queue or running:
+            for policy in list(queue):
+                if len(running) >= workers:
+                    break
+                region, service = _policy_slots(policy)
+                limit = service[1] == PROVISION_SLOT and provision_limit or service_limit
+                if active[region] >= region_limit or active[service] >= limit:
+                    continue
+                queue.remove(policy)
+                active[region] += 1
+                active[service] += 1
+                running[w.submit(_run_policy, policy, fetch_plan)] = policy
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for f in done:
+                policy = running.pop(f)
+                region, service = _policy_slots(policy)
+                active[region] -= 1
+                active[service] -= 1
+                if f.exception() is None:
+                    continue
+                errored.add(id(policy))
+                if options.debug:
+                    raise f.exception()
+                log.error(
+                    "Error while executing policy %s, continuing" % policy.name,
+                    exc_info=f.exception())
+
+    return [p.name for p in policies if id(p) in errored]
 
 
 @policy_command
@@ -1,11 +1,13 @@
 # Copyright The Cloud Custodian Authors.
 # SPDX-License-Identifier: Apache-2.0
+from collections import Counter
 import time
 import uuid
 import os
 
 
 from c7n.output import (
+    active_contexts,
     api_stats_outputs,
     blob_outputs,
     log_outputs,
@@ -34,6 +36,9 @@ class ExecutionContext:
         self.logs = None
         self.api_stats = None
         self.sys_stats = None
+        self._active_token = None
+        # shared by the caches of the policy's resource managers
+        self.cache_stats = Counter()
 
         # A few tests patch on metrics flush
         # For backward compatibility, accept both 'metrics' and 'metrics_enabled' params (PR #4361)
@@ -63,6 +68,7 @@ class ExecutionContext:
                 self.sys_stats = sys_stats_outputs.select(sys_stats_type, self)
                 break
 
+        self.cache_stats.clear()
         self.start_time = time.time()
         self.execution_id = str(uuid.uuid4())
 
@@ -72,6 +78,7 @@ class ExecutionContext:
 
     def __enter__(self):
         self.initialize()
+        self._active_token = active_contexts.set(active_contexts.get() + (self,))
         self.session_factory.policy_name = self.policy.name
         self.sys_stats.__enter__()
         self.output.__enter__()
@@ -92,6 +99,9 @@ class ExecutionContext:
     def __exit__(self, exc_type=None, exc_value=None, exc_traceback=None):
         if exc_type is not None and self.metrics:
             self.metrics.put_metric('PolicyException', 1, "Count")
+        if self.metrics and (self.cache_stats['hits'] or self.cache_stats['misses']):
+            self.metrics.put_metric('CacheHits', self.cache_stats['hits'], "Count")
+            self.metrics.put_metric('CacheMisses', self.cache_stats['misses'], "Count")
         self.output.write_file('metadata.json', dumps(self.get_metadata(), indent=2))
         self.api_stats.__exit__(exc_type, exc_value, exc_traceback)
 
@@ -105,6 +115,9 @@ class ExecutionContext:
         self.tracer.__exit__()
 
         self.session_factory.policy_name = None
+        if self._active_token is not None:
+            active_contexts.reset(self._active_token)
+            self._active_token = None
         # IMPORTANT: multi-account execution (c7n-org and others) need
         # to manually reset this.  Why: Not doing this means we get
         # excessive memory usage from client reconstruction for dynamic-gen
@@ -112,7 +125,7 @@ class ExecutionContext:
         if os.environ.get('C7N_TEST_RUN'):
             reset_session_cache()
 
-    def get_metadata(self, include=('sys-stats', 'api-stats', 'metrics')):
+    def get_metadata(self, include=('sys-stats', 'api-stats', 'metrics', 'cache-stats')):
         t = time.time()
         md = {
             'policy': self.policy.data,
@@ -132,4 +145,6 @@ class ExecutionContext:
             md['api-stats'] = self.api_stats.get_metadata()
         if 'metrics' in include and self.metrics:
             md['metrics'] = self.metrics.get_metadata()
+        if 'cache-stats' in include:
+            md['cache-stats'] = dict(self.cache_stats)
         return md
@@ -1,10 +1,71 @@
 # Copyright The Cloud Custodian Authors.
 # SPDX-License-Identifier: Apache-2.0
-from concurrent.futures import (ProcessPoolExecutor, ThreadPoolExecutor)  # noqa
+from concurrent.futures import ProcessPoolExecutor  # noqa
+from concurrent import futures
 
+import contextvars
 import threading
 
 
+class ThreadPoolExecutor(futures.ThreadPoolExecutor):
+    """Thread pool executor that carries the submitter's context variables.
+
+    Work fanned out by a policy (augment, filters, actions) keeps the
+    execution context of the policy that submitted it, which allows
+    per policy log capture when policies run concurrently.
+    """
+
+    def submit(self, fn, /, *args, **kwargs):
+        return super().submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+class AdaptiveLimit:
+    """Concurrency limit that adapts to service throttling.
+
+    Callers take a slot before each api call and give it back with the
+    outcome. A throttled call halves the limit, successful calls grow it
+    back by one slot per limit's worth of calls (additive increase,
+    multiplicative decrease), never past the configured maximum.
+
+    Call counts, throttles and a moving average of call latency are kept
+    for reporting.
+    """
+
+    latency_weight = 0.2
+
+    def __init__(self, max_limit, min_limit=1):
+        self.max_limit = max(max_limit, min_limit)
+        self.min_limit = min_limit
+        self.limit = float(self.max_limit)
+        self.active = 0
+        self.calls = 0
+        self.throttles = 0
+        self.latency = None
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            while self.active >= int(self.limit):
+                self._cond.wait()
+            self.active += 1
+
+    def release(self, throttled=False, latency=None):
+        with self._cond:
+            self.active -= 1
+            self.calls += 1
+            if throttled:
+                self.throttles += 1
+                self.limit = max(self.min_limit, self.limit / 2)
+            elif self.limit < self.max_limit:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            if latency is not None:
+                if self.latency is None:
+                    self.latency = latency
+                else:
+                    self.latency += self.latency_weight * (latency - self.latency)
+            self._cond.notify_all()
+
+
 class MainThreadExecutor:
     """ For running tests.
 
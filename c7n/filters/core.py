@@ -31,9 +31,11 @@ from c7n.utils import (
     parse_cidr,
     parse_date,
     jmespath_search,
-    jmespath_compile
+    jmespath_compile,
+    jmespath_fields,
+    get_tag_map,
 )
-from c7n.manager import iter_filters
+from c7n.manager import iter_filters, iter_filter_passes
 
 
 class FilterValidationError(Exception):
@@ -131,10 +133,19 @@ class FilterRegistry(PluginRegistry):
         self.register('reduce', ReduceFilter)
         self.register('list-item', ListItemFilter)
 
-    def parse(self, data, manager):
+    def parse(self, data, manager, parent=None):
+        """Parse a block of filters.
+
+        parent - the boolean block containing the filters, the manager
+        for top level filters
+        """
+        if parent is None:
+            parent = manager
         results = []
         for d in data:
-            results.append(self.factory(d, manager))
+            f = self.factory(d, manager)
+            f.block_parent = parent
+            results.append(f)
         return results
 
     def factory(self, data, manager=None):
@@ -199,6 +210,10 @@ class Filter(Element):
 
     log = logging.getLogger('custodian.filters')
 
+    # Filters whose match on a resource depends on the rest of the
+    # resource set can't be evaluated over batches of it.
+    set_scoped = False
+
     def __init__(self, data, manager=None):
         self.data = data
         self.manager = manager
@@ -207,6 +222,26 @@ class Filter(Element):
         """ Bulk process resources and return filtered set."""
         return list(filter(self, resources))
 
+    def get_resource_predicate(self):
+        """Return a callable matching a single resource, if the filter's
+        process is equivalent to applying it to each resource in turn.
+
+        Adjacent filters with a predicate are applied in a single pass
+        over the resource set.
+        """
+        return None
+
+    def get_required_fields(self):
+        """Return the set of top level resource fields the filter reads.
+
+        None, the default, means the filter may read any part of the
+        resource and nothing can be left out of augmentation.
+        """
+        return None
+
+    # Set when the filter is parsed as part of a policy's filter tree.
+    block_parent = None
+
     def get_block_operator(self):
         """Determine the immediate parent boolean operator for a filter"""
         # Top level operator is `and`
@@ -217,6 +252,8 @@ class Filter(Element):
 
     def get_block_parent(self):
         """Get the block parent for a filter"""
+        if self.block_parent is not None:
+            return self.block_parent
         block_stack = [self.manager]
         for f in self.manager.iter_filters(block_end=True):
             if f is None:
@@ -246,38 +283,62 @@ class BaseValueFilter(Filter):
         self.expr = {}
 
     def get_resource_value(self, k, i, regex=None):
-        r = None
+        return self.get_value_accessor(k, regex)(i)
+
+    def get_value_accessor(self, k, regex=None):
+        """Return a callable extracting the value for key `k` from a resource.
+
+        Accessors are built once per key, with tag key parsing and
+        normalization and jmespath compilation hoisted out of the
+        per resource lookup.
+        """
+        if self._accessors is None:
+            self._accessors = {}
+        accessor = self._accessors.get((k, regex))
+        if accessor is None:
+            accessor = self._accessors[(k, regex)] = self._compile_accessor(k, regex)
+        return accessor
+
+    _accessors = None
+
+    def _compile_accessor(self, k, regex):
         if k.startswith('tag:'):
-            normalize_if_needed = NormalizeFilterTagKeys.transform_func_if_needed(
-                self.data.get("tag_key_transforms")
-            )
-            tk = k.split(':', 1)[1]
+            accessor = self._compile_tag_accessor(k.split(':', 1)[1])
+        else:
+            accessor = self._compile_key_accessor(k)
+        if not regex:
+            return accessor
+        value_regex = ValueRegex(regex)
+        return lambda i: value_regex.get_resource_value(accessor(i))
+
+    def _compile_tag_accessor(self, tk):
+        normalize = NormalizeFilterTagKeys.transform_func_if_needed(
+            self.data.get("tag_key_transforms")
+        )
+
+        def get_tag_value(i):
             if 'Tags' in i:
-                for t in _normalize_aws_tag_keys(i.get("Tags", []), normalize_if_needed):
-                    if t.get('Key') == tk:
-                        r = t.get('Value')
-                        break
+                return get_tag_map(i, normalize).get(tk)
             # GCP schema: 'labels': {'key': 'value'}
             elif 'labels' in i:
-                r = _normalize_tag_dict_keys(i.get('labels', {}), normalize_if_needed).get(tk, None)
+                return _get_tag_dict_value(i.get('labels', {}), tk, normalize)
             # GCP has a secondary form of labels called tags
             # as labels without values.
             # Azure schema: 'tags': {'key': 'value'}
             elif 'tags' in i:
-                r = _normalize_tag_dict_keys(i.get('tags', {}) or {}, normalize_if_needed).get(
-                    tk, None
-                )
-        elif k in i:
-            r = i.get(k)
-        elif k not in self.expr:
-            self.expr[k] = jmespath_compile(k)
-            r = self.expr[k].search(i)
-        else:
-            r = self.expr[k].search(i)
-
-        if regex:
-            r = ValueRegex(regex).get_resource_value(r)
-        return r
+                return _get_tag_dict_value(i.get('tags', {}) or {}, tk, normalize)
+            return None
+        return get_tag_value
+
+    def _compile_key_accessor(self, k):
+        def get_key_value(i):
+            if k in i:
+                return i.get(k)
+            expr = self.expr.get(k)
+            if expr is None:
+                expr = self.expr[k] = jmespath_compile(k)
+            return expr.search(i)
+        return get_key_value
 
     def _validate_value_regex(self, regex):
         """Specific validation for `value_regex` type
@@ -365,30 +426,17 @@ def _combine(callables_list):
     return reduce(compose_function, callables_list)
 
 
-def _normalize_aws_tag_keys(tags: list, normalize_func) -> list:
-    # schema: [{'Key': 'key1', 'Value': 'value1'}, {'Key': 'key2', 'Value': 'value2'}]
+def _get_tag_dict_value(tags: dict, tk, normalize_func):
     if not normalize_func:
-        return tags
-    normalized_tags = []
-    for t in tags:
-        try:
-            normalized_tags.append({"Key": normalize_func(t["Key"]), "Value": t["Value"]})
-        except (AttributeError, SyntaxError, KeyError):
-            pass
-    return normalized_tags
-
-
-def _normalize_tag_dict_keys(tags: dict, normalize_func) -> dict:
-    # schema: {'key1': 'value1', 'key2': 'value2'}
-    if not normalize_func:
-        return tags
-    normalized_tags = {}
+        return tags.get(tk, None)
+    r = None
     for k, v in tags.items():
         try:
-            normalized_tags[normalize_func(k)] = v
+            if normalize_func(k) == tk:
+                r = v
         except (AttributeError, SyntaxError):
             pass
-    return normalized_tags
+    return r
 
 
 def intersect_list(a, b):
@@ -418,7 +466,7 @@ class BooleanGroupFilter(Filter):
     def __init__(self, data, registry, manager):
         super(BooleanGroupFilter, self).__init__(data)
         self.registry = registry
-        self.filters = registry.parse(list(self.data.values())[0], manager)
+        self.filters = registry.parse(list(self.data.values())[0], manager, self)
         self.manager = manager
 
     def validate(self):
@@ -430,6 +478,34 @@ class BooleanGroupFilter(Filter):
         resource_type = self.manager.get_model()
         return resource_type.id
 
+    def get_resource_id_func(self):
+        rtype_id = self.get_resource_type_id()
+        if '.' in rtype_id:
+            return jmespath_compile(rtype_id).search
+        return operator.itemgetter(rtype_id)
+
+    @property
+    def set_scoped(self):
+        return any(getattr(f, 'set_scoped', False) for f in self.filters)
+
+    @staticmethod
+    def order_by_cost(filters):
+        """Order filters cheapest first, preserving their relative order
+        otherwise.
+
+        Returns (cost, filter) tuples, see :func:`filter_cost`.
+        """
+        return sorted(((filter_cost(f), f) for f in filters), key=operator.itemgetter(0))
+
+    def get_required_fields(self):
+        fields = set()
+        for f in self.filters:
+            f_fields = f.get_required_fields()
+            if f_fields is None:
+                return None
+            fields.update(f_fields)
+        return fields
+
     def __len__(self):
         return len(self.filters)
 
@@ -444,6 +520,29 @@ class BooleanGroupFilter(Filter):
         return deprecations
 
 
+def filter_cost(f):
+    """Estimate the cost of evaluating a filter.
+
+    Filters requiring permissions make api calls and cost 1, others
+    evaluate locally and cost 0. Blocks cost as much as their costliest
+    filter.
+    """
+    if isinstance(f, BooleanGroupFilter):
+        return max([filter_cost(bf) for bf in f.filters], default=0)
+    get_permissions = getattr(f, 'get_permissions', None)
+    return get_permissions and get_permissions() and 1 or 0
+
+
+def reads_annotations(filters):
+    """Whether any of the filters, or filters within their blocks, may read
+    a ``c7n:`` annotation written by another filter.
+    """
+    for f in iter_filters(filters):
+        if f is not None and 'c7n:' in repr(f.data):
+            return True
+    return False
+
+
 class Or(BooleanGroupFilter):
 
     def process(self, resources, event=None):
@@ -459,22 +558,30 @@ class Or(BooleanGroupFilter):
         return False
 
     def process_set(self, resources, event):
-        rtype_id = self.get_resource_type_id()
-        compiled = None
-        if '.' in rtype_id:
-            compiled = jmespath_compile(rtype_id)
-            resource_map = {compiled.search(r): r for r in resources}
-        else:
-            resource_map = {r[rtype_id]: r for r in resources}
+        get_id = self.get_resource_id_func()
+        resource_map = {get_id(r): r for r in resources}
         results = set()
-        for f in self.filters:
-            if compiled:
-                results = results.union([
-                    compiled.search(r) for r in f.process(resources, event)])
-            else:
-                results = results.union([
-                    r[rtype_id] for r in f.process(resources, event)])
-        return [resource_map[r_id] for r_id in results]
+        if self.set_scoped or reads_annotations(self.filters):
+            # Branches that evaluate the resource set as a whole see
+            # all of it, as do the other branches alongside them. Branches
+            # reading annotations keep their written order, so the
+            # branches annotating resources run first.
+            for f in self.filters:
+                results.update(get_id(r) for r in f.process(resources, event))
+            return [r for rid, r in resource_map.items() if rid in results]
+
+        # Branches are evaluated cheapest first. Api backed branches
+        # only evaluate resources no prior branch matched, local ones
+        # evaluate all resources so their match annotations accumulate.
+        resources = list(resource_map.values())
+        remaining = resources
+        for cost, f in self.order_by_cost(self.filters):
+            if cost and not remaining:
+                break
+            for r in f.process(remaining if cost else resources, event):
+                results.add(get_id(r))
+            remaining = [r for r in remaining if get_id(r) not in results]
+        return [r for rid, r in resource_map.items() if rid in results]
 
 
 class And(BooleanGroupFilter):
@@ -483,8 +590,8 @@ class And(BooleanGroupFilter):
         if self.manager:
             sweeper = AnnotationSweeper(self.get_resource_type_id(), resources)
 
-        for f in self.filters:
-            resources = f.process(resources, events)
+        for _, process in iter_filter_passes(self.filters):
+            resources = process(resources, events)
             if not resources:
                 break
 
@@ -512,29 +619,21 @@ class Not(BooleanGroupFilter):
         return False
 
     def process_set(self, resources, event):
-        rtype_id = self.get_resource_type_id()
-        compiled = None
-        if '.' in rtype_id:
-            compiled = jmespath_compile(rtype_id)
-            resource_map = {compiled.search(r): r for r in resources}
-        else:
-            resource_map = {r[rtype_id]: r for r in resources}
-        sweeper = AnnotationSweeper(rtype_id, resources)
-
-        for f in self.filters:
-            resources = f.process(resources, event)
+        get_id = self.get_resource_id_func()
+        resource_map = {get_id(r): r for r in resources}
+        sweeper = AnnotationSweeper(self.get_resource_type_id(), resources)
+
+        # the implied conjunction keeps its written order, as later
+        # filters may read annotations written by earlier ones.
+        for _, process in iter_filter_passes(self.filters):
+            resources = process(resources, event)
             if not resources:
                 break
 
-        before = set(resource_map.keys())
-        if compiled:
-            after = {compiled.search(r) for r in resources}
-        else:
-            after = {r[rtype_id] for r in resources}
-        results = before - after
+        after = {get_id(r) for r in resources}
         sweeper.sweep([])
 
-        return [resource_map[r_id] for r_id in results]
+        return [r for rid, r in resource_map.items() if rid not in after]
 
 
 class AnnotationSweeper:
@@ -614,6 +713,10 @@ class ValueFilter(BaseValueFilter):
     annotate = True
     required_keys = {'value', 'key'}
 
+    @property
+    def set_scoped(self):
+        return self.data.get('value_type') == 'resource_count'
+
     def _validate_resource_count(self):
         """ Specific validation for `resource_count` type
 
@@ -730,55 +833,191 @@ class ValueFilter(BaseValueFilter):
         """
         return jmespath_search(self.data.get('value_path'), i)
 
-    def match(self, i):
-        if self.v is None and len(self.data) == 1:
+    def get_resource_predicate(self):
+        if (type(self).process is not ValueFilter.process or
+                self.data.get('value_type') == 'resource_count'):
+            return None
+        return self
+
+    def get_required_fields(self):
+        # subclasses may evaluate their key against something other
+        # than the resource.
+        if type(self) is not ValueFilter:
+            return None
+        if len(self.data) == 1:
+            [(key, _)] = self.data.items()
+            paths = [key]
+        else:
+            paths = [self.data.get('key'), self.data.get('value_path')]
+            # expr values are read from the resource like the key
+            if self.data.get('value_type') == 'expr':
+                if not isinstance(self.data.get('value'), str):
+                    return None
+                paths.append(self.data['value'])
+        fields = set()
+        for p in filter(None, paths):
+            if p.startswith('tag:'):
+                fields.add('Tags')
+                continue
+            p_fields = jmespath_fields(p)
+            if p_fields is None:
+                return None
+            fields.update(p_fields)
+        return fields
+
+    def initialize_value(self, i):
+        if len(self.data) == 1:
             [(self.k, self.v)] = self.data.items()
-        elif self.v is None and not hasattr(self, 'content_initialized'):
-            self.k = self.data.get('key')
-            self.op = self.data.get('op')
-            if 'value_from' in self.data:
-                values = ValuesFrom(self.data['value_from'], self.manager)
-                self.v = values.get_values()
-            elif 'value_path' in self.data:
-                self.v = self.get_path_value(i)
-            else:
-                self.v = self.data.get('value')
-            self.content_initialized = True
-            self.vtype = self.data.get('value_type')
+            return
+        self.k = self.data.get('key')
+        self.op = self.data.get('op')
+        if 'value_from' in self.data:
+            values = ValuesFrom(self.data['value_from'], self.manager)
+            self.v = values.get_values()
+        elif 'value_path' in self.data:
+            self.v = self.get_path_value(i)
+        else:
+            self.v = self.data.get('value')
+        self.content_initialized = True
+        self.vtype = self.data.get('value_type')
 
-        if i is None:
-            return False
+    _matcher = None
+
+    def reset(self):
+        """Clear the value resolved on first match, ie. to reuse the filter in a later run."""
+        self._matcher = None
+        self.content_initialized = False
 
-        # value extract
-        r = self.get_resource_value(self.k, i)
-        if self.op in ('in', 'not-in') and r is None:
-            r = ()
+    def match(self, i):
+        if self._matcher is None:
+            self.initialize_value(i)
+            self._matcher = self.compile_matcher()
+        return self._matcher(i)
 
-        # value type conversion
-        if self.vtype is not None:
-            v, r = self.process_value_type(self.v, r, i)
+    def compile_matcher(self):
+        """Compile the filter into a callable matching a single resource.
+
+        The operator, value accessor and value type conversion are
+        resolved once, and when the value isn't subject to type
+        conversion the sentinel value checks are resolved as well.
+        """
+        if type(self).get_resource_value is ValueFilter.get_resource_value:
+            get_value = self.get_value_accessor(self.k, self.data.get('value_regex'))
         else:
+            k = self.k
+
+            def get_value(i):
+                return self.get_resource_value(k, i)
+
+        empty_none = self.op in ('in', 'not-in')
+        compare = self._compile_compare()
+
+        if self.vtype is None:
             v = self.v
+            sentinel = isinstance(v, str) and self.sentinel_checks.get(v) or None
+
+            def match(i):
+                if i is None:
+                    return False
+                r = get_value(i)
+                if empty_none and r is None:
+                    r = ()
+                if sentinel is not None and sentinel(r):
+                    return True
+                return compare(r, v)
+            return match
+
+        convert = self._compile_value_type()
+
+        def match_value_type(i):
+            if i is None:
+                return False
+            r = get_value(i)
+            if empty_none and r is None:
+                r = ()
+            v, r = convert(r, i)
+            if r is None and v == 'absent':
+                return True
+            elif r is not None and v == 'present':
+                return True
+            elif v == 'not-null' and r:
+                return True
+            elif v == 'empty' and not r:
+                return True
+            return compare(r, v)
+        return match_value_type
+
+    sentinel_checks = {
+        'absent': lambda r: r is None,
+        'present': lambda r: r is not None,
+        'not-null': lambda r: bool(r),
+        'empty': lambda r: not r,
+    }
 
-        # Value match
-        if r is None and v == 'absent':
-            return True
-        elif r is not None and v == 'present':
-            return True
-        elif v == 'not-null' and r:
-            return True
-        elif v == 'empty' and not r:
-            return True
-        elif self.op:
-            op = OPERATORS[self.op]
+    def _compile_compare(self):
+        if not self.op:
+            return lambda r, v: r == v
+        op = OPERATORS[self.op]
+
+        def compare(r, v):
             try:
                 return op(r, v)
             except TypeError:
                 return False
-        elif r == v:
-            return True
+        return compare
 
-        return False
+    def _compile_value_type(self):
+        """Return a callable converting a resource value per the value type,
+        with conversions of the filter value hoisted where it is static.
+        """
+        sentinel, vtype = self.v, self.vtype
+
+        if type(self).process_value_type is not ValueFilter.process_value_type:
+            return lambda r, i: self.process_value_type(sentinel, r, i)
+        elif vtype == 'expr':
+            if type(self).get_resource_value is ValueFilter.get_resource_value:
+                get_sentinel = self.get_value_accessor(sentinel, self.data.get('value_regex'))
+            else:
+                def get_sentinel(i):
+                    return self.get_resource_value(sentinel, i)
+            return lambda r, i: (get_sentinel(i), r)
+        elif vtype == 'date':
+            sentinel = parse_date(sentinel)
+            return lambda r, i: (sentinel, parse_date(r))
+        elif vtype in ('age', 'expiration'):
+            delta = None
+            if not isinstance(sentinel, datetime.datetime):
+                delta = timedelta(sentinel)
+                if vtype == 'age':
+                    delta = -delta
+
+            def convert_date(r, i):
+                s = sentinel
+                if delta is not None:
+                    s = datetime.datetime.now(tz=tzutc()) + delta
+                value = parse_date(r)
+                if value is None:
+                    # compatiblity
+                    value = 0
+                # Age comparisons are reversed, as in process_value_type
+                if vtype == 'age':
+                    return value, s
+                return s, value
+            return convert_date
+        elif vtype == 'cidr':
+            s = parse_cidr(sentinel)
+
+            def convert_cidr(r, i):
+                v = parse_cidr(r)
+                if (isinstance(s, ipaddress._BaseAddress) and
+                        isinstance(v, ipaddress._BaseNetwork)):
+                    return v, s
+                return s, v
+            return convert_cidr
+        elif vtype == 'version':
+            s = ComparableVersion(sentinel)
+            return lambda r, i: (s, ComparableVersion(r))
+        return lambda r, i: self.process_value_type(sentinel, r, i)
 
     def process_value_type(self, sentinel, value, resource):
         if self.vtype == 'normalize' and isinstance(value, str):
@@ -918,6 +1157,9 @@ class EventFilter(ValueFilter):
                     self.manager.data,))
         return self
 
+    def get_required_fields(self):
+        return set()
+
     def process(self, resources, event=None):
         if event is None:
             return resources
@@ -999,6 +1241,7 @@ class ReduceFilter(BaseValueFilter):
 
     """
     annotate = False
+    set_scoped = True
 
     schema = {
         'type': 'object',
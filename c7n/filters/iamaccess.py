@@ -26,7 +26,10 @@ References
   https://docs.aws.amazon.com/IAM/latest/UserGuide/reference_policies_condition-keys.html
 
 """
+from collections import Counter
+from functools import cached_property
 import fnmatch
+import hashlib
 import logging
 import json
 
@@ -45,6 +48,18 @@ def _account(arn):
     return arn.split(':', 5)[4]
 
 
+def policy_digest(policy):
+    """Digest of a policy document, for memoizing analysis of it.
+
+    Policy text is hashed as is, as services return identical documents
+    for identical policies, decoded documents are hashed in a key sorted
+    encoding.
+    """
+    if not isinstance(policy, str):
+        policy = json.dumps(policy, sort_keys=True)
+    return hashlib.sha256(policy.encode('utf8')).hexdigest()
+
+
 class PolicyChecker:
     """
     checker_config:
@@ -57,6 +72,10 @@ class PolicyChecker:
     """
     def __init__(self, checker_config):
         self.checker_config = checker_config
+        # policy digest -> checked statements, the checker configuration
+        # is fixed so a document's verdict is too.
+        self.verdicts = {}
+        self.cache_stats = Counter()
 
     # Config properties
     @property
@@ -75,7 +94,7 @@ class PolicyChecker:
     def check_actions(self):
         return self.checker_config.get('check_actions', ())
 
-    @property
+    @cached_property
     def whitelist_conditions(self):
         return set(v.lower() for v in self.checker_config.get('whitelist_conditions', ()))
 
@@ -97,6 +116,15 @@ class PolicyChecker:
 
     # Policy statement handling
     def check(self, policy_text):
+        key = policy_digest(policy_text)
+        if key in self.verdicts:
+            self.cache_stats['hits'] += 1
+        else:
+            self.cache_stats['misses'] += 1
+            self.verdicts[key] = self.check_policy(policy_text)
+        return list(self.verdicts[key])
+
+    def check_policy(self, policy_text):
         if isinstance(policy_text, str):
             policy = json.loads(policy_text)
         else:
@@ -388,8 +416,15 @@ class CrossAccountAccessFilter(Filter):
              'whitelist_conditions': self.conditions,
              'whitelist_patterns': self.patterns,
              'return_allowed': self.return_allowed})
-        self.checker = self.checker_factory(self.checker_config)
-        return super(CrossAccountAccessFilter, self).process(resources, event)
+        # keep the checker, and its verdicts, across batches with the same config
+        checker = getattr(self, 'checker', None)
+        if checker is None or checker.checker_config != self.checker_config:
+            self.checker = self.checker_factory(dict(self.checker_config))
+        results = super(CrossAccountAccessFilter, self).process(resources, event)
+        self.log.debug(
+            "Checked %d resource policies, %d distinct",
+            sum(self.checker.cache_stats.values()), self.checker.cache_stats['misses'])
+        return results
 
     def get_accounts(self):
         owner_id = self.manager.config.account_id
@@ -4,8 +4,9 @@
 CloudWatch Metrics suppport for resources
 """
 import re
+import threading
 
-from collections import namedtuple
+from collections import namedtuple, OrderedDict
 from concurrent.futures import as_completed
 from datetime import datetime, timedelta
 
@@ -18,6 +19,42 @@ METRIC_WINDOW_ALIGNMENT = [
     'start-of-day']
 
 
+class MetricDataStore:
+    """Process wide store of metric series retrieved via GetMetricData.
+
+    Series are keyed by account, region, namespace, metric, statistic,
+    period, window and dimensions, so filters in the same run querying
+    the same series only retrieve it once. Entries are evicted least
+    recently used first once the store exceeds its maximum size.
+    """
+
+    def __init__(self, max_size=100000):
+        self.max_size = max_size
+        self.data = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            if key not in self.data:
+                return None
+            self.data.move_to_end(key)
+            return list(self.data[key])
+
+    def save(self, key, datapoints):
+        with self.lock:
+            self.data[key] = datapoints
+            self.data.move_to_end(key)
+            while len(self.data) > self.max_size:
+                self.data.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.data.clear()
+
+
+metric_data_store = MetricDataStore()
+
+
 class MetricsFilter(Filter):
     """Supports cloud watch metrics filters on resources.
 
@@ -89,6 +126,12 @@ class MetricsFilter(Filter):
             value: 30
             op: less-than
             period-start: start-of-day
+
+    When running with ``--metric-data``, metrics are retrieved with
+    batched GetMetricData requests of up to 500 series each instead of
+    a GetMetricStatistics request per resource, and series are shared
+    across filters in the same run querying the same namespace, metric,
+    statistic and window.
     """
 
     schema = type_schema(
@@ -115,6 +158,7 @@ class MetricsFilter(Filter):
 
     MAX_QUERY_POINTS = 50850
     MAX_RESULT_POINTS = 1440
+    MAX_DATA_QUERIES = 500
 
     # Default per service, for overloaded services like ec2
     # we do type specific default namespace annotation
@@ -168,6 +212,11 @@ class MetricsFilter(Filter):
             raise PolicyValidationError(
                 "metrics filter days value (%s) cannot exceed 455" % self.days)
 
+    def get_permissions(self):
+        if getattr(self.manager.config, 'metric_data', False):
+            return ("cloudwatch:GetMetricData",)
+        return self.permissions
+
     def get_metric_window(self):
         """Determine start and end times for the CloudWatch metric window
 
@@ -222,6 +271,9 @@ class MetricsFilter(Filter):
         self.namespace = ns
 
         self.log.debug("Querying metrics for %d", len(resources))
+        if getattr(self.manager.config, 'metric_data', False):
+            return self.process_metric_data(resources)
+
         matched = []
         with self.executor_factory(max_workers=3) as w:
             futures = []
@@ -249,25 +301,31 @@ class MetricsFilter(Filter):
             dims.append({'Name': k, 'Value': v})
         return dims
 
+    def get_metric_key(self):
+        # Note this annotation cache is policy scoped, not across
+        # policies, still the lack of full qualification on the key
+        # means multiple filters within a policy using the same metric
+        # across different periods or dimensions would be problematic.
+        return "%s.%s.%s.%s" % (self.namespace, self.metric, self.statistics, str(self.days))
+
+    def get_resource_dimensions(self, resource):
+        # if we overload dimensions with multiple resources we get
+        # the statistics/average over those resources.
+        dimensions = self.get_dimensions(resource)
+        # Merge in any filter specified metrics, get_dimensions is
+        # commonly overridden so we can't do it there.
+        dimensions.extend(self.get_user_dimensions())
+        return dimensions
+
     def process_resource_set(self, resource_set):
         client = local_session(
             self.manager.session_factory).client('cloudwatch')
 
         matched = []
+        key = self.get_metric_key()
         for r in resource_set:
-            # if we overload dimensions with multiple resources we get
-            # the statistics/average over those resources.
-            dimensions = self.get_dimensions(r)
-            # Merge in any filter specified metrics, get_dimensions is
-            # commonly overridden so we can't do it there.
-            dimensions.extend(self.get_user_dimensions())
-
+            dimensions = self.get_resource_dimensions(r)
             collected_metrics = r.setdefault('c7n.metrics', {})
-            # Note this annotation cache is policy scoped, not across
-            # policies, still the lack of full qualification on the key
-            # means multiple filters within a policy using the same metric
-            # across different periods or dimensions would be problematic.
-            key = "%s.%s.%s.%s" % (self.namespace, self.metric, self.statistics, str(self.days))
 
             params = dict(
                 Namespace=self.namespace,
@@ -286,43 +344,133 @@ class MetricsFilter(Filter):
                 collected_metrics[key] = client.get_metric_statistics(
                     **params)['Datapoints']
 
-            # In certain cases CloudWatch reports no data for a metric.
-            # If the policy specifies a fill value for missing data, add
-            # that here before testing for matches. Otherwise, skip
-            # matching entirely.
-            if len(collected_metrics[key]) == 0:
-                if 'missing-value' not in self.data:
+            if self.match_datapoints(r, collected_metrics[key]):
+                matched.append(r)
+        return matched
+
+    def match_datapoints(self, r, datapoints):
+        # In certain cases CloudWatch reports no data for a metric.
+        # If the policy specifies a fill value for missing data, add
+        # that here before testing for matches. Otherwise, skip
+        # matching entirely.
+        if len(datapoints) == 0:
+            if 'missing-value' not in self.data:
+                return False
+            datapoints.append({
+                'Timestamp': self.start,
+                self.statistics: self.data['missing-value'],
+                'c7n:detail': 'Fill value for missing data'
+            })
+
+        if self.data.get('percent-attr'):
+            rvalue = r[self.data.get('percent-attr')]
+            if self.data.get('attr-multiplier'):
+                rvalue = rvalue * self.data['attr-multiplier']
+            for data_point in datapoints:
+                percent = (data_point[self.statistics] / rvalue * 100)
+                if not self.op(percent, self.value):
+                    return False
+            return True
+
+        for data_point in datapoints:
+            if 'ExtendedStatistics' in data_point:
+                data_point = data_point['ExtendedStatistics']
+            if not self.op(data_point[self.statistics], self.value):
+                return False
+        return True
+
+    def get_series_key(self, dimensions):
+        return (
+            self.manager.config.account_id, self.manager.config.region,
+            self.namespace, self.metric, self.statistics, self.period,
+            self.start, self.end,
+            tuple(sorted((d['Name'], d['Value']) for d in dimensions)))
+
+    def process_metric_data(self, resources):
+        """Match resources against series retrieved with batched GetMetricData.
+
+        Resources sharing dimensions share a series, and series already
+        in the process wide store are not retrieved again.
+        """
+        key = self.get_metric_key()
+        resource_series = []
+        pending = {}
+        for r in resources:
+            collected_metrics = r.setdefault('c7n.metrics', {})
+            if key in collected_metrics:
+                resource_series.append((r, None))
+                continue
+            dimensions = self.get_resource_dimensions(r)
+            series_key = self.get_series_key(dimensions)
+            resource_series.append((r, series_key))
+            if series_key not in pending and metric_data_store.get(series_key) is None:
+                pending[series_key] = dimensions
+
+        self.log.debug(
+            "Querying metric data for %d series across %d resources",
+            len(pending), len(resources))
+        failed = set()
+        with self.executor_factory(max_workers=3) as w:
+            futures = {}
+            for query_set in chunks(list(pending.items()), self.MAX_DATA_QUERIES):
+                futures[w.submit(self.get_metric_data, query_set)] = query_set
+            for f in as_completed(futures):
+                if f.exception():
+                    self.log.warning(
+                        "CW Retrieval error: %s" % f.exception())
+                    failed.update(k for k, _ in futures[f])
                     continue
-                collected_metrics[key].append({
-                    'Timestamp': self.start,
-                    self.statistics: self.data['missing-value'],
-                    'c7n:detail': 'Fill value for missing data'
-                })
-
-            if self.data.get('percent-attr'):
-                rvalue = r[self.data.get('percent-attr')]
-                if self.data.get('attr-multiplier'):
-                    rvalue = rvalue * self.data['attr-multiplier']
-                all_meet_condition = True
-                for data_point in collected_metrics[key]:
-                    percent = (data_point[self.statistics] / rvalue * 100)
-                    if not self.op(percent, self.value):
-                        all_meet_condition = False
-                        break
-                if all_meet_condition:
-                    matched.append(r)
-            else:
-                all_meet_condition = True
-                for data_point in collected_metrics[key]:
-                    if 'ExtendedStatistics' in data_point:
-                        data_point = data_point['ExtendedStatistics']
-                    if not self.op(data_point[self.statistics], self.value):
-                        all_meet_condition = False
-                        break
-                if all_meet_condition:
-                    matched.append(r)
+                for series_key, datapoints in f.result().items():
+                    metric_data_store.save(series_key, datapoints)
+
+        matched = []
+        for r, series_key in resource_series:
+            if series_key in failed:
+                continue
+            collected_metrics = r['c7n.metrics']
+            if series_key is not None:
+                collected_metrics[key] = metric_data_store.get(series_key) or []
+            if self.match_datapoints(r, collected_metrics[key]):
+                matched.append(r)
         return matched
 
+    def get_metric_data(self, query_set):
+        """Retrieve up to 500 series in a single paginated GetMetricData call.
+
+        Returns a mapping of series key to datapoints in the format
+        returned by GetMetricStatistics.
+        """
+        client = local_session(
+            self.manager.session_factory).client('cloudwatch')
+        queries = []
+        query_keys = {}
+        for idx, (series_key, dimensions) in enumerate(query_set):
+            query_id = 'm%d' % idx
+            query_keys[query_id] = series_key
+            queries.append({
+                'Id': query_id,
+                'MetricStat': {
+                    'Metric': {
+                        'Namespace': self.namespace,
+                        'MetricName': self.metric,
+                        'Dimensions': dimensions},
+                    'Period': self.period,
+                    'Stat': self.statistics},
+                'ReturnData': True})
+
+        results = {series_key: [] for series_key in query_keys.values()}
+        paginator = client.get_paginator('get_metric_data')
+        for page in paginator.paginate(
+                MetricDataQueries=queries,
+                StartTime=self.start,
+                EndTime=self.end,
+                ScanBy='TimestampAscending'):
+            for result in page.get('MetricDataResults', ()):
+                datapoints = results[query_keys[result['Id']]]
+                for timestamp, value in zip(result['Timestamps'], result['Values']):
+                    datapoints.append({'Timestamp': timestamp, self.statistics: value})
+        return results
+
 
 class ShieldMetrics(MetricsFilter):
     """Specialized metrics filter for shield
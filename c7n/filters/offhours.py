@@ -257,7 +257,7 @@ from dateutil import zoneinfo, tz as tzutil
 
 from c7n.exceptions import PolicyValidationError
 from c7n.filters import Filter
-from c7n.utils import type_schema, dumps
+from c7n.utils import type_schema, dumps, get_tag_map
 from c7n.resolver import ValuesFrom
 
 log = logging.getLogger('custodian.offhours')
@@ -357,6 +357,12 @@ class Time(Filter):
 
         self.id_key = None
 
+        # resolved once per filter run, see get_skip_days
+        self.skip_days = None
+        # (tag value, time type) -> schedule, and tz name -> tzinfo
+        self.schedules = {}
+        self.tz_cache = {}
+
         self.opted_out = []
         self.parse_errors = []
         self.enabled_count = 0
@@ -377,6 +383,8 @@ class Time(Filter):
         return self
 
     def process(self, resources, event=None):
+        # refresh skip-days-from values on each run
+        self.skip_days = None
         resources = super(Time, self).process(resources)
         if self.parse_errors and self.manager and self.manager.ctx.log_dir:
             self.log.warning("parse errors %d", len(self.parse_errors))
@@ -429,24 +437,20 @@ class Time(Filter):
         # dateutil.parser.parse to process: value='off=(m-f,1);' properly.
         # before this normalization, some cases would silently fail.
         value = ';'.join(filter(None, value.split(';')))
-        if self.parser.has_resource_schedule(value, time_type):
-            schedule = self.parser.parse(value)
-        elif self.parser.keys_are_valid(value):
-            # respect timezone from tag
-            raw_data = self.parser.raw_data(value)
-            if 'tz' in raw_data:
-                schedule = dict(self.default_schedule)
-                schedule['tz'] = raw_data['tz']
-            else:
-                schedule = self.default_schedule
+        if (value, time_type) in self.schedules:
+            schedule = self.schedules[(value, time_type)]
         else:
-            schedule = None
+            schedule = self.schedules[(value, time_type)] = self.get_resource_schedule(
+                value, time_type)
         if schedule is None:
             log.warning(
                 "Invalid schedule on resource:%s value:%s", rid, value)
             self.parse_errors.append((rid, value))
             return False
-        tz = self.get_tz(schedule['tz'])
+        if schedule['tz'] in self.tz_cache:
+            tz = self.tz_cache[schedule['tz']]
+        else:
+            tz = self.tz_cache[schedule['tz']] = self.get_tz(schedule['tz'])
         if not tz:
             log.warning(
                 "Could not resolve tz on resource:%s value:%s", rid, value)
@@ -455,15 +459,33 @@ class Time(Filter):
         now = datetime.datetime.now(tz).replace(
             minute=0, second=0, microsecond=0)
         now_str = now.strftime("%Y-%m-%d")
-        if 'skip-days-from' in self.data:
-            values = ValuesFrom(self.data['skip-days-from'], self.manager)
-            self.skip_days = values.get_values()
-        else:
-            self.skip_days = self.data.get('skip-days', [])
-        if now_str in self.skip_days:
+        if now_str in self.get_skip_days():
             return False
         return self.match(now, schedule)
 
+    def get_resource_schedule(self, value, time_type):
+        """Resolve a normalized tag value to a schedule, None if invalid."""
+        if self.parser.has_resource_schedule(value, time_type):
+            return self.parser.parse(value)
+        elif self.parser.keys_are_valid(value):
+            # respect timezone from tag
+            raw_data = self.parser.raw_data(value)
+            if 'tz' in raw_data:
+                schedule = dict(self.default_schedule)
+                schedule['tz'] = raw_data['tz']
+                return schedule
+            return self.default_schedule
+        return None
+
+    def get_skip_days(self):
+        if self.skip_days is None:
+            if 'skip-days-from' in self.data:
+                values = ValuesFrom(self.data['skip-days-from'], self.manager)
+                self.skip_days = set(values.get_values())
+            else:
+                self.skip_days = set(self.data.get('skip-days', []))
+        return self.skip_days
+
     def match(self, now, schedule):
         time = schedule.get(self.time_type, ())
         for item in time:
@@ -475,11 +497,7 @@ class Time(Filter):
     def get_tag_value(self, i):
         """Get the resource's tag value specifying its schedule."""
         # Look for the tag, Normalize tag key and tag value
-        found = self.fallback_schedule
-        for t in i.get('Tags', ()):
-            if t['Key'].lower() == self.tag_key:
-                found = t['Value']
-                break
+        found = get_tag_map(i, str.lower).get(self.tag_key, self.fallback_schedule)
         # NOTE for GCP resources, eg sql-instance
         if found == self.fallback_schedule and 'labels' in i:
             found = i.get('labels', {}).get(self.tag_key) or found
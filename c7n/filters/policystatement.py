@@ -3,6 +3,7 @@
 import json
 
 from .core import Filter
+from .iamaccess import policy_digest
 from c7n.utils import (
     type_schema,
     format_string_values,
@@ -89,6 +90,12 @@ class HasStatementFilter(Filter):
             }
         })
 
+    def __init__(self, data, manager=None):
+        super().__init__(data, manager)
+        # (policy digest, required statements) -> whether the policy matched,
+        # resources commonly share a handful of distinct policy documents.
+        self.verdicts = {}
+
     def process(self, resources, event=None):
         return list(filter(None, map(self.process_resource, resources)))
 
@@ -97,8 +104,19 @@ class HasStatementFilter(Filter):
         p = resource.get(policy_attribute)
         if p is None:
             return None
-        p = json.loads(p)
 
+        # required_statements is the filter that we get from the c7n policy
+        required_statements = format_string_values(
+            list(self.data.get('statements', [])),
+            **self.get_std_format_args(resource)
+            )
+
+        key = (policy_digest(p), json.dumps(required_statements, sort_keys=True))
+        if key not in self.verdicts:
+            self.verdicts[key] = self.match_policy(json.loads(p), required_statements)
+        return self.verdicts[key] and resource or None
+
+    def match_policy(self, p, required_statements):
         required_ids_not_found = list(self.data.get('statement_ids', []))
         resource_statements = p.get('Statement', [])
         # compare if the resource_statement sid is in the required_ids list
@@ -106,22 +124,14 @@ class HasStatementFilter(Filter):
             if s.get('Sid') in required_ids_not_found:
                 required_ids_not_found.remove(s['Sid'])
 
-        # required_statements is the filter that we get from the c7n policy
-        required_statements = format_string_values(
-            list(self.data.get('statements', [])),
-            **self.get_std_format_args(resource)
-            )
-
         found_required_statements = self.__get_matched_statements(
             required_statements,
             resource_statements
         )
 
         # Both statement_ids and required_statements are found in the resource
-        if (not required_ids_not_found) and \
-           (required_statements == found_required_statements):
-            return resource
-        return None
+        return bool((not required_ids_not_found) and
+                    (required_statements == found_required_statements))
 
     # Use set data type for comparing lists with different order of items
     def action_resource_case_insensitive(self, actions):
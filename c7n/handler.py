@@ -8,10 +8,12 @@ import logging
 import json
 
 from c7n.config import Config
+from c7n.filters import ValueFilter
 from c7n.structure import StructureParser
 from c7n.resources import load_resources
 from c7n.resources.aws import AWS
 from c7n.policy import PolicyCollection
+from c7n.resolver import DocumentRegistry
 from c7n.utils import format_event, get_account_id_from_sts, local_session
 
 import boto3
@@ -41,6 +43,11 @@ C7N_DEBUG_EVENT = True
 # Set with `export C7N_CATCH_ERR=yes`
 C7N_CATCH_ERR = False
 
+# Control whether validated policies are kept across warm invocations
+# of the lambda container, rather than reloaded for each event.
+# Set with `export C7N_CACHE_POLICIES=no` to reload per event.
+C7N_CACHE_POLICIES = True
+
 
 ##########################################
 #
@@ -53,13 +60,19 @@ policy_data = None
 # execution options for the policy
 policy_config = None
 
+# validated policies, reused across warm invocations
+policies = None
+
+# value_from documents, revalidated on each invocation
+value_documents = DocumentRegistry()
+
 
 def init_env_globals():
     """Set module level values from environment variables.
 
     Encapsulated here to enable better testing.
     """
-    global C7N_SKIP_EVTERR, C7N_DEBUG_EVENT, C7N_CATCH_ERR
+    global C7N_SKIP_EVTERR, C7N_DEBUG_EVENT, C7N_CATCH_ERR, C7N_CACHE_POLICIES
 
     C7N_SKIP_EVTERR = os.environ.get(
         'C7N_SKIP_ERR_EVENT', 'yes') == 'yes' and True or False
@@ -70,6 +83,9 @@ def init_env_globals():
     C7N_CATCH_ERR = os.environ.get(
         'C7N_CATCH_ERR', 'no').strip().lower() == 'yes' and True or False
 
+    C7N_CACHE_POLICIES = os.environ.get(
+        'C7N_CACHE_POLICIES', 'yes').strip().lower() == 'yes' and True or False
+
 
 def init_config(policy_config):
     """Get policy lambda execution configuration.
@@ -133,6 +149,45 @@ def init_config(policy_config):
     return AWS().initialize(config)
 
 
+def load_policies():
+    """Get the container's policies for this invocation.
+
+    Policies are validated when loaded, and are kept across warm
+    invocations as config.json doesn't change within a container; per
+    event state lives in the policy execution context, which is
+    reinitialized on each run, and value filters are reset so their
+    values (ie. value_from documents) are resolved again. Policies that
+    assume into member accounts update their options and session per
+    event, so they are reloaded for every invocation.
+    """
+    global policies
+    if policies is not None:
+        for p in policies:
+            for f in p.resource_manager.iter_filters():
+                if isinstance(f, ValueFilter):
+                    f.reset()
+        return policies
+
+    collection = PolicyCollection.from_data(policy_data, policy_config)
+    validated = []
+    for p in collection:
+        try:
+            # validation provides for an initialization point for
+            # some filters/actions.
+            p.validate()
+        except Exception:
+            log.exception("error during policy validation")
+            if C7N_CATCH_ERR:
+                continue
+            raise
+        validated.append(p)
+
+    if C7N_CACHE_POLICIES and not any(
+            'member-role' in p.get('mode', {}) for p in policy_data['policies']):
+        policies = validated
+    return validated
+
+
 # One time initilization of global environment settings
 init_env_globals()
 
@@ -161,12 +216,11 @@ def dispatch_event(event, context):
     if not policy_data or not policy_data.get('policies'):
         return False
 
-    policies = PolicyCollection.from_data(policy_data, policy_config)
-    for p in policies:
+    collection = load_policies()
+    value_documents.start_run()
+    value_documents.register(collection)
+    for p in collection:
         try:
-            # validation provides for an initialization point for
-            # some filters/actions.
-            p.validate()
             p.push(event, context)
         except Exception:
             log.exception("error during policy execution")
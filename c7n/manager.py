@@ -1,6 +1,7 @@
 # Copyright The Cloud Custodian Authors.
 # SPDX-License-Identifier: Apache-2.0
 from collections import deque
+import itertools
 import logging
 
 from c7n import cache, deprecated
@@ -14,7 +15,7 @@ try:
 except ImportError:
     resources = PluginRegistry('resources')
 
-from c7n.utils import dumps
+from c7n.utils import dumps, jmespath_fields
 
 
 def iter_filters(filters, block_end=False):
@@ -29,6 +30,40 @@ def iter_filters(filters, block_end=False):
         yield f
 
 
+def iter_filter_passes(filters):
+    """Group filters into passes over a resource set.
+
+    Adjacent filters with a resource predicate are fused into a single
+    pass, each resource being checked against all of them in turn.
+
+    Yields tuples of the filters in the pass and a process callable.
+    """
+    fused = []
+    for f in filters:
+        predicate = getattr(f, 'get_resource_predicate', None)
+        predicate = predicate and predicate()
+        if predicate is not None:
+            fused.append((f, predicate))
+            continue
+        if fused:
+            yield _fuse_predicates(fused)
+            fused = []
+        yield [f], f.process
+    if fused:
+        yield _fuse_predicates(fused)
+
+
+def _fuse_predicates(fused):
+    if len(fused) == 1:
+        f = fused[0][0]
+        return [f], f.process
+    predicates = [p for _, p in fused]
+
+    def process(resources, event=None):
+        return [r for r in resources if all(p(r) for p in predicates)]
+    return [f for f, _ in fused], process
+
+
 class ResourceManager:
     """
     A Cloud Custodian resource
@@ -47,7 +82,7 @@ class ResourceManager:
         self.session_factory = ctx.session_factory
         self.config = ctx.options
         self.data = data
-        self._cache = cache.factory(self.ctx.options)
+        self._cache = cache.factory(self.ctx.options, getattr(ctx, 'cache_stats', None))
         self.log = logging.getLogger('custodian.resources.%s' % (
             self.__class__.__name__.lower()))
 
@@ -104,18 +139,20 @@ class ResourceManager:
         if event and event.get('debug', False):
             self.log.info(
                 "Filtering resources using %d filters", len(self.filters))
-        for idx, f in enumerate(self.filters, start=1):
+        for idx, (filters, process) in enumerate(iter_filter_passes(self.filters), start=1):
             if not resources:
                 break
             rcount = len(resources)
 
-            with self.ctx.tracer.subsegment("filter:%s" % f.type):
-                resources = f.process(resources, event)
+            with self.ctx.tracer.subsegment("filter:%s" % filters[0].type):
+                resources = process(resources, event)
 
             if event and event.get('debug', False):
                 self.log.debug(
                     "Filter #%d applied %d->%d filter: %s",
-                    idx, rcount, len(resources), dumps(f.data, indent=None))
+                    idx, rcount, len(resources),
+                    dumps(filters[0].data if len(filters) == 1 else [f.data for f in filters],
+                          indent=None))
         self.log.debug("Filtered from %d to %d %s" % (
             original, len(resources), self.__class__.__name__.lower()))
         return resources
@@ -128,6 +165,50 @@ class ResourceManager:
     def iter_filters(self, block_end=False):
         return iter_filters(self.filters, block_end=block_end)
 
+    _required_fields = ()
+
+    def get_required_fields(self):
+        """Returns the top level resource fields the policy uses.
+
+        Covers the fields read by the policy's filters and actions and the
+        resource type's report fields. None means some filter or action may
+        use any part of the resource, as is always the case for related and
+        child managers, whose resources are read by the policy's filters.
+        """
+        if self.data != self.ctx.policy.data:
+            return None
+        if self._required_fields == ():
+            self._required_fields = self._get_required_fields()
+        return self._required_fields
+
+    def _get_required_fields(self):
+        model = self.get_model()
+        paths = [model.id, getattr(model, 'name', None), getattr(model, 'date', None)]
+        paths.extend(getattr(model, 'default_report_fields', ()))
+        fields = set()
+        for p in filter(None, paths):
+            p_fields = jmespath_fields(p)
+            if p_fields is None:
+                return None
+            fields.update(p_fields)
+        for e in itertools.chain(getattr(self, 'filters', ()), getattr(self, 'actions', ())):
+            e_fields = e.get_required_fields()
+            if e_fields is None:
+                return None
+            fields.update(e_fields)
+        return fields
+
+    def needs_fields(self, fields):
+        """Whether the policy needs any of the given resource fields.
+
+        Augmentation producing only fields the policy doesn't use is
+        skipped when running with minimal augmentation.
+        """
+        if not getattr(self.config, 'minimal_augment', False):
+            return True
+        required = self.get_required_fields()
+        return required is None or not required.isdisjoint(fields)
+
     def validate(self):
         """
         Validates resource definition, does NOT validate filters, actions, modes.
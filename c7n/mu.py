@@ -14,6 +14,7 @@ import json
 import logging
 import os
 import shutil
+import threading
 import time
 import tempfile
 import zipfile
@@ -269,8 +270,10 @@ def get_exec_options(options):
     """preserve cli output options into serverless environment.
     """
     d = {}
-    for k in ('log_group', 'tracer', 'output_dir', 'metrics_enabled'):
-        if options[k]:
+    for k in ('log_group', 'tracer', 'output_dir', 'metrics_enabled', 'batch_size',
+              'metric_data', 'child_workers', 'augment_workers', 'minimal_augment',
+              'cache_max_size'):
+        if options.get(k):
             d[k] = options[k]
     # ignore local fs/dir output paths
     if 'output_dir' in d and '://' not in d['output_dir']:
@@ -376,7 +379,62 @@ def custodian_archive(packages=None):
     modules = {'c7n'}
     if packages:
         modules = filter(None, modules.union(packages))
-    return PythonPackageArchive(sorted(modules))
+    base = get_base_archive(sorted(modules))
+    return PythonPackageArchive(cache_file=base.path)
+
+
+# (modules, source digest) -> closed base archive of the module sources
+_base_archives = {}
+_base_archive_lock = threading.Lock()
+
+
+def get_source_digest(modules):
+    """Digest of the source files of the given modules.
+
+    Files are identified by path, size and modification time, which is
+    enough to notice edits between deploys without reading every source.
+    """
+    digest = hashlib.sha256()
+
+    def add(path):
+        stat = os.stat(path)
+        digest.update(("%s:%d:%d\n" % (
+            path, stat.st_size, stat.st_mtime_ns)).encode('utf8'))
+
+    for module_name in modules:
+        module = importlib.import_module(module_name)
+        paths = list(getattr(module, '__path__', ()))
+        if not paths and getattr(module, '__file__', None):
+            paths = [module.__file__]
+        for path in paths:
+            if not os.path.isdir(path):
+                add(path)
+                continue
+            for root, dirs, files in os.walk(path):
+                if '__pycache__' in dirs:
+                    dirs.remove('__pycache__')
+                dirs.sort()
+                for f in sorted(files):
+                    add(os.path.join(root, f))
+    return digest.hexdigest()
+
+
+def get_base_archive(modules):
+    """Get the archive of the given modules' sources, built once per process.
+
+    Policy archives start from a copy of the base archive and only add their
+    own configuration, rather than recompressing the same sources for every
+    function. The base archive is rebuilt if the module sources change.
+    """
+    modules = tuple(modules)
+    key = (modules, get_source_digest(modules))
+    with _base_archive_lock:
+        archive = _base_archives.get(key)
+        if archive is None:
+            for k in [k for k in _base_archives if k[0] == modules]:
+                _base_archives.pop(k)
+            archive = _base_archives[key] = PythonPackageArchive(modules).close()
+    return archive
 
 
 class LambdaManager:
@@ -8,8 +8,10 @@ See docs/usage/outputs.rst
 
 """
 import contextlib
+import contextvars
 import datetime
 import gzip
+import io
 import logging
 import os
 import shutil
@@ -36,6 +38,10 @@ log = logging.getLogger('custodian.output')
 # TODO remove
 DEFAULT_NAMESPACE = "CloudMaid"
 
+# Execution contexts active in the current thread of control, outermost
+# first. Used to attribute log records when policies run concurrently.
+active_contexts = contextvars.ContextVar('c7n_active_contexts', default=())
+
 
 class OutputRegistry(PluginRegistry):
 
@@ -342,9 +348,16 @@ class LogOutput:
             return
         self.handler.setLevel(logging.DEBUG)
         self.handler.setFormatter(logging.Formatter(self.log_format))
+        self.handler.addFilter(self.filter_record)
         mlog = logging.getLogger('custodian')
         mlog.addHandler(self.handler)
 
+    def filter_record(self, record):
+        # records emitted outside of any policy execution (ie. library
+        # threads) are kept, otherwise only capture our policy's records.
+        contexts = active_contexts.get()
+        return not contexts or self.ctx in contexts
+
     def leave_log(self):
         if self.handler is None:
             return
@@ -408,6 +421,13 @@ class OutputFileHandler(ABC):
         "Write a file at the relative path specified with the value as the content."
         raise NotImplementedError()
 
+    @contextlib.contextmanager
+    def open_file(self, rel_path):
+        "Open a file at the relative path specified for incremental writes."
+        buf = io.StringIO()
+        yield buf
+        self.write_file(rel_path, buf.getvalue())
+
 
 @blob_outputs.register('null')
 class NullBlobOutput(OutputFileHandler):
@@ -430,6 +450,12 @@ class NullBlobOutput(OutputFileHandler):
     def write_file(self, rel_path, value):
         "A no-op for the null handler."
 
+    @contextlib.contextmanager
+    def open_file(self, rel_path):
+        "A no-op for the null handler."
+        with open(os.devnull, 'w') as fh:
+            yield fh
+
 
 @blob_outputs.register('file')
 @blob_outputs.register('default')
@@ -462,6 +488,9 @@ class DirectoryOutput(OutputFileHandler):
         with open(os.path.join(self.root_dir, rel_path), 'w') as fh:
             fh.write(value)
 
+    def open_file(self, rel_path):
+        return open(os.path.join(self.root_dir, rel_path), 'w')
+
     def compress(self):
         # Compress files individually so thats easy to walk them, without
         # downloading tar and extracting.
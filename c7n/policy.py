@@ -348,7 +348,8 @@ class PullMode(PolicyExecutionMode):
                 "ResourceCount", len(resources), "Count", Scope="Policy"
             )
             ctx.metrics.put_metric("ResourceTime", rt, "Seconds", Scope="Policy")
-            ctx.output.write_file('resources.json', utils.dumps(resources, indent=2))
+            with ctx.output.open_file('resources.json') as fh:
+                utils.dumps(resources, fh, indent=2)
 
             if not resources:
                 return []
@@ -537,7 +538,8 @@ class LambdaMode(ServerlessExecutionMode):
                     "Invoking actions %s", self.policy.resource_manager.actions
                 )
 
-            ctx.output.write_file('resources.json', utils.dumps(resources, indent=2))
+            with ctx.output.open_file('resources.json') as fh:
+                utils.dumps(resources, fh, indent=2)
 
             for action in self.policy.resource_manager.actions:
                 self.policy.log.info(
@@ -6,15 +6,21 @@ Query capability built on skew metamodel
 tags_spec -> s3, elb, rds
 """
 from concurrent.futures import as_completed
+import copy
 import functools
 import itertools
 import json
+import logging
+import threading
+import time
 from typing import List
 
 import os
 
+from c7n import cache
 from c7n.actions import ActionRegistry
 from c7n.exceptions import ClientError, ResourceLimitExceeded, PolicyExecutionError
+from c7n.executor import AdaptiveLimit
 from c7n.filters import FilterRegistry, MetricsFilter
 from c7n.manager import ResourceManager
 from c7n.registry import PluginRegistry
@@ -33,6 +39,16 @@ except ImportError:
         pass
 
 
+THROTTLE_CODES = (
+    'TooManyRequestsException',
+    'ThrottlingException',
+    'RequestLimitExceeded',
+    'Throttled',
+    'ThrottledException',
+    'Throttling',
+    'Client.RequestLimitExceeded')
+
+
 class ResourceQuery:
 
     def __init__(self, session_factory):
@@ -61,8 +77,19 @@ class ResourceQuery:
 
         return data
 
-    def filter(self, resource_manager, **params):
-        """Query a set of resources."""
+    def _iter_client_enum(self, client, enum_op, params, path, retry=None):
+        """Yield the results of an enum op a page at a time."""
+        if not client.can_paginate(enum_op):
+            yield self._invoke_client_enum(client, enum_op, params, path) or []
+            return
+        p = client.get_paginator(enum_op)
+        if retry:
+            p.PAGE_ITERATOR_CLS = RetryPageIterator
+        path = path and jmespath_compile(path) or None
+        for page in p.paginate(**params):
+            yield (path and path.search(page) or page) or []
+
+    def _get_enum_client(self, resource_manager, params):
         m = self.resolve(resource_manager.resource_type)
         if resource_manager.get_client:
             client = resource_manager.get_client()
@@ -72,10 +99,22 @@ class ResourceQuery:
         enum_op, path, extra_args = m.enum_spec
         if extra_args:
             params = {**extra_args, **params}
+        return client, enum_op, params, path
+
+    def filter(self, resource_manager, **params):
+        """Query a set of resources."""
+        client, enum_op, params, path = self._get_enum_client(resource_manager, params)
         return self._invoke_client_enum(
             client, enum_op, params, path,
             getattr(resource_manager, 'retry', None)) or []
 
+    def iter_filter(self, resource_manager, **params):
+        """Query a set of resources, yielding them a page at a time."""
+        client, enum_op, params, path = self._get_enum_client(resource_manager, params)
+        yield from self._iter_client_enum(
+            client, enum_op, params, path,
+            getattr(resource_manager, 'retry', None))
+
     def get(self, resource_manager, identities):
         """Get resources by identities
         """
@@ -155,11 +194,20 @@ class ChildResourceQuery(ResourceQuery):
             return self._invoke_client_enum(client, enum_op, params, path)
 
         # Have to query separately for each parent's children.
+        workers = min(getattr(self.manager.config, 'child_workers', None) or 1, len(parent_ids))
+        if workers > 1:
+            limiter = AdaptiveLimit(workers)
+            with self.manager.executor_factory(max_workers=workers) as w:
+                futures = [
+                    w.submit(self._invoke_parent_enum, client, m, params, path, pid, limiter)
+                    for pid in parent_ids]
+                subsets = [f.result() for f in futures]
+        else:
+            subsets = [
+                self._invoke_parent_enum(client, m, params, path, pid) for pid in parent_ids]
+
         results = []
-        for parent_id in parent_ids:
-            merged_params = self.get_parent_parameters(params, parent_id, parent_key)
-            subset = self._invoke_client_enum(
-                client, enum_op, merged_params, path, retry=self.manager.retry)
+        for parent_id, subset in zip(parent_ids, subsets):
             if annotate_parent:
                 for r in subset:
                     r[self.parent_key] = parent_id
@@ -170,6 +218,27 @@ class ChildResourceQuery(ResourceQuery):
                     results.extend(subset)
         return results
 
+    def _invoke_parent_enum(self, client, m, params, path, parent_id, limiter=None):
+        enum_op = m.enum_spec[0]
+        merged_params = self.get_parent_parameters(params, parent_id, m.parent_spec[1])
+        if limiter is None:
+            return self._invoke_client_enum(
+                client, enum_op, merged_params, path, retry=self.manager.retry) or []
+
+        # every page request takes a slot from the shared limit, and
+        # throttles back off through the manager retry.
+        if client.can_paginate(enum_op):
+            p = client.get_paginator(enum_op)
+            p.PAGE_ITERATOR_CLS = RetryPageIterator
+            p._method = functools.partial(limited_call, limiter, p._method)
+            data = p.paginate(**merged_params).build_full_result()
+        else:
+            data = self.manager.retry(
+                limited_call, limiter, getattr(client, enum_op), **merged_params)
+        if path:
+            data = jmespath_compile(path).search(data)
+        return data or []
+
     def get_parent_parameters(self, params, parent_id, parent_key):
         return dict(params, **{parent_key: parent_id})
 
@@ -229,6 +298,20 @@ class DescribeSource:
     def resources(self, query):
         return self.query.filter(self.manager, **query)
 
+    def iter_resources(self, query, batch_size):
+        """Yield resources in batches of at most batch_size.
+
+        Pages are consumed as they are fetched when the source and
+        query use the default enumeration, otherwise the full result
+        of :py:meth:`resources` is batched.
+        """
+        if (type(self).resources is DescribeSource.resources and
+                type(self.query).filter is ResourceQuery.filter):
+            pages = self.query.iter_filter(self.manager, **query)
+            yield from chunks(itertools.chain.from_iterable(pages), batch_size)
+        else:
+            yield from chunks(self.resources(query), batch_size)
+
     def get_query(self):
         return self.resource_query_factory(self.manager.session_factory)
 
@@ -253,6 +336,17 @@ class DescribeSource:
             perms.append("%s:%s" % (prefix, _napi(m.batch_detail_spec[0])))
         return perms
 
+    def has_required_fields(self, resources):
+        """Whether the enumerated resources already have every field the
+        policy uses, making detail calls unnecessary under minimal augment.
+        """
+        if not getattr(self.manager.config, 'minimal_augment', False):
+            return False
+        required = self.manager.get_required_fields()
+        if required is None:
+            return False
+        return all(isinstance(r, dict) and required.issubset(r) for r in resources)
+
     def augment(self, resources):
         model = self.manager.get_model()
         if getattr(model, 'detail_spec', None):
@@ -263,18 +357,36 @@ class DescribeSource:
             _augment = _batch_augment
         else:
             return resources
+        if self.has_required_fields(resources):
+            return resources
         if self.manager.get_client:
             client = self.manager.get_client()
         else:
             client = local_session(self.manager.session_factory).client(
                 model.service, region_name=self.manager.config.region)
+        max_workers = self.manager.max_workers
+        chunk_size = self.manager.chunk_size
+        kw = {}
+        if _augment is _scalar_augment:
+            # detail calls share a per operation limit across the run, so
+            # throttling seen by one policy paces the next.
+            augment_workers = getattr(self.manager.config, 'augment_workers', None)
+            if augment_workers:
+                max_workers, chunk_size = augment_workers, 1
+            kw['limiter'] = get_operation_limit(
+                (self.manager.config.account_id, self.manager.config.region,
+                 model.service, detail_spec[0]), max_workers)
         _augment = functools.partial(
-            _augment, self.manager, model, detail_spec, client)
-        with self.manager.executor_factory(
-                max_workers=self.manager.max_workers) as w:
-            results = list(w.map(
-                _augment, chunks(resources, self.manager.chunk_size)))
-            return list(itertools.chain(*results))
+            _augment, self.manager, model, detail_spec, client, **kw)
+        with self.manager.executor_factory(max_workers=max_workers) as w:
+            results = list(w.map(_augment, chunks(resources, chunk_size)))
+        if kw:
+            limiter = kw['limiter']
+            self.manager.log.debug(
+                "augment %s.%s limit:%d calls:%d throttles:%d latency:%0.3f",
+                model.service, detail_spec[0], limiter.limit, limiter.calls,
+                limiter.throttles, limiter.latency or 0)
+        return list(itertools.chain(*results))
 
 
 class DescribeWithResourceTags(DescribeSource):
@@ -298,16 +410,93 @@ class ConfigSource:
 
     retry = staticmethod(get_retry(('ThrottlingException',)))
 
+    # BatchGetResourceConfig limit on keys per call
+    batch_size = 100
+
+    # config types BatchGetResourceConfig has rejected, shared across
+    # sources so we only pay for the failed call once per type.
+    batch_unsupported = set()
+
+    # config types whose configuration doesn't embed their tags, these are
+    # only on config history items.
+    batch_untagged = set()
+
+    # concurrent batches of resources by id
+    max_workers = 4
+
     def __init__(self, manager):
         self.manager = manager
         self.titleCase = self.manager.resource_type.id[0].isupper()
 
     def get_permissions(self):
-        return ["config:GetResourceConfigHistory",
+        return ["config:BatchGetResourceConfig",
+                "config:GetResourceConfigHistory",
                 "config:ListDiscoveredResources"]
 
     def get_resources(self, ids, cache=True):
         client = local_session(self.manager.session_factory).client('config')
+        resource_sets = list(chunks(ids, self.batch_size))
+        if len(resource_sets) < 2:
+            return list(itertools.chain(
+                *[self.get_resource_batch(client, rs) for rs in resource_sets]))
+        with self.manager.executor_factory(max_workers=self.max_workers) as w:
+            return list(itertools.chain(*w.map(
+                functools.partial(self.get_resource_batch, client), resource_sets)))
+
+    def get_resource_batch(self, client, ids):
+        """Retrieve the current configuration of up to batch_size resources.
+
+        Resource types BatchGetResourceConfig doesn't support, and any keys
+        it leaves unprocessed, fall back to the latest config history item.
+        Base configuration items don't carry config's tags, so when the
+        policy uses tags, types whose configuration doesn't embed them go
+        to history as well.
+        """
+        m = self.manager.get_model()
+        needs_tags = self.manager.needs_fields(('Tags',))
+        if m.config_type in self.batch_unsupported or (
+                needs_tags and m.config_type in self.batch_untagged):
+            return self.get_resource_history(client, ids)
+        try:
+            response = self.retry(
+                client.batch_get_resource_config,
+                resourceKeys=[{'resourceType': m.config_type, 'resourceId': i} for i in ids])
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ValidationException':
+                raise
+            if self.is_unsupported_type(e):
+                self.manager.log.debug(
+                    "batch config retrieval not supported for %s, using history",
+                    m.config_type)
+                self.batch_unsupported.add(m.config_type)
+            return self.get_resource_history(client, ids)
+
+        resources = {}
+        items = response.get('baseConfigurationItems', ())
+        for item in items:
+            r = self.load_resource(item)
+            if r:
+                resources[item['resourceId']] = r
+        if items and needs_tags and not any('Tags' in r for r in resources.values()):
+            self.manager.log.debug(
+                "%s configuration doesn't embed tags, using history", m.config_type)
+            self.batch_untagged.add(m.config_type)
+            resources = {}
+        remaining = [i for i in ids if i not in resources]
+        if remaining:
+            resources.update({
+                r.pop('c7n:resource-id'): r for r in self.get_resource_history(
+                    client, remaining, annotate=True)})
+        return [resources[i] for i in ids if i in resources]
+
+    @staticmethod
+    def is_unsupported_type(error):
+        """Whether a batch retrieval error rejects the resource type itself,
+        rather than a resource id in the batch.
+        """
+        return 'resourcetype' in error.response['Error'].get('Message', '').lower()
+
+    def get_resource_history(self, client, ids, annotate=False):
         results = []
         m = self.manager.get_model()
         for i in ids:
@@ -318,7 +507,10 @@ class ConfigSource:
                 limit=1).get('configurationItems')
             if not revisions:
                 continue
-            results.append(self.load_resource(revisions[0]))
+            r = self.load_resource(revisions[0])
+            if annotate and r:
+                r['c7n:resource-id'] = i
+            results.append(r)
         return list(filter(None, results))
 
     def get_query_params(self, query):
@@ -401,27 +593,31 @@ class ConfigSource:
             resourceType=self.manager.get_model().config_type)
         results = []
 
-        with self.manager.executor_factory(max_workers=2) as w:
-            ridents = pages.build_full_result()
-            resource_ids = [
-                r['resourceId'] for r in ridents.get('resourceIdentifiers', ())]
-            self.manager.log.debug(
-                "querying %d %s resources",
-                len(resource_ids),
-                self.manager.__class__.__name__.lower())
-
-            for resource_set in chunks(resource_ids, 50):
-                futures = []
-                futures.append(w.submit(self.get_resources, resource_set))
-                for f in as_completed(futures):
-                    if f.exception():
-                        self.manager.log.error(
-                            "Exception getting resources from config \n %s" % (
-                                f.exception()))
-                    results.extend(f.result())
+        ridents = pages.build_full_result()
+        resource_ids = [
+            r['resourceId'] for r in ridents.get('resourceIdentifiers', ())]
+        self.manager.log.debug(
+            "querying %d %s resources",
+            len(resource_ids),
+            self.manager.__class__.__name__.lower())
+
+        with self.manager.executor_factory(max_workers=self.max_workers) as w:
+            futures = [
+                w.submit(self.get_resources, resource_set)
+                for resource_set in chunks(resource_ids, self.batch_size)]
+            for f in as_completed(futures):
+                if f.exception():
+                    self.manager.log.error(
+                        "Exception getting resources from config \n %s" % (
+                            f.exception()))
+                results.extend(f.result())
         return results
 
     def resources(self, query=None):
+        return list(itertools.chain.from_iterable(self.iter_resources(query)))
+
+    def iter_resources(self, query=None, batch_size=100):
+        """Yield resources from a config select query in batches."""
         client = local_session(self.manager.session_factory).client('config')
         query = self.get_query_params(query)
         pager = Paginator(
@@ -431,17 +627,20 @@ class ConfigSource:
             client.meta.service_model.operation_model('SelectResourceConfig'))
         pager.PAGE_ITERATOR_CLS = RetryPageIterator
 
-        results = []
-        for page in pager.paginate(Expression=query['expr']):
-            results.extend([
-                self.load_resource(json.loads(r)) for r in page['Results']])
+        found = False
+        results = (
+            self.load_resource(json.loads(r))
+            for page in pager.paginate(Expression=query['expr'])
+            for r in page['Results'])
+        for batch in chunks(results, batch_size):
+            found = True
+            yield batch
 
         # Config arbitrarily breaks which resource types its supports for query/select
         # on any given day, if we don't have a user defined query, then fallback
         # to iteration mode.
-        if not results and query == self.get_query_params({}):
-            results = self.get_listed_resources(client)
-        return results
+        if not found and query == self.get_query_params({}):
+            yield from chunks(self.get_listed_resources(client), batch_size)
 
     def augment(self, resources):
         return resources
@@ -457,15 +656,7 @@ class QueryResourceManager(ResourceManager, metaclass=QueryMeta):
 
     _generate_arn = None
 
-    retry = staticmethod(
-        get_retry((
-            'TooManyRequestsException',
-            'ThrottlingException',
-            'RequestLimitExceeded',
-            'Throttled',
-            'ThrottledException',
-            'Throttling',
-            'Client.RequestLimitExceeded')))
+    retry = staticmethod(get_retry(THROTTLE_CODES))
 
     source_mapping = sources
 
@@ -513,13 +704,20 @@ class QueryResourceManager(ResourceManager, metaclass=QueryMeta):
         return perms
 
     def get_cache_key(self, query):
-        return {
+        key = {
             'account': self.account_id,
             'region': self.config.region,
             'resource': str(self.__class__.__name__),
             'source': self.source_type,
             'q': query
         }
+        if getattr(self.config, 'minimal_augment', False):
+            required = self.get_required_fields()
+            # partly augmented resources are only shared with, and cached
+            # for, policies using the same fields.
+            if required is not None:
+                key['fields'] = sorted(required)
+        return key
 
     def resources(self, query=None, augment=True) -> List[dict]:
         query = self.source.get_query_params(query)
@@ -533,6 +731,9 @@ class QueryResourceManager(ResourceManager, metaclass=QueryMeta):
                     "%s.%s" % (self.__class__.__module__, self.__class__.__name__),
                     len(resources)))
 
+            if resources is None and augment and self.get_batch_size():
+                return self.stream_resources(query or {})
+
             if resources is None:
                 if query is None:
                     query = {}
@@ -542,7 +743,7 @@ class QueryResourceManager(ResourceManager, metaclass=QueryMeta):
                     with self.ctx.tracer.subsegment('resource-augment'):
                         resources = self.augment(resources)
                     # Don't pollute cache with unaugmented resources.
-                    self._cache.save(cache_key, resources)
+                    self._cache.save_resources(cache_key, resources, self.get_model().id)
 
         resource_count = len(resources)
         with self.ctx.tracer.subsegment('filter'):
@@ -553,6 +754,50 @@ class QueryResourceManager(ResourceManager, metaclass=QueryMeta):
             self.check_resource_limit(len(resources), resource_count)
         return resources
 
+    def get_batch_size(self):
+        """Batch size for streaming resources through augment and filters.
+
+        Streaming is enabled with the ``batch_size`` execution option, and
+        only applies to the policy's own resource manager when none of the
+        policy's filters need the whole resource set. Related and child
+        managers enumerate normally, so their resources stay cached for
+        other policies.
+        """
+        batch_size = getattr(self.config, 'batch_size', None)
+        if not batch_size or self.data != self.ctx.policy.data:
+            return None
+        if any(f.set_scoped for f in self.iter_filters() if f is not None):
+            return None
+        return batch_size
+
+    def stream_resources(self, query):
+        """Enumerate, augment and filter resources in bounded batches.
+
+        Only resources matching the policy filters are retained, so peak
+        memory is proportional to the batch size rather than the resource
+        population. As the population is never materialized it isn't
+        cached.
+        """
+        batch_size = self.get_batch_size()
+        iter_resources = getattr(self.source, 'iter_resources', None)
+        if iter_resources is None:
+            batches = chunks(self.source.resources(query), batch_size)
+        else:
+            batches = iter_resources(query, batch_size)
+
+        resource_count = 0
+        results = []
+        for batch in batches:
+            resource_count += len(batch)
+            with self.ctx.tracer.subsegment('resource-augment'):
+                batch = self.augment(batch)
+            with self.ctx.tracer.subsegment('filter'):
+                results.extend(self.filter_resources(batch))
+
+        if self.data == self.ctx.policy.data:
+            self.check_resource_limit(len(results), resource_count)
+        return results
+
     def check_resource_limit(self, selection_count, population_count):
         """Check if policy's execution affects more resources then its limit.
 
@@ -566,12 +811,10 @@ class QueryResourceManager(ResourceManager, metaclass=QueryMeta):
     def _get_cached_resources(self, ids):
         key = self.get_cache_key(None)
         with self._cache:
-            resources = self._cache.get(key)
+            resources = self._cache.get_resources(key, ids, self.get_model().id)
             if resources is not None:
                 self.log.debug("Using cached results for get_resources")
-                m = self.get_model()
-                id_set = set(ids)
-                return [r for r in resources if r[m.id] in id_set]
+                return resources
         return None
 
     def get_resources(self, ids, cache=True, augment=True):
@@ -719,6 +962,203 @@ class ChildResourceManager(QueryResourceManager):
         return self.get_resource_manager(self.resource_type.parent_spec[0])
 
 
+class ResourceFetchPlan:
+    """Share resource enumeration across the policies of a single run.
+
+    Policies whose resource managers resolve to the same cache key
+    (account, region, resource type, source and query) are grouped, the
+    first policy of a group to execute fetches and augments the
+    resources, and the remaining policies of the group are handed a
+    copy of that in-memory resource set instead of enumerating again.
+
+    Shared resource sets are released once every policy in their group
+    has consumed them, so peak memory is bounded by the groups in
+    flight rather than the whole run.
+
+    The plan also holds run scoped indexes, see :func:`get_run_index`,
+    which filters use to share derived data across the run's policies
+    without persisting it past the run.
+    """
+
+    log = logging.getLogger('custodian.query.plan')
+
+    def __init__(self, policies=()):
+        # encoded cache key -> ids of policies yet to consume the group
+        self.pending = {}
+        # encoded cache key -> shared resource set
+        self.resources = {}
+        # policy id -> encoded cache key
+        self.policy_keys = {}
+        # encoded cache key -> (policy id, event) of an in-flight fetch
+        self.fetching = {}
+        # encoded index key -> run scoped index
+        self.indexes = {}
+        self.index_locks = {}
+        self.lock = threading.Lock()
+
+        groups = {}
+        for p in policies:
+            p.resource_manager.fetch_plan = self
+            key = self.get_plan_key(p)
+            if key is not None:
+                groups.setdefault(key, []).append(p)
+
+        for key, group in groups.items():
+            if len(group) < 2:
+                continue
+            self.pending[key] = {id(p) for p in group}
+            for p in group:
+                self.policy_keys[id(p)] = key
+                p.resource_manager._cache = FetchPlanCache(
+                    p.resource_manager._cache, self, id(p))
+        self.log.debug(
+            "planned %d shared fetches for %d policies",
+            len(self.pending), len(self.policy_keys))
+
+    @staticmethod
+    def get_plan_key(policy):
+        if not (policy.execution_mode == 'pull' or policy.options.dryrun):
+            return None
+        manager = policy.resource_manager
+        if not isinstance(manager, QueryResourceManager) or manager.get_batch_size():
+            return None
+        return cache.encode(
+            manager.get_cache_key(manager.source.get_query_params(None)))
+
+    def get(self, key, consumer):
+        """Get a copy of a shared resource set.
+
+        Returns None when the caller should fetch the resources itself,
+        if another policy of the group is already fetching them we wait
+        for its result rather than enumerating concurrently.
+        """
+        if key not in self.pending:
+            return None
+        while True:
+            with self.lock:
+                if key in self.resources:
+                    pending = self.pending[key]
+                    pending.discard(consumer)
+                    if not pending:
+                        return self.resources.pop(key)
+                    return copy.deepcopy(self.resources[key])
+                owner, fetched = self.fetching.get(key, (None, None))
+                if owner is None:
+                    self.fetching[key] = (consumer, threading.Event())
+                    return None
+                elif owner == consumer:
+                    return None
+            fetched.wait()
+
+    def save(self, key, consumer, resources):
+        if key not in self.pending:
+            return
+        with self.lock:
+            owner, fetched = self.fetching.pop(key, (None, None))
+            pending = self.pending.get(key, set())
+            pending.discard(consumer)
+            if pending:
+                self.resources[key] = copy.deepcopy(resources)
+        if fetched is not None:
+            fetched.set()
+
+    def get_index(self, key, build):
+        """Get a run scoped index, building it on first use.
+
+        Policies asking for an index being built wait for it rather than
+        building it concurrently. A build returning None isn't kept, so a
+        later caller may build it.
+        """
+        key = cache.encode(key)
+        with self.lock:
+            key_lock = self.index_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            if key not in self.indexes:
+                index = build()
+                if index is None:
+                    return None
+                self.indexes[key] = index
+            return self.indexes[key]
+
+    def release(self, policy):
+        """Mark a policy as done, dropping any shared set no longer needed."""
+        with self.lock:
+            key = self.policy_keys.pop(id(policy), None)
+            if key is None:
+                return
+            pending = self.pending[key]
+            pending.discard(id(policy))
+            if not pending:
+                self.resources.pop(key, None)
+            # a policy that errored or skipped saving hands the fetch
+            # over to the next waiting policy of the group.
+            owner, fetched = self.fetching.get(key, (None, None))
+            if owner == id(policy):
+                self.fetching.pop(key)
+            else:
+                fetched = None
+        if fetched is not None:
+            fetched.set()
+
+
+def get_run_index(manager, key, build):
+    """Get data derived by a filter, shared across the policies of a run.
+
+    Indexes are held in memory on the run's fetch plan and never persisted,
+    so unlike the resource cache they are never served to a later run.
+    Outside of a planned run (ie. lambda policies) the index is built for
+    the caller alone.
+    """
+    plan = getattr(manager, 'fetch_plan', None)
+    if plan is None:
+        return build()
+    return plan.get_index(key, build)
+
+
+class FetchPlanCache(cache.Cache):
+    """Resource manager cache facade that consults a run's fetch plan
+    before the configured cache.
+    """
+
+    def __init__(self, backend, plan, consumer):
+        super().__init__(backend.config, backend.stats)
+        self.backend = backend
+        self.plan = plan
+        self.consumer = consumer
+
+    def load(self):
+        return self.backend.load()
+
+    def get(self, key):
+        resources = self.plan.get(cache.encode(key), self.consumer)
+        if resources is not None:
+            return resources
+        resources = self.backend.get(key)
+        if resources is not None:
+            self.plan.save(cache.encode(key), self.consumer, resources)
+        return resources
+
+    def save(self, key, data):
+        self.plan.save(cache.encode(key), self.consumer, data)
+        return self.backend.save(key, data)
+
+    def get_resources(self, key, ids, id_key):
+        return self.backend.get_resources(key, ids, id_key)
+
+    def save_resources(self, key, resources, id_key):
+        self.plan.save(cache.encode(key), self.consumer, resources)
+        return self.backend.save_resources(key, resources, id_key)
+
+    def invalidate(self, key, ids=None, id_key=None):
+        return self.backend.invalidate(key, ids, id_key)
+
+    def size(self):
+        return self.backend.size()
+
+    def close(self):
+        return self.backend.close()
+
+
 def _batch_augment(manager, model, detail_spec, client, resource_set):
     detail_op, param_name, param_key, detail_path, detail_args = detail_spec
     op = getattr(client, detail_op)
@@ -734,9 +1174,44 @@ def _batch_augment(manager, model, detail_spec, client, resource_set):
     return response[detail_path]
 
 
-def _scalar_augment(manager, model, detail_spec, client, resource_set):
+_operation_limits = {}
+_operation_limits_lock = threading.Lock()
+
+
+def get_operation_limit(key, max_limit):
+    """Get the run wide adaptive concurrency limit for an api operation.
+
+    The key should be (account_id, region, service, operation), as
+    throttling is accounted per account and region. The maximum is fixed
+    by the first caller, later callers bound their own concurrency via
+    their executor.
+    """
+    with _operation_limits_lock:
+        limit = _operation_limits.get(key)
+        if limit is None:
+            limit = _operation_limits[key] = AdaptiveLimit(max_limit)
+        return limit
+
+
+def limited_call(limiter, func, *args, **kw):
+    """Invoke an api call within a slot of an adaptive limit."""
+    limiter.acquire()
+    throttled = False
+    start = time.monotonic()
+    try:
+        return func(*args, **kw)
+    except ClientError as e:
+        throttled = e.response['Error']['Code'] in THROTTLE_CODES
+        raise
+    finally:
+        limiter.release(throttled, time.monotonic() - start)
+
+
+def _scalar_augment(manager, model, detail_spec, client, resource_set, limiter=None):
     detail_op, param_name, param_key, detail_path = detail_spec
     op = getattr(client, detail_op)
+    if limiter is not None:
+        op = functools.partial(limited_call, limiter, op)
     if manager.retry:
         args = (op,)
         op = manager.retry
@@ -1,17 +1,21 @@
 # Copyright The Cloud Custodian Authors.
 # SPDX-License-Identifier: Apache-2.0
+import copy
 import csv
 import io
 import json
 import os.path
 import logging
 import itertools
+import threading
+from urllib.error import HTTPError
 from urllib.request import Request, urlopen
 from urllib.parse import parse_qsl, urlparse
 import zlib
 from contextlib import closing
 
 from c7n.cache import NullCache
+from c7n.exceptions import ClientError
 from c7n.utils import format_string_values, local_session, jmespath_search
 
 log = logging.getLogger('custodian.resolver')
@@ -26,20 +30,38 @@ class URIResolver:
         self.cache = cache
 
     def resolve(self, uri, headers):
-        contents = self.cache.get(("uri-resolver", uri))
-        if contents is not None:
-            return contents
+        return self.fetch(uri, headers)[0]
+
+    def fetch(self, uri, headers, etag=None):
+        """Get the contents of a uri along with its etag.
+
+        When an etag is given the uri is conditionally fetched, and the
+        contents are None if it is unmodified.
+        """
+        if etag is None:
+            contents = self.cache.get(("uri-resolver", uri))
+            if contents is not None:
+                return contents, None
 
         if uri.startswith('s3://'):
-            contents = self.get_s3_uri(uri)
+            contents, etag = self.get_s3_object(uri, etag)
         else:
-            headers.update({"Accept-Encoding": "gzip"})
+            headers = dict(headers, **{"Accept-Encoding": "gzip"})
+            if etag:
+                headers['If-None-Match'] = etag
             req = Request(uri, headers=headers)
-            with closing(urlopen(req)) as response:  # nosec nosemgrep
-                contents = self.handle_response_encoding(response)
+            try:
+                with closing(urlopen(req)) as response:  # nosec nosemgrep
+                    contents = self.handle_response_encoding(response)
+                    etag = response.info().get('ETag')
+            except HTTPError as e:
+                if e.code != 304:
+                    raise
+                contents = None
 
-        self.cache.save(("uri-resolver", uri), contents)
-        return contents
+        if contents is not None:
+            self.cache.save(("uri-resolver", uri), contents)
+        return contents, etag
 
     def handle_response_encoding(self, response):
         if response.info().get('Content-Encoding') != 'gzip':
@@ -50,6 +72,9 @@ class URIResolver:
         return data
 
     def get_s3_uri(self, uri):
+        return self.get_s3_object(uri)[0]
+
+    def get_s3_object(self, uri, etag=None):
         parsed = urlparse(uri)
         client = local_session(self.session_factory).client('s3')
         params = dict(
@@ -59,14 +84,85 @@ class URIResolver:
             params.update(dict(parse_qsl(parsed.query)))
         region = params.pop('region', None)
         client = self.session_factory().client('s3', region_name=region)
-        result = client.get_object(**params)
+        if etag:
+            params['IfNoneMatch'] = etag
+        try:
+            result = client.get_object(**params)
+        except ClientError as e:
+            if e.response['Error']['Code'] not in ('304', 'NotModified'):
+                raise
+            return None, etag
         body = result['Body'].read()
         if params['Key'].lower().endswith(('.gz', '.zip', '.gzip')):
-            return zlib.decompress(body, ZIP_OR_GZIP_HEADER_DETECT).decode('utf-8')
-        elif isinstance(body, str):
-            return body
-        else:
-            return body.decode('utf-8')
+            body = zlib.decompress(body, ZIP_OR_GZIP_HEADER_DETECT)
+        if not isinstance(body, str):
+            body = body.decode('utf-8')
+        return body, result.get('ETag')
+
+
+class Document:
+    """A parsed value_from document."""
+
+    def __init__(self, data, etag, run):
+        self.data = data
+        self.etag = etag
+        self.run = run
+        # expression -> values
+        self.values = {}
+
+
+class DocumentRegistry:
+    """Parsed value_from documents shared by the policies of a run.
+
+    Each url is fetched and parsed once a run, and each expression is
+    evaluated once against the parsed document, regardless of how many
+    filters reference it. Documents from a previous run (ie. a warm
+    lambda container) are revalidated with a conditional request on their
+    etag, and reused if unmodified.
+    """
+
+    def __init__(self):
+        self.documents = {}
+        self.run = 0
+        self.locks = {}
+        self.lock = threading.Lock()
+
+    def register(self, policies):
+        for p in policies:
+            p.resource_manager.value_documents = self
+
+    def start_run(self):
+        self.run += 1
+
+    def get_values(self, values_from):
+        format = values_from.get_format()
+        document = self.get_document(values_from, format)
+        expr = json.dumps(values_from.data.get('expr'))
+        if expr not in document.values:
+            document.values[expr] = values_from.evaluate(document.data, format)
+        return copy.copy(document.values[expr])
+
+    def get_document(self, values_from, format):
+        url = values_from.data['url']
+        headers = values_from.data.get('headers', {})
+        key = (url, format, json.dumps(headers, sort_keys=True))
+        with self.lock:
+            key_lock = self.locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            document = self.documents.get(key)
+            if document is not None and document.run == self.run:
+                return document
+            with values_from.cache:
+                contents, etag = values_from.resolver.fetch(
+                    url, headers, document and document.etag or None)
+            if contents is None:
+                log.debug("value_from url:%s unmodified", url)
+                document.run = self.run
+                return document
+            document = self.documents[key] = Document(
+                values_from.parse_contents(str(contents), format), etag, self.run)
+            return document
 
 
 class ValuesFrom:
@@ -143,8 +239,10 @@ class ValuesFrom:
         self.manager = manager
         self.cache = manager._cache or NullCache({})
         self.resolver = URIResolver(manager.session_factory, self.cache)
+        # shared across the run's policies, see DocumentRegistry
+        self.documents = getattr(manager, 'value_documents', None)
 
-    def get_contents(self):
+    def get_format(self):
         _, format = os.path.splitext(self.data['url'])
 
         if not format or self.data.get('format'):
@@ -156,7 +254,10 @@ class ValuesFrom:
             raise ValueError(
                 "Unsupported format %s for url %s",
                 format, self.data['url'])
+        return format
 
+    def get_contents(self):
+        format = self.get_format()
         params = dict(
             uri=self.data.get('url'),
             headers=self.data.get('headers', {})
@@ -166,6 +267,8 @@ class ValuesFrom:
         return contents, format
 
     def get_values(self):
+        if self.documents is not None and self.data['url'] != 'dynamodb':
+            return self.documents.get_values(self)
         cache_key = [self.data.get(i) for i in ('url', 'format', 'expr', 'headers', 'query')]
         with self.cache:
             # use these values as a key to cache the result so if we have
@@ -215,33 +318,41 @@ class ValuesFrom:
 
     def _get_values(self):
         contents, format = self.get_contents()
+        return self.evaluate(self.parse_contents(contents, format), format)
+
+    def parse_contents(self, contents, format):
+        if format == 'json':
+            return json.loads(contents)
+        elif format == 'csv':
+            return list(csv.reader(io.StringIO(contents)))
+        elif format == 'csv2dict':
+            data = csv.reader(io.StringIO(contents))
+            return {x[0]: list(x[1:]) for x in zip(*data)}
+        elif format == 'txt':
+            return set([s.strip() for s in io.StringIO(contents).readlines()])
 
+    def evaluate(self, data, format):
         if format == 'json':
-            data = json.loads(contents)
             if 'expr' in self.data:
                 return self._get_resource_values(data)
             else:
                 return data
-        elif format == 'csv' or format == 'csv2dict':
-            data = csv.reader(io.StringIO(contents))
-            if format == 'csv2dict':
-                data = {x[0]: list(x[1:]) for x in zip(*data)}
-                if 'expr' in self.data:
-                    return self._get_resource_values(data)
-                else:
-                    combined_data = set(itertools.chain.from_iterable(data.values()))
-                    return combined_data
+        elif format == 'csv2dict':
+            if 'expr' in self.data:
+                return self._get_resource_values(data)
             else:
-                if isinstance(self.data.get('expr'), int):
-                    return set([d[self.data['expr']] for d in data])
-                data = list(data)
-                if 'expr' in self.data:
-                    return self._get_resource_values(data)
-                else:
-                    combined_data = set(itertools.chain.from_iterable(data))
-                    return combined_data
+                combined_data = set(itertools.chain.from_iterable(data.values()))
+                return combined_data
+        elif format == 'csv':
+            if isinstance(self.data.get('expr'), int):
+                return set([d[self.data['expr']] for d in data])
+            if 'expr' in self.data:
+                return self._get_resource_values(data)
+            else:
+                combined_data = set(itertools.chain.from_iterable(data))
+                return combined_data
         elif format == 'txt':
-            return set([s.strip() for s in io.StringIO(contents).readlines()])
+            return data
 
     def _get_resource_values(self, data):
         res = jmespath_search(self.data['expr'], data)
@@ -360,25 +360,51 @@ class ArnResolver:
                     results[rarn.arn] = None
         return results
 
-    @staticmethod
-    def resolve_type(arn):
-        arn = Arn.parse(arn)
+    # resolved (service, resource type) pairs, reset along with the type index
+    # whenever the set of registered aws resources changes.
+    type_cache = {}
+    type_cache_size = 4096
+    type_index = None
+    type_index_size = None
 
-        # this would benefit from a class cache {service} -> rtypes
+    @classmethod
+    def get_type_index(cls):
+        """Map arn service to its candidate resource types, in registry order."""
+        if cls.type_index is not None and cls.type_index_size == len(AWS.resources):
+            return cls.type_index
+        index = {}
         for type_name, klass in AWS.resources.items():
             if type_name in ('rest-account', 'account') or klass.resource_type.arn is False:
                 continue
-            if arn.service != (klass.resource_type.arn_service or klass.resource_type.service):
-                continue
+            rtype = klass.resource_type
+            index.setdefault(rtype.arn_service or rtype.service, []).append((type_name, rtype))
+        cls.type_cache = {}
+        cls.type_index_size = len(AWS.resources)
+        cls.type_index = index
+        return index
+
+    @classmethod
+    def resolve_type(cls, arn):
+        arn = Arn.parse(arn)
+        index = cls.get_type_index()
+        key = (arn.service, arn.resource_type)
+        if key in cls.type_cache:
+            return cls.type_cache[key]
+        type_name = cls.match_type(arn, index.get(arn.service, ()))
+        if len(cls.type_cache) >= cls.type_cache_size:
+            cls.type_cache.clear()
+        cls.type_cache[key] = type_name
+        return type_name
+
+    @staticmethod
+    def match_type(arn, candidates):
+        for type_name, rtype in candidates:
             if (type_name in ('asg', 'ecs-task') and
-                    "%s%s" % (klass.resource_type.arn_type, klass.resource_type.arn_separator)
-                    in arn.resource_type):
+                    "%s%s" % (rtype.arn_type, rtype.arn_separator) in arn.resource_type):
                 return type_name
-            elif (klass.resource_type.arn_type is not None and
-                    klass.resource_type.arn_type == arn.resource_type):
+            elif rtype.arn_type is not None and rtype.arn_type == arn.resource_type:
                 return type_name
-            elif (klass.resource_type.arn_service == arn.service and
-                    klass.resource_type.arn_type == ""):
+            elif rtype.arn_service == arn.service and rtype.arn_type == "":
                 return type_name
 
 
@@ -1,6 +1,6 @@
 # Copyright The Cloud Custodian Authors.
 # SPDX-License-Identifier: Apache-2.0
-from collections import OrderedDict
+from collections import Counter, OrderedDict
 import csv
 import datetime
 import functools
@@ -31,7 +31,9 @@ from c7n.query import (
     ConfigSource,
     DescribeSource,
     QueryResourceManager,
+    RetryPageIterator,
     TypeInfo,
+    get_run_index,
 )
 from c7n.resolver import ValuesFrom
 from c7n.tags import TagActionFilter, TagDelayedAction, Tag, RemoveTag, universal_augment
@@ -957,8 +959,72 @@ class RoleCrossAccountAccess(CrossAccountAccessFilter):
         whitelist={'type': 'array', 'items': {'type': 'string'}})
 
 
+# group attributes as returned by ListGroupsForUser
+GROUP_KEYS = ('Path', 'GroupName', 'GroupId', 'Arn', 'CreateDate')
+
+
+class AccountDetailsMixin:
+    """Share a snapshot of the account's iam users, groups and roles.
+
+    The snapshot is built from GetAccountAuthorizationDetails, paginating
+    each entity type concurrently, and indexed by entity name. It's held
+    on the run (see :func:`c7n.query.get_run_index`), so the iam filters of
+    every policy in a run use the same one, and it's never persisted past
+    the run. Filters use it in place of per resource api calls when it's
+    already present, or when there are enough resources that a few paged
+    calls are cheaper than one call per resource. Resources missing from
+    the snapshot (ie. created since) fall back to per resource calls, as
+    do all resources when the snapshot can't be retrieved, ie. when
+    GetAccountAuthorizationDetails isn't permitted.
+    """
+
+    account_details_min_resources = 100
+    # errors on which filters fall back to per resource calls
+    account_details_errors = (
+        'AccessDenied', 'AccessDeniedException', 'Throttling', 'ThrottlingException')
+    account_details_entities = (
+        ('User', 'UserDetailList', 'UserName'),
+        ('Group', 'GroupDetailList', 'GroupName'),
+        ('Role', 'RoleDetailList', 'RoleName'))
+
+    def get_account_details(self, resources):
+        key = {'account': self.manager.config.account_id, 'iam-account-details': True}
+
+        def _get_account_details():
+            if len(resources) < self.account_details_min_resources:
+                return None
+            client = local_session(self.manager.session_factory).client('iam')
+
+            def _get_entities(entity):
+                entity_type, list_key, name_key = entity
+                pager = client.get_paginator('get_account_authorization_details')
+                pager.PAGE_ITERATOR_CLS = RetryPageIterator
+                results = pager.paginate(Filter=[entity_type]).build_full_result()
+                return {e[name_key]: e for e in results.get(list_key, ())}
+
+            try:
+                with self.executor_factory(max_workers=3) as w:
+                    details = dict(zip(
+                        [e[0] for e in self.account_details_entities],
+                        w.map(_get_entities, self.account_details_entities)))
+            except ClientError as e:
+                if e.response['Error']['Code'] not in self.account_details_errors:
+                    raise
+                # remembered for the run, so filters don't retry the call
+                self.log.warning(
+                    "Unable to get account details, using per resource calls: %s",
+                    e.response['Error']['Code'])
+                return False
+            self.log.debug(
+                "Retrieved account details users:%d groups:%d roles:%d",
+                len(details['User']), len(details['Group']), len(details['Role']))
+            return details
+
+        return get_run_index(self.manager, key, _get_account_details) or None
+
+
 @Role.filter_registry.register('has-inline-policy')
-class IamRoleInlinePolicy(Filter):
+class IamRoleInlinePolicy(AccountDetailsMixin, Filter):
     """Filter IAM roles that have an inline-policy attached
     True: Filter roles that have an inline-policy
     False: Filter roles that do not have an inline-policy
@@ -976,16 +1042,21 @@ class IamRoleInlinePolicy(Filter):
     """
 
     schema = type_schema('has-inline-policy', value={'type': 'boolean'})
-    permissions = ('iam:ListRolePolicies',)
+    permissions = ('iam:ListRolePolicies', 'iam:GetAccountAuthorizationDetails')
 
     def _inline_policies(self, client, resource):
-        policies = client.list_role_policies(
-            RoleName=resource['RoleName'])['PolicyNames']
+        detail = self.details and self.details['Role'].get(resource['RoleName'])
+        if detail is not None:
+            policies = [p['PolicyName'] for p in detail['RolePolicyList']]
+        else:
+            policies = client.list_role_policies(
+                RoleName=resource['RoleName'])['PolicyNames']
         resource['c7n:InlinePolicies'] = policies
         return resource
 
     def process(self, resources, event=None):
         c = local_session(self.manager.session_factory).client('iam')
+        self.details = self.get_account_details(resources)
         res = []
         value = self.data.get('value', True)
         for r in resources:
@@ -1975,7 +2046,7 @@ class UserCredentialReport(CredentialReport):
 
 
 @User.filter_registry.register('has-inline-policy')
-class IamUserInlinePolicy(Filter):
+class IamUserInlinePolicy(AccountDetailsMixin, Filter):
     """
         Filter IAM users that have an inline-policy attached
 
@@ -1984,15 +2055,21 @@ class IamUserInlinePolicy(Filter):
     """
 
     schema = type_schema('has-inline-policy', value={'type': 'boolean'})
-    permissions = ('iam:ListUserPolicies',)
+    permissions = ('iam:ListUserPolicies', 'iam:GetAccountAuthorizationDetails')
 
     def _inline_policies(self, client, resource):
-        resource['c7n:InlinePolicies'] = client.list_user_policies(
-            UserName=resource['UserName'])['PolicyNames']
+        detail = self.details and self.details['User'].get(resource['UserName'])
+        if detail is not None:
+            resource['c7n:InlinePolicies'] = [
+                p['PolicyName'] for p in detail['UserPolicyList']]
+        else:
+            resource['c7n:InlinePolicies'] = client.list_user_policies(
+                UserName=resource['UserName'])['PolicyNames']
         return resource
 
     def process(self, resources, event=None):
         c = local_session(self.manager.session_factory).client('iam')
+        self.details = self.get_account_details(resources)
         value = self.data.get('value', True)
         res = []
         for r in resources:
@@ -2005,7 +2082,7 @@ class IamUserInlinePolicy(Filter):
 
 
 @User.filter_registry.register('policy')
-class UserPolicy(ValueFilter):
+class UserPolicy(AccountDetailsMixin, ValueFilter):
     """Filter IAM users based on attached policy values
 
     :example:
@@ -2029,6 +2106,7 @@ class UserPolicy(ValueFilter):
         'iam:ListAttachedUserPolicies',
         'iam:ListGroupsForUser',
         'iam:ListAttachedGroupPolicies',
+        'iam:GetAccountAuthorizationDetails',
     )
 
     def find_in_user_set(self, user_set, search_key, arn_key, arn):
@@ -2079,11 +2157,54 @@ class UserPolicy(ValueFilter):
             if self.data.get('include-via'):
                 u = self.user_groups_policies(client, user_set, u)
 
+    def user_details_policies(self, details, resources):
+        """Resolve user policies from the account details snapshot.
+
+        Returns the users that aren't in the snapshot. Policies are
+        retrieved once per distinct arn.
+        """
+        client = local_session(self.manager.session_factory).client('iam')
+        policies = {}
+
+        def get_policy(arn):
+            if arn not in policies:
+                policies[arn] = client.get_policy(PolicyArn=arn)['Policy']
+            return policies[arn]
+
+        remaining = []
+        for u in resources:
+            detail = details['User'].get(u['UserName'])
+            if detail is None:
+                remaining.append(u)
+                continue
+            u.setdefault('c7n:Policies', [])
+            for ap in detail['AttachedManagedPolicies']:
+                u['c7n:Policies'].append(get_policy(ap['PolicyArn']))
+            if not self.data.get('include-via'):
+                continue
+            u['c7n:Groups'] = []
+            for g in detail['GroupList']:
+                group = details['Group'].get(g)
+                if group is None:
+                    continue
+                ug = select_keys(group, GROUP_KEYS)
+                ug['AttachedPolicies'] = group['AttachedManagedPolicies']
+                u['c7n:Groups'].append(ug)
+                attached = {p['Arn'] for p in u['c7n:Policies']}
+                for ap in ug['AttachedPolicies']:
+                    if ap['PolicyArn'] not in attached:
+                        u['c7n:Policies'].append(get_policy(ap['PolicyArn']))
+        return remaining
+
     def process(self, resources, event=None):
-        user_set = chunks(resources, size=50)
+        details = self.get_account_details(resources)
+        remaining = resources
+        if details:
+            remaining = self.user_details_policies(details, resources)
+        user_set = chunks(remaining, size=50)
         with self.executor_factory(max_workers=2) as w:
             self.log.debug(
-                "Querying %d users policies" % len(resources))
+                "Querying %d users policies" % len(remaining))
             list(w.map(self.user_policies, user_set))
 
         matched = []
@@ -2095,7 +2216,7 @@ class UserPolicy(ValueFilter):
 
 
 @User.filter_registry.register('group')
-class GroupMembership(ValueFilter):
+class GroupMembership(AccountDetailsMixin, ValueFilter):
     """Filter IAM users based on attached group values
 
     :example:
@@ -2113,7 +2234,7 @@ class GroupMembership(ValueFilter):
 
     schema = type_schema('group', rinherit=ValueFilter.schema)
     schema_alias = False
-    permissions = ('iam:ListGroupsForUser',)
+    permissions = ('iam:ListGroupsForUser', 'iam:GetAccountAuthorizationDetails')
 
     def get_user_groups(self, client, user_set):
         for u in user_set:
@@ -2122,6 +2243,15 @@ class GroupMembership(ValueFilter):
 
     def process(self, resources, event=None):
         client = local_session(self.manager.session_factory).client('iam')
+        details = self.get_account_details(
+            [r for r in resources if 'c7n:Groups' not in r])
+        if details:
+            for r in resources:
+                if 'c7n:Groups' not in r and r['UserName'] in details['User']:
+                    r['c7n:Groups'] = [
+                        select_keys(details['Group'][g], GROUP_KEYS)
+                        for g in details['User'][r['UserName']]['GroupList']
+                        if g in details['Group']]
         with self.executor_factory(max_workers=2) as w:
             futures = []
             for user_set in chunks(
@@ -2864,7 +2994,7 @@ def resolve_credential_keys(m_keys, keys):
 
 
 @Group.filter_registry.register('has-specific-managed-policy')
-class SpecificIamGroupManagedPolicy(Filter):
+class SpecificIamGroupManagedPolicy(AccountDetailsMixin, Filter):
     """Filter IAM groups that have a specific policy attached
 
     For example, if the user wants to check all groups with 'admin-policy':
@@ -2882,15 +3012,19 @@ class SpecificIamGroupManagedPolicy(Filter):
     """
 
     schema = type_schema('has-specific-managed-policy', value={'type': 'string'})
-    permissions = ('iam:ListAttachedGroupPolicies',)
+    permissions = ('iam:ListAttachedGroupPolicies', 'iam:GetAccountAuthorizationDetails')
 
     def _managed_policies(self, client, resource):
+        detail = self.details and self.details['Group'].get(resource['GroupName'])
+        if detail is not None:
+            return [r['PolicyName'] for r in detail['AttachedManagedPolicies']]
         return [r['PolicyName'] for r in client.list_attached_group_policies(
             GroupName=resource['GroupName'])['AttachedPolicies']]
 
     def process(self, resources, event=None):
         c = local_session(self.manager.session_factory).client('iam')
         if self.data.get('value'):
+            self.details = self.get_account_details(resources)
             results = []
             for r in resources:
                 r["ManagedPolicies"] = self._managed_policies(c, r)
@@ -2901,7 +3035,7 @@ class SpecificIamGroupManagedPolicy(Filter):
 
 
 @Group.filter_registry.register('has-users')
-class IamGroupUsers(Filter):
+class IamGroupUsers(AccountDetailsMixin, Filter):
     """Filter IAM groups that have users attached based on True/False value:
     True: Filter all IAM groups with users assigned to it
     False: Filter all IAM groups without any users assigned to it
@@ -2917,20 +3051,25 @@ class IamGroupUsers(Filter):
             value: False
     """
     schema = type_schema('has-users', value={'type': 'boolean'})
-    permissions = ('iam:GetGroup',)
+    permissions = ('iam:GetGroup', 'iam:GetAccountAuthorizationDetails')
 
     def _user_count(self, client, resource):
+        if self.details and resource['GroupName'] in self.details['Group']:
+            return self.group_users[resource['GroupName']]
         return len(client.get_group(GroupName=resource['GroupName'])['Users'])
 
     def process(self, resources, events=None):
         c = local_session(self.manager.session_factory).client('iam')
+        self.details = self.get_account_details(resources)
+        self.group_users = Counter(itertools.chain.from_iterable(
+            u['GroupList'] for u in (self.details or {}).get('User', {}).values()))
         if self.data.get('value', True):
             return [r for r in resources if self._user_count(c, r) > 0]
         return [r for r in resources if self._user_count(c, r) == 0]
 
 
 @Group.filter_registry.register('has-inline-policy')
-class IamGroupInlinePolicy(Filter):
+class IamGroupInlinePolicy(AccountDetailsMixin, Filter):
     """Filter IAM groups that have an inline-policy based on boolean value:
     True: Filter all groups that have an inline-policy attached
     False: Filter all groups that do not have an inline-policy attached
@@ -2946,15 +3085,21 @@ class IamGroupInlinePolicy(Filter):
             value: True
     """
     schema = type_schema('has-inline-policy', value={'type': 'boolean'})
-    permissions = ('iam:ListGroupPolicies',)
+    permissions = ('iam:ListGroupPolicies', 'iam:GetAccountAuthorizationDetails')
 
     def _inline_policies(self, client, resource):
-        resource['c7n:InlinePolicies'] = client.list_group_policies(
-            GroupName=resource['GroupName'])['PolicyNames']
+        detail = self.details and self.details['Group'].get(resource['GroupName'])
+        if detail is not None:
+            resource['c7n:InlinePolicies'] = [
+                p['PolicyName'] for p in detail['GroupPolicyList']]
+        else:
+            resource['c7n:InlinePolicies'] = client.list_group_policies(
+                GroupName=resource['GroupName'])['PolicyNames']
         return resource
 
     def process(self, resources, events=None):
         c = local_session(self.manager.session_factory).client('iam')
+        self.details = self.get_account_details(resources)
         value = self.data.get('value', True)
         res = []
         for r in resources:
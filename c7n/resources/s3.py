@@ -510,8 +510,9 @@ class BucketAssembly:
         self.augment_fields = set(self.detect_augment_fields())
         # location is required for client construction
         self.augment_fields.add('Location')
-        # custodian always returns tags
-        self.augment_fields.add('Tags')
+        # custodian always returns tags, unless asked for minimal augmentation
+        if self.manager.needs_fields(('Tags',)):
+            self.augment_fields.add('Tags')
 
     def validate(self):
         config = self.get_augment_config()
@@ -544,7 +545,12 @@ class BucketAssembly:
         augment_config = self.get_augment_config()
 
         if augment_config == 'all':
-            return augment_keys
+            required = None
+            if getattr(self.manager.config, 'minimal_augment', False):
+                required = self.manager.get_required_fields()
+            if required is None or 'c7n:DeniedMethods' in required:
+                return augment_keys
+            return [k for k in augment_keys if k in required]
         elif augment_config == 'none':
             return []
         elif isinstance(augment_config, list):
@@ -12,7 +12,9 @@ from c7n.filters.kms import KmsRelatedFilter
 import c7n.filters.policystatement as polstmt_filter
 from c7n.manager import resources
 from c7n.utils import local_session
-from c7n.query import ConfigSource, DescribeSource, QueryResourceManager, TypeInfo
+from c7n.query import (
+    ConfigSource, DescribeSource, QueryResourceManager, TypeInfo, get_operation_limit,
+    limited_call)
 from c7n.actions import BaseAction
 from c7n.utils import type_schema
 from c7n.tags import universal_augment
@@ -25,11 +27,15 @@ class DescribeQueue(DescribeSource):
 
     def augment(self, resources):
         client = self.manager.get_client()
+        limiter = get_operation_limit(
+            (self.manager.config.account_id, self.manager.config.region,
+             'sqs', 'get_queue_attributes'),
+            getattr(self.manager.config, 'augment_workers', None) or 2)
 
         def _augment(r):
             try:
                 queue = self.manager.retry(
-                    client.get_queue_attributes,
+                    limited_call, limiter, client.get_queue_attributes,
                     QueueUrl=r,
                     AttributeNames=['All'])['Attributes']
                 queue['QueueUrl'] = r
@@ -43,7 +49,7 @@ class DescribeQueue(DescribeSource):
                 raise
             return queue
 
-        with self.manager.executor_factory(max_workers=2) as w:
+        with self.manager.executor_factory(max_workers=limiter.max_limit) as w:
             return universal_augment(
                 self.manager, list(filter(None, w.map(_augment, resources))))
 
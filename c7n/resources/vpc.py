@@ -1090,17 +1090,33 @@ class SGUsage(Filter):
              ['lambda', 'eni', 'launch-config', 'security-group', 'event-rule-target',
               'aws.batch-compute']]))
 
+    def get_index_key(self, kind, **params):
+        """Run index key for security group usage data shared across policies."""
+        return dict(
+            account=self.manager.account_id, region=self.manager.config.region,
+            resource='sg-usage', kind=kind, **params)
+
     def filter_peered_refs(self, resources):
         if not resources:
             return resources
-        # Check that groups are not referenced across accounts
-        client = local_session(self.manager.session_factory).client('ec2')
-        peered_ids = set()
-        for resource_set in chunks(resources, 200):
-            for sg_ref in client.describe_security_group_references(
-                    GroupId=[r['GroupId'] for r in resource_set]
-            )['SecurityGroupReferenceSet']:
-                peered_ids.add(sg_ref['GroupId'])
+        # Check that groups are not referenced across accounts, group
+        # lookups are remembered for the run so other usage filters only
+        # query new ones.
+        peered = query.get_run_index(self.manager, self.get_index_key('peered-refs'), dict)
+        missing = [r['GroupId'] for r in resources if r['GroupId'] not in peered]
+        if missing:
+            client = local_session(self.manager.session_factory).client('ec2')
+
+            def _peered_refs(group_ids):
+                return client.describe_security_group_references(
+                    GroupId=group_ids)['SecurityGroupReferenceSet']
+
+            found = dict.fromkeys(missing, False)
+            with self.manager.executor_factory(max_workers=3) as w:
+                for sg_refs in w.map(_peered_refs, chunks(missing, 200)):
+                    found.update({sg_ref['GroupId']: True for sg_ref in sg_refs})
+            peered.update(found)
+        peered_ids = {r['GroupId'] for r in resources if peered[r['GroupId']]}
         self.log.debug(
             "%d of %d groups w/ peered refs", len(peered_ids), len(resources))
         return [r for r in resources if r['GroupId'] not in peered_ids]
@@ -1117,16 +1133,29 @@ class SGUsage(Filter):
         )
 
     def scan_groups(self):
-        used = set()
-        for kind, scanner in self.get_scanners():
-            sg_ids = scanner()
-            new_refs = sg_ids.difference(used)
-            used = used.union(sg_ids)
-            self.log.debug(
-                "%s using %d sgs, new refs %s total %s",
-                kind, len(sg_ids), len(new_refs), len(used))
+        """Get the ids of security groups in use.
 
-        return used
+        The scan is held on the run, so the usage filters of other
+        policies in the same account and region reuse it instead of
+        scanning again.
+        """
+        scanners = self.get_scanners()
+        key = self.get_index_key('usage', scanners=sorted(kind for kind, _ in scanners))
+        index = query.get_run_index(self.manager, key, lambda: self.scan_usage(scanners))
+        self.nics = index['nics']
+        return set(index['used'])
+
+    def scan_usage(self, scanners):
+        used = set()
+        with self.manager.executor_factory(max_workers=max(1, len(scanners))) as w:
+            results = w.map(lambda scanner: scanner[1](), scanners)
+            for (kind, _), sg_ids in zip(scanners, results):
+                new_refs = sg_ids.difference(used)
+                used = used.union(sg_ids)
+                self.log.debug(
+                    "%s using %d sgs, new refs %s total %s",
+                    kind, len(sg_ids), len(new_refs), len(used))
+        return {'used': used, 'nics': getattr(self, 'nics', [])}
 
     def get_launch_config_sgs(self):
         # Note assuming we also have launch config garbage collection
@@ -1341,16 +1370,13 @@ class Stale(Filter):
     permissions = ('ec2:DescribeStaleSecurityGroups',)
 
     def process(self, resources, event=None):
-        client = local_session(self.manager.session_factory).client('ec2')
         vpc_ids = {r['VpcId'] for r in resources if 'VpcId' in r}
         group_map = {r['GroupId']: r for r in resources}
         results = []
         self.log.debug("Querying %d vpc for stale refs", len(vpc_ids))
         stale_count = 0
         for vpc_id in vpc_ids:
-            stale_groups = client.describe_stale_security_groups(
-                VpcId=vpc_id).get('StaleSecurityGroupSet', ())
-
+            stale_groups = self.get_stale_groups(vpc_id)
             stale_count += len(stale_groups)
             for s in stale_groups:
                 if s['GroupId'] in group_map:
@@ -1364,6 +1390,18 @@ class Stale(Filter):
         self.log.debug("Found %d stale security groups", stale_count)
         return results
 
+    def get_stale_groups(self, vpc_id):
+        # shared with other stale filters of the run
+        key = {'account': self.manager.account_id, 'region': self.manager.config.region,
+               'resource': 'sg-usage', 'kind': 'stale', 'vpc': vpc_id}
+
+        def _stale_groups():
+            client = local_session(self.manager.session_factory).client('ec2')
+            return client.describe_stale_security_groups(
+                VpcId=vpc_id).get('StaleSecurityGroupSet', [])
+
+        return query.get_run_index(self.manager, key, _stale_groups)
+
 
 @SecurityGroup.filter_registry.register('default-vpc')
 class SGDefaultVpc(net_filters.DefaultVpcBase):
@@ -15,11 +15,13 @@ from datetime import datetime, timedelta
 from dateutil import tz as tzutil
 from dateutil.parser import parse
 
+import logging
+import threading
 import time
 
 from c7n.manager import resources as aws_resources
 from c7n.actions import BaseAction as Action, AutoTagUser
-from c7n.exceptions import PolicyValidationError, PolicyExecutionError
+from c7n.exceptions import ClientError, PolicyValidationError, PolicyExecutionError
 from c7n.resources import load_resources
 from c7n.filters import Filter, OPERATORS
 from c7n.filters.offhours import Time
@@ -68,8 +70,8 @@ def register_universal_tags(filters, actions, compatibility=True):
 def universal_augment(self, resources):
     # Resource Tagging API Support
     # https://docs.aws.amazon.com/awsconsolehelpdocs/latest/gsg/supported-resources.html
-    # Bail on empty set
-    if not resources:
+    # Bail on empty set, or when the policy doesn't use tags
+    if not resources or not self.needs_fields(('Tags',)):
         return resources
 
     region = utils.get_resource_tagging_region(self.resource_type, self.region)
@@ -83,21 +85,133 @@ def universal_augment(self, resources):
     paginator.PAGE_ITERATOR_CLS = RetryPageIterator
 
     rfetch = [r for r in resources if 'Tags' not in r]
+    arns = self.get_arns(rfetch)
 
-    for arn_resource_set in utils.chunks(
-            zip(self.get_arns(rfetch), rfetch), 100):
-        arn_resource_map = dict(arn_resource_set)
-        resource_tag_results = client.get_resources(
-            ResourceARNList=list(arn_resource_map.keys())).get(
-                'ResourceTagMappingList', ())
-        resource_tag_map = {
-            r['ResourceARN']: r['Tags'] for r in resource_tag_results}
-        for arn, r in arn_resource_map.items():
-            r['Tags'] = resource_tag_map.get(arn, [])
+    resource_tag_map = {}
+    prefetch = getattr(self, 'tag_prefetch', None)
+    if prefetch is not None:
+        resource_tag_map = prefetch.get_tags(self, client, arns)
+    resource_tag_map.update(get_arn_tags(
+        self, client, [arn for arn in arns if arn not in resource_tag_map]))
+
+    for arn, r in zip(arns, rfetch):
+        r['Tags'] = resource_tag_map.get(arn, [])
 
     return resources
 
 
+def get_arn_tags(manager, client, arns):
+    """Fetch tags for arns from the tagging api, a hundred arns per call."""
+    def _get_tags(arn_set):
+        return client.get_resources(ResourceARNList=arn_set).get(
+            'ResourceTagMappingList', ())
+
+    resource_tag_map = {}
+    if not arns:
+        return resource_tag_map
+    with manager.executor_factory(max_workers=manager.max_workers) as w:
+        for resource_tag_results in w.map(_get_tags, utils.chunks(arns, 100)):
+            resource_tag_map.update(
+                {r['ResourceARN']: r['Tags'] for r in resource_tag_results})
+    return resource_tag_map
+
+
+class TagPrefetch:
+    """Share region wide tag sweeps across the policies of a run.
+
+    Universally tagged resource types used by the run's policies are
+    grouped by account and tagging region. The first policy to augment
+    resources in a region pulls the tags for every planned type there
+    with a paginated ``ResourceTypeFilters`` sweep, later policies are
+    served from that tag map.
+
+    The sweep only returns resources that carry tags, arns it doesn't
+    cover are looked up directly, so resources created or tagged since
+    the sweep still get their current tags.
+    """
+
+    log = logging.getLogger('custodian.tags.prefetch')
+
+    # tagging api limit on resource type filters per sweep
+    type_batch_size = 100
+
+    def __init__(self, policies=()):
+        # (account, region) -> type filters used by the run's policies
+        self.planned = {}
+        # (account, region) -> type filters already swept
+        self.swept = {}
+        # (account, region) -> {arn: tags}
+        self.tags = {}
+        self.locks = {}
+        self.lock = threading.Lock()
+
+        for p in policies:
+            if p.provider_name != 'aws':
+                continue
+            manager = p.resource_manager
+            type_filter = self.get_type_filter(manager)
+            if type_filter is None or not manager.needs_fields(('Tags',)):
+                continue
+            self.planned.setdefault(self.get_key(manager), set()).add(type_filter)
+            manager.tag_prefetch = self
+        self.log.debug(
+            "planned tag sweeps for %d types across %d regions",
+            sum(map(len, self.planned.values())), len(self.planned))
+
+    @staticmethod
+    def get_key(manager):
+        return (getattr(manager.config, 'account_id', None),
+                utils.get_resource_tagging_region(manager.resource_type, manager.region))
+
+    @staticmethod
+    def get_type_filter(manager):
+        m = getattr(manager, 'resource_type', None)
+        if m is None or not getattr(m, 'universal_taggable', False) or m.arn is False:
+            return None
+        service = m.arn_service or m.service
+        if m.arn_type:
+            return "%s:%s" % (service, m.arn_type)
+        return service
+
+    def get_tags(self, manager, client, arns):
+        """Get the swept tags for any of the given arns.
+
+        Sweeps the manager's region on first use, covering every planned
+        type there as well as the manager's own.
+        """
+        key = self.get_key(manager)
+        type_filter = self.get_type_filter(manager)
+        with self.lock:
+            region_lock = self.locks.setdefault(key, threading.Lock())
+        with region_lock:
+            swept = self.swept.setdefault(key, set())
+            tag_map = self.tags.setdefault(key, {})
+            if type_filter is not None and type_filter not in swept:
+                types = (self.planned.get(key, set()) | {type_filter}) - swept
+                tag_map.update(self.sweep(client, sorted(types)))
+                swept.update(types)
+        return {arn: tag_map[arn] for arn in arns if arn in tag_map}
+
+    def sweep(self, client, types):
+        from c7n.query import RetryPageIterator
+        paginator = client.get_paginator('get_resources')
+        paginator.PAGE_ITERATOR_CLS = RetryPageIterator
+
+        results = {}
+        for type_set in utils.chunks(types, self.type_batch_size):
+            try:
+                for page in paginator.paginate(ResourceTypeFilters=type_set):
+                    results.update({
+                        r['ResourceARN']: r['Tags']
+                        for r in page.get('ResourceTagMappingList', ())})
+            except ClientError as e:
+                # resources of these types fall back to arn lookups
+                self.log.warning(
+                    "unable to sweep tags for %s: %s", ", ".join(type_set), e)
+        self.log.debug("swept tags for %d resources of %d types", len(results), len(types))
+        return results
+
+
 def _common_tag_processer(executor_factory, batch_size, concurrency, client,
                           process_resource_set, id_key, resources, tags,
                           log):
@@ -282,6 +396,9 @@ class TagActionFilter(Filter):
                     self.data.get('tz'), self.manager.data))
         return self
 
+    def get_required_fields(self):
+        return {'Tags'}
+
     def __call__(self, i):
         tag = self.data.get('tag', DEFAULT_TAG)
         op = self.data.get('op', 'stop')
@@ -289,12 +406,7 @@ class TagActionFilter(Filter):
         skew_hours = self.data.get('skew_hours', 0)
         tz = tzutil.gettz(Time.TZ_ALIASES.get(self.data.get('tz', 'utc')))
 
-        v = None
-        for n in i.get('Tags', ()):
-            if n['Key'] == tag:
-                v = n['Value']
-                break
-
+        v = utils.get_tag_map(i).get(tag)
         if v is None:
             return False
         if ':' not in v or '@' not in v:
@@ -346,13 +458,15 @@ class TagCountFilter(Filter):
         op={'enum': list(OPERATORS.keys())})
     schema_alias = True
 
+    def get_required_fields(self):
+        return {'Tags'}
+
     def __call__(self, i):
         count = self.data.get('count', 10)
         op_name = self.data.get('op', 'gte')
         op = OPERATORS.get(op_name)
         tag_count = len([
-            t['Key'] for t in i.get('Tags', [])
-            if not t['Key'].startswith('aws:')])
+            k for k in utils.get_tag_map(i) if not k.startswith('aws:')])
         return op(tag_count, count)
 
 
@@ -537,7 +651,7 @@ class RenameTag(Action):
         old_key = self.data.get('old_key', None)
         resource_set = {}
         for r in instances:
-            tags = {t['Key']: t['Value'] for t in r.get('Tags', [])}
+            tags = utils.get_tag_map(r)
             if tags[old_key] not in resource_set:
                 resource_set[tags[old_key]] = []
             resource_set[tags[old_key]].append(r)
@@ -547,7 +661,7 @@ class RenameTag(Action):
         old_key = self.data.get('old_key', None)
         filtered_resources = [
             r for r in resources
-            if old_key in (t['Key'] for t in r.get('Tags', []))
+            if old_key in utils.get_tag_map(r)
         ]
         return filtered_resources
 
@@ -774,7 +888,7 @@ class NormalizeTag(Action):
         key = self.data.get('key', None)
         resource_set = {}
         for r in instances:
-            tags = {t['Key']: t['Value'] for t in r.get('Tags', [])}
+            tags = utils.get_tag_map(r)
             if tags[key] not in resource_set:
                 resource_set[tags[key]] = []
             resource_set[tags[key]].append(r)
@@ -784,7 +898,7 @@ class NormalizeTag(Action):
         key = self.data.get('key', None)
         filtered_resources = [
             r for r in resources
-            if key in (t['Key'] for t in r.get('Tags', []))
+            if key in utils.get_tag_map(r)
         ]
         return filtered_resources
 
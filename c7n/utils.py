@@ -371,6 +371,71 @@ def set_annotation(i, k, v):
         i[k] = v
 
 
+class TagList(list):
+    """A resource's list of tags with cached key to value maps.
+
+    Maps are built on first lookup, keyed by an optional tag key
+    normalization function, and dropped whenever the list is modified.
+    As with a linear scan of the tags, the first tag with a given key
+    wins.
+    """
+
+    def get_map(self, normalize=None):
+        maps = self.__dict__.setdefault('_maps', {})
+        tag_map = maps.get(normalize)
+        if tag_map is not None:
+            return tag_map
+        tag_map = {}
+        for t in self:
+            if normalize is None:
+                tag_map.setdefault(t.get('Key'), t.get('Value'))
+                continue
+            try:
+                tag_map.setdefault(normalize(t['Key']), t['Value'])
+            except (AttributeError, SyntaxError, KeyError):
+                pass
+        maps[normalize] = tag_map
+        return tag_map
+
+    def _invalidate(self):
+        self.__dict__.pop('_maps', None)
+
+    def __reduce_ex__(self, protocol):
+        # Copies and pickles carry the tags, not the cached maps.
+        return (TagList, (list(self),))
+
+
+def _invalidating(name):
+    method = getattr(list, name)
+
+    def mutate(self, *args, **kw):
+        self._invalidate()
+        return method(self, *args, **kw)
+    mutate.__name__ = name
+    return mutate
+
+
+for _name in ('__setitem__', '__delitem__', '__iadd__', '__imul__', 'append',
+              'extend', 'insert', 'pop', 'remove', 'clear', 'sort', 'reverse'):
+    setattr(TagList, _name, _invalidating(_name))
+
+
+def get_tag_map(resource, normalize=None):
+    """Return a key to value map of the resource's tags.
+
+    The resource's `Tags` list is replaced with a :class:`TagList` on
+    first use, so repeated lookups share one map per resource.
+    Individual tags must not be modified in place, instead replace
+    them in, or replace, the list.
+    """
+    tags = resource.get('Tags')
+    if not tags or not isinstance(tags, list):
+        return {}
+    if not isinstance(tags, TagList):
+        tags = resource['Tags'] = TagList(tags)
+    return tags.get_map(normalize)
+
+
 def parse_s3(s3_path):
     if not s3_path.startswith('s3://'):
         raise ValueError("invalid s3 path")
@@ -1217,6 +1282,28 @@ def jmespath_compile(expression):
     return parsed
 
 
+def jmespath_fields(expression):
+    """Return the names of the fields a jmespath expression reads.
+
+    Nested field names are included as well as top level ones, so the
+    result errs on the side of more fields. Returns None for expressions
+    that refer to the whole document (``@``) or fail to parse.
+    """
+    try:
+        nodes = [jmespath_compile(expression).parsed]
+    except jmespath.exceptions.JMESPathError:
+        return None
+    fields = set()
+    while nodes:
+        node = nodes.pop()
+        if node['type'] == 'current':
+            return None
+        if node['type'] == 'field':
+            fields.add(node['value'])
+        nodes.extend(n for n in node.get('children', ()) if isinstance(n, dict))
+    return fields
+
+
 def snap_to_period_start(start: datetime, end: datetime, period_start: str):
     """
     Adjust the start and end timestamps according to `period_start`.
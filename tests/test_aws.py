@@ -11,6 +11,7 @@ from unittest.mock import Mock, patch
 
 from c7n.config import Bag, Config
 from c7n.exceptions import PolicyValidationError, InvalidOutputConfig
+from c7n.query import QueryResourceManager, TypeInfo
 from c7n.resources import aws, load_resources
 from c7n.schema import StructureParser
 from c7n import output, schema
@@ -105,6 +106,25 @@ class TestArnResolver:
             result = aws.ArnResolver.resolve_type(arn)
             assert result == expected
 
+    def test_arn_resolve_type_index(self, test):
+        load_resources(('aws.ec2',))
+        arn = 'arn:aws:ec2:region:account-id:widget/widget-id'
+        assert aws.ArnResolver.resolve_type(arn) is None
+        index = aws.ArnResolver.get_type_index()
+        assert aws.ArnResolver.get_type_index() is index
+        assert aws.ArnResolver.type_cache[('ec2', 'widget')] is None
+
+        # registering a new resource type rebuilds the index and drops cached misses
+        class Widget(QueryResourceManager):
+            class resource_type(TypeInfo):
+                service = 'ec2'
+                arn_type = 'widget'
+
+        aws.AWS.resources.register('ec2-widget', Widget)
+        test.addCleanup(aws.AWS.resources.unregister, 'ec2-widget')
+        assert aws.ArnResolver.resolve_type(arn) == 'ec2-widget'
+        assert aws.ArnResolver.get_type_index() is not index
+
     def test_arn_cwe_resolver(self):
 
         evars = dict(
@@ -1,6 +1,7 @@
 # Copyright The Cloud Custodian Authors.
 # SPDX-License-Identifier: Apache-2.0
 from argparse import Namespace
+from collections import Counter
 from datetime import datetime, timedelta
 import os
 import pickle
@@ -9,6 +10,7 @@ import sys
 from unittest import TestCase
 
 import pytest
+from dateutil import tz
 
 from c7n import cache, config
 
@@ -99,3 +101,79 @@ def test_sqlkv_convert(tmp_path):
     kv.close()
     with open(cache_path, 'rb') as fh:
         assert fh.read(15) == b"SQLite format 3"
+
+
+def test_sqlkv_resources(tmp_path):
+    kv = cache.SqlKvCache(config.Bag(cache=tmp_path / "cache.db", cache_period=60))
+    kv.load()
+    k1 = {"account": "12345678901234", "region": "us-west-2", "resource": "ec2"}
+    created = datetime(2024, 1, 1, tzinfo=tz.tzutc())
+    v1 = [{'id': 'a', 'Created': created}, {'id': 'b'}, {'id': 'c'}]
+
+    kv.save_resources(k1, v1, 'id')
+    assert kv.get(k1) == v1
+    assert kv.get(k1)[0]['Created'] == created
+    assert kv.get_resources(k1, ['c', 'a', 'x'], 'id') == [v1[0], v1[2]]
+
+    kv.invalidate(k1, ['b'], 'id')
+    assert kv.get(k1) == [v1[0], v1[2]]
+    kv.invalidate(k1)
+    assert kv.get(k1) is None
+    assert kv.get_resources(k1, ['a'], 'id') is None
+
+    # populations which can't be indexed by id are pickled whole
+    k2 = dict(k1, resource="ecr-image")
+    v2 = [('parent', {'id': 'a'})]
+    kv.save_resources(k2, v2, 'id')
+    assert kv.get(k2) == v2
+    kv.close()
+
+
+def test_mem_resources():
+    mem_cache = cache.InMemoryCache({})
+    k1 = {'region': 'us-east-2', 'resource': 'ebs'}
+    mem_cache.save_resources(k1, [{'id': 'a'}, {'id': 'b'}], 'id')
+    assert mem_cache.get_resources(k1, ['b'], 'id') == [{'id': 'b'}]
+    mem_cache.invalidate(k1, ['b'], 'id')
+    assert mem_cache.get(k1) == [{'id': 'a'}]
+    mem_cache.invalidate(k1)
+    assert mem_cache.get(k1) is None
+
+
+def test_mem_eviction():
+    mem_cache = cache.InMemoryCache(config.Bag(cache_period=5, cache_max_size=1))
+    mem_cache.data.clear()
+    mem_cache.meta.clear()
+    mem_cache.max_size = 1024
+    mem_cache.save({'k': 1}, ['a' * 600])
+    mem_cache.save({'k': 2}, ['b' * 600])
+    assert mem_cache.get({'k': 1}) is None
+    assert mem_cache.get({'k': 2}) == ['b' * 600]
+    assert mem_cache.stats['evictions'] == 1
+    assert mem_cache.stats['hits'] == 1
+    assert mem_cache.stats['misses'] == 1
+
+    # ttl expiration
+    ekey = cache.encode({'k': 2})
+    mem_cache.meta[ekey] = (mem_cache.meta[ekey][0] - 3600, mem_cache.meta[ekey][1])
+    assert mem_cache.get({'k': 2}) is None
+    assert mem_cache.stats['evictions'] == 2
+    assert cache.get_max_size(config.Bag(cache_max_size=2)) == 2 * 1024 * 1024
+
+
+def test_sqlkv_eviction(tmp_path):
+    stats = Counter()
+    kv = cache.SqlKvCache(
+        config.Bag(cache=tmp_path / "cache.db", cache_period=60, cache_max_size=1), stats)
+    kv.max_size = 1024
+    kv.load()
+    kv.save_resources({'k': 1}, [{'id': 'a', 'v': 'a' * 600}], 'id',
+                      datetime.utcnow() - timedelta(minutes=1))
+    kv.save({'k': 2}, ['b' * 600])
+    assert kv.get({'k': 1}) is None
+    assert kv.get({'k': 2}) == ['b' * 600]
+    assert dict(stats) == {
+        'bytes-written': stats['bytes-written'], 'bytes-read': stats['bytes-read'],
+        'evictions': 1, 'hits': 1, 'misses': 1}
+    assert kv.conn.execute('select count(*) from c7n_resource_cache').fetchone()[0] == 0
+    kv.close()
@@ -591,6 +591,43 @@ class RunTest(CliTest):
             ["custodian", "run", "-s", temp_dir, "--debug", yaml_file], CustomError
         )
 
+    def test_concurrent_workers(self):
+        from c7n.policy import Policy
+
+        executed = []
+
+        def execute(p):
+            executed.append(p.name)
+            if p.name == "bad":
+                raise Exception("foobar")
+
+        self.patch(Policy, "__call__", execute)
+
+        temp_dir = self.get_temp_dir()
+        yaml_file = self.write_policy_file(
+            {
+                "policies": [
+                    {"name": "good", "resource": "ec2"},
+                    {"name": "bad", "resource": "ec2"},
+                    {"name": "other", "resource": "s3"},
+                ]
+            }
+        )
+
+        log_output = self.capture_logging("custodian.commands")
+        self.run_and_expect_failure(
+            [
+                "custodian", "run", "-s", temp_dir,
+                "--workers", "3", "--service-workers", "1",
+                yaml_file,
+            ],
+            2,
+        )
+        self.assertEqual(sorted(executed), ["bad", "good", "other"])
+        self.assertIn(
+            "The following policies had errors while executing\n - bad",
+            log_output.getvalue())
+
     def test_session_policy(self):
         parser = argparse.ArgumentParser()
         parser.add_argument('--session-policy', action=LoadSessionPolicyJson)
@@ -342,6 +342,47 @@ class TestMetricFilter(BaseTest):
         resources = policy.run()
         self.assertEqual(len(resources), 1)
 
+    def test_metric_filter_metric_data(self):
+        from c7n.filters import metrics
+        self.addCleanup(metrics.metric_data_store.clear)
+        metrics.metric_data_store.clear()
+        session_factory = self.replay_flight_data("test_ec2_metric_data")
+        fetched = []
+        get_metric_data = metrics.MetricsFilter.get_metric_data
+
+        def counted(f, query_set):
+            fetched.extend(k for k, _ in query_set)
+            return get_metric_data(f, query_set)
+
+        self.patch(metrics.MetricsFilter, "get_metric_data", counted)
+        policy_data = {
+            "name": "ec2-utilization",
+            "resource": "ec2",
+            "filters": [
+                {
+                    "type": "metrics",
+                    "name": "CPUUtilization",
+                    "days": 3,
+                    "value": 1.5,
+                }
+            ],
+        }
+        policy = self.load_policy(
+            policy_data, session_factory=session_factory, config={"metric_data": True})
+        resources = policy.run()
+        self.assertEqual(len(resources), 1)
+        self.assertEqual(
+            [d["Average"] for d in resources[0]["c7n.metrics"]["AWS/EC2.CPUUtilization.Average.3"]],
+            [0.5, 1.0])
+        self.assertEqual(len(fetched), 1)
+
+        # a second policy in the same run reuses the retrieved series
+        policy = self.load_policy(
+            dict(policy_data, name="ec2-utilization-2"),
+            session_factory=session_factory, config={"metric_data": True})
+        self.assertEqual(len(policy.run()), 1)
+        self.assertEqual(len(fetched), 1)
+
 
 class TestPropagateSpotTags(BaseTest):
 
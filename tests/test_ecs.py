@@ -7,6 +7,7 @@ import os
 import time
 
 from c7n.exceptions import PolicyExecutionError
+from c7n.query import ConfigSource
 from c7n.resources.aws import Arn
 
 
@@ -119,6 +120,8 @@ class TestEcsService(BaseTest):
     def test_ecs_service_config(self):
         session_factory = self.replay_flight_data(
             'test_ecs_service_config')
+        # recorded before batch retrieval, so exercises config history
+        self.patch(ConfigSource, 'batch_unsupported', {'AWS::ECS::Service'})
         p = self.load_policy({
             'name': 'ctags', 'resource': 'ecs-service', 'source': 'config'},
             session_factory=session_factory)
@@ -127,6 +130,16 @@ class TestEcsService(BaseTest):
         assert resources[0]['name'] == 'queue-processor'
         assert resources[0]['clusterArn'].endswith('cluster/dev')
 
+    def test_ecs_service_config_batch(self):
+        session_factory = self.replay_flight_data('test_ecs_service_config_batch')
+        p = self.load_policy({
+            'name': 'ctags', 'resource': 'ecs-service', 'source': 'config'},
+            session_factory=session_factory)
+        resources = p.run()
+        assert len(resources) == 1
+        assert resources[0]['name'] == 'queue-processor'
+        assert resources[0]['Tags'] == []
+
     def test_ecs_service_tag_augment(self):
         session_factory = self.replay_flight_data(
             'test_ecs_service_tag_augment')
@@ -556,8 +569,27 @@ class TestEcsTaskDefinition(BaseTest):
                     resourceArn=resources[0]["taskDefinitionArn"]).get("tags")}
         self.assertEqual(tags, {"TestKey": "TestValue", "c7n-tag": "present"})
 
+    def test_ecs_task_def_config_batch(self):
+        session_factory = self.replay_flight_data("test_ecs_task_def_config_batch")
+        p = self.load_policy(
+            {
+                "name": "ecs-task-def-config-tag",
+                "resource": "ecs-task-definition",
+                "source": "config",
+                "filters": [
+                    {"tag:test": "name"}
+                ],
+            },
+            session_factory=session_factory,
+        )
+        resources = p.run()
+        self.assertEqual(len(resources), 1)
+        self.assertEqual(resources[0]['family'], 'app-fargate-task')
+
     def test_ecs_task_def_config(self):
         session_factory = self.replay_flight_data("test_ecs_task_def_config")
+        # recorded before batch retrieval, so exercises config history
+        self.patch(ConfigSource, 'batch_unsupported', {'AWS::ECS::TaskDefinition'})
         p = self.load_policy(
             {
                 "name": "ecs-task-def-config-tag",
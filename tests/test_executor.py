@@ -34,6 +34,24 @@ class ExecutorBase:
             )
 
 
+class AdaptiveLimitTest(unittest.TestCase):
+
+    def test_throttle_and_recover(self):
+        limit = executor.AdaptiveLimit(8)
+        limit.acquire()
+        limit.release(throttled=True)
+        self.assertEqual(limit.limit, 4)
+        for i in range(3):
+            limit.acquire()
+            limit.release(throttled=True)
+        self.assertEqual(limit.limit, 1)
+        for i in range(100):
+            limit.acquire()
+            self.assertEqual(limit.active, 1)
+            limit.release()
+        self.assertEqual(limit.limit, 8)
+
+
 class ThreadExecutorTest(ExecutorBase, unittest.TestCase):
     executor_factory = executor.ThreadPoolExecutor
 
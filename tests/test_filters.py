@@ -19,6 +19,7 @@ from c7n.testing import mock_datetime_now
 from c7n.utils import annotation
 from .common import instance, event_data, Bag, BaseTest
 from c7n.filters.core import AnnotationSweeper, ValueRegex, parse_date as core_parse_date
+from c7n.manager import iter_filter_passes
 
 
 class BaseFilterTest(BaseTest):
@@ -104,6 +105,75 @@ class TestOrFilter(unittest.TestCase):
         self.assertEqual(f.process([instance(Architecture="amd64")]), [])
 
 
+class TestOrFilterSet(BaseTest):
+
+    class RecordFilter(base_filters.Filter):
+        type = 'record'
+        permissions = ('ec2:DescribeInstanceAttribute',)
+
+        def process(self, resources, event=None):
+            self.seen = [r['InstanceId'] for r in resources]
+            return [r for r in resources if r['Color'] == 'blue']
+
+    def get_or_filter(self, *filters):
+        p = self.load_policy({
+            'name': 'or-set', 'resource': 'ec2',
+            'filters': [{'or': list(filters)}]})
+        return p.resource_manager.filters[0]
+
+    def test_or_remainder_cost_order(self):
+        block = self.get_or_filter({'Color': 'green'}, {'Color': 'red'})
+        record = self.RecordFilter({}, block.manager)
+        block.filters.insert(0, record)
+        resources = [
+            instance(InstanceId='i-1', Color='green'),
+            instance(InstanceId='i-2', Color='blue'),
+            instance(InstanceId='i-3', Color='red'),
+            instance(InstanceId='i-4', Color='yellow')]
+        self.assertEqual(
+            [r['InstanceId'] for r in block.process(resources)],
+            ['i-1', 'i-2', 'i-3'])
+        # the api backed branch is evaluated last, on unmatched resources
+        self.assertEqual(record.seen, ['i-2', 'i-4'])
+
+    class AnnotateFilter(base_filters.Filter):
+        type = 'annotate'
+        permissions = ('ec2:DescribeInstanceAttribute',)
+
+        def process(self, resources, event=None):
+            for r in resources:
+                r['c7n:attr'] = r['Color']
+            return self.data.get('match') and resources or []
+
+    def test_block_annotation_dependency(self):
+        def get_resources():
+            return [
+                instance(InstanceId='i-1', Color='blue'),
+                instance(InstanceId='i-2', Color='green')]
+
+        # filters reading annotations see those written by filters before them
+        p = self.load_policy({
+            'name': 'not-annotate', 'resource': 'ec2',
+            'filters': [{'not': [{'type': 'value', 'key': '"c7n:attr"', 'value': 'blue'}]}]})
+        block = p.resource_manager.filters[0]
+        block.filters.insert(0, self.AnnotateFilter({'match': True}, block.manager))
+        self.assertEqual([r['InstanceId'] for r in block.process(get_resources())], ['i-2'])
+
+        block = self.get_or_filter({'type': 'value', 'key': '"c7n:attr"', 'value': 'blue'})
+        block.filters.insert(0, self.AnnotateFilter({}, block.manager))
+        self.assertEqual([r['InstanceId'] for r in block.process(get_resources())], ['i-1'])
+
+    def test_or_set_scoped(self):
+        block = self.get_or_filter(
+            {'Color': 'green'},
+            {'type': 'value', 'value_type': 'resource_count', 'op': 'gte', 'value': 2})
+        self.assertTrue(block.set_scoped)
+        resources = [
+            instance(InstanceId='i-1', Color='green'),
+            instance(InstanceId='i-2', Color='blue')]
+        self.assertEqual(len(block.process(resources)), 2)
+
+
 class TestAndFilter(unittest.TestCase):
 
     def test_and(self):
@@ -113,6 +183,31 @@ class TestAndFilter(unittest.TestCase):
         self.assertEqual(f.process([instance(Architecture="x86_64", Color="blue")]), [])
         self.assertEqual(f.process([instance(Architecture="x86_64")]), [])
 
+    def test_and_fused_value_filters(self):
+        f = filters.factory({"and": [
+            {"Architecture": "x86_64"},
+            {"type": "value", "key": "tag:App", "value": "web"},
+            {"type": "value", "key": "Color", "value": ["green", "blue"], "op": "in"}]})
+        self.assertEqual(
+            [len(pass_filters) for pass_filters, _ in iter_filter_passes(f.filters)], [3])
+        resources = [
+            instance(Architecture="x86_64", Color="green", Tags=[{"Key": "App", "Value": "web"}]),
+            instance(Architecture="x86_64", Color="red", Tags=[{"Key": "App", "Value": "web"}]),
+            instance(Architecture="amd64", Color="blue", Tags=[{"Key": "App", "Value": "web"}]),
+            instance(Architecture="x86_64", Color="blue", Tags=[{"Key": "App", "Value": "db"}])]
+        self.assertEqual(f.process(resources), resources[:1])
+        self.assertEqual(
+            annotation(resources[1], base_filters.ANNOTATION_KEY), ["Architecture", "tag:App"])
+
+        # filters with their own process end the fused pass
+        f = filters.factory({"and": [
+            {"Architecture": "x86_64"},
+            {"type": "value", "value_type": "resource_count", "op": "gte", "value": 1},
+            {"Color": "green"}]})
+        self.assertEqual(
+            [len(pass_filters) for pass_filters, _ in iter_filter_passes(f.filters)], [1, 1, 1])
+        self.assertEqual(f.process(resources), resources[:1])
+
 
 class TestNotFilter(unittest.TestCase):
 
@@ -1,6 +1,7 @@
 # Copyright The Cloud Custodian Authors.
 # SPDX-License-Identifier: Apache-2.0
 from .common import BaseTest
+from c7n.query import ConfigSource
 
 
 class NetworkFirewallTest(BaseTest):
@@ -18,6 +19,8 @@ class NetworkFirewallTest(BaseTest):
 
     def test_firewall_config(self):
         factory = self.replay_flight_data('test_network_firewall_config')
+        # recorded before batch retrieval, so exercises config history
+        self.patch(ConfigSource, 'batch_unsupported', {'AWS::NetworkFirewall::Firewall'})
         p = self.load_policy({
             'name': 'firewall-config',
             'source': 'config',
@@ -28,6 +31,19 @@ class NetworkFirewallTest(BaseTest):
         self.assertEqual(len(resources), 1)
         assert resources[0]['FirewallName'] == 'unicron'
 
+    def test_firewall_config_batch(self):
+        factory = self.replay_flight_data('test_network_firewall_config_batch')
+        p = self.load_policy({
+            'name': 'firewall-config',
+            'source': 'config',
+            'resource': 'aws.firewall'},
+            session_factory=factory,
+            config={'region': 'us-east-2'})
+        resources = p.run()
+        self.assertEqual(len(resources), 1)
+        assert resources[0]['FirewallName'] == 'unicron'
+        assert {t['Key'] for t in resources[0]['Tags']} == {'App', 'Owner'}
+
     def test_firewall_tag_untag(self):
         session_factory = self.replay_flight_data('test_firewall_tag_untag')
         tag = {'env': 'dev'}
@@ -8,6 +8,7 @@ import os
 from .common import BaseTest
 from c7n.exceptions import PolicyExecutionError
 from c7n.policy import Policy
+from c7n.resolver import DocumentRegistry
 from c7n import handler
 
 
@@ -65,6 +66,7 @@ class HandleTest(BaseTest):
         work_dir = self.change_cwd()
         self.patch(handler, 'policy_data', None)
         self.patch(handler, 'policy_config', None)
+        self.patch(handler, 'policies', None)
 
         # don't require api creds to resolve account id
         if 'execution-options' not in policy_data:
@@ -91,6 +93,7 @@ class HandleTest(BaseTest):
 
         self.patch(Policy, "push", push)
         self.patch(Policy, "validate", validate)
+        self.validation_called = validation_called
         return output, policy_execution
 
     def test_dispatch_log_event(self):
@@ -139,6 +142,57 @@ class HandleTest(BaseTest):
         handler.dispatch_event({'detail': {'xyz': 'oui'}}, None)
         self.assertEqual(output.getvalue().count('error during'), 2)
 
+    def test_dispatch_reuses_policies(self):
+        _, executions = self.setupLambdaEnv({
+            'policies': [{'resource': 'ec2', 'name': 'xyz'}]})
+        handler.dispatch_event({'detail': {'xyz': 'oui'}}, None)
+        policy = handler.policies[0]
+        handler.dispatch_event({'detail': {'xyz': 'non'}}, None)
+        self.assertIs(handler.policies[0], policy)
+        self.assertEqual(len(executions), 2)
+        self.assertEqual(self.validation_called, [True])
+
+    def test_dispatch_reused_policies_value_from(self):
+        self.setupLambdaEnv({
+            'policies': [{
+                'resource': 'ec2', 'name': 'xyz',
+                'filters': [{
+                    'type': 'value', 'key': 'xyz', 'op': 'in',
+                    'value_from': {
+                        'url': 'file://%s' % os.path.abspath('allowed.json'),
+                        'format': 'json'}}]}]})
+        self.patch(handler, 'value_documents', DocumentRegistry())
+        with open('allowed.json', 'w') as fh:
+            json.dump(['oui'], fh)
+
+        matched = []
+
+        def push(self, event, context):
+            matched.append(
+                self.resource_manager.filters[0]({'xyz': event['detail']['xyz']}))
+
+        self.patch(Policy, "push", push)
+        handler.dispatch_event({'detail': {'xyz': 'oui'}}, None)
+        policy = handler.policies[0]
+        with open('allowed.json', 'w') as fh:
+            json.dump(['non'], fh)
+        handler.dispatch_event({'detail': {'xyz': 'oui'}}, None)
+        handler.dispatch_event({'detail': {'xyz': 'non'}}, None)
+        self.assertIs(handler.policies[0], policy)
+        self.assertEqual(matched, [True, False, True])
+
+    def test_dispatch_member_role_policies_reloaded(self):
+        _, executions = self.setupLambdaEnv({
+            'policies': [{
+                'resource': 'ec2', 'name': 'xyz',
+                'mode': {'type': 'cloudtrail', 'events': ['RunInstances'],
+                         'member-role': 'arn:aws:iam::{account_id}:role/member'}}]})
+        handler.dispatch_event({'detail': {'xyz': 'oui'}}, None)
+        handler.dispatch_event({'detail': {'xyz': 'non'}}, None)
+        self.assertIsNone(handler.policies)
+        self.assertEqual(len(executions), 2)
+        self.assertEqual(self.validation_called, [True, True])
+
     def test_handler(self):
         _, executions = self.setupLambdaEnv({
             'policies': [{
@@ -18,10 +18,13 @@ from c7n.exceptions import PolicyValidationError
 from c7n.executor import MainThreadExecutor
 from c7n.filters.iamaccess import CrossAccountAccessFilter, PolicyChecker
 from c7n.mu import LambdaManager, LambdaFunction, PythonPackageArchive
+from c7n.query import ResourceFetchPlan
 from botocore.exceptions import ClientError
 from c7n.resources.aws import shape_validate
+from c7n.resources import iam
 from c7n.resources.sns import SNS
 from c7n.resources.iam import (
+    AccountDetailsMixin,
     UserMfaDevice,
     UsedIamPolicies,
     UnusedIamPolicies,
@@ -1286,6 +1289,66 @@ class IamUserGroupMembership(BaseTest):
         self.assertEqual(resources[0]["UserName"], "kapil")
         self.assertTrue(resources[0]["c7n:Groups"])
 
+    def test_iam_user_account_details(self):
+        session_factory = self.replay_flight_data("test_iam_account_details")
+        self.patch(AccountDetailsMixin, "executor_factory", MainThreadExecutor)
+        self.patch(AccountDetailsMixin, "account_details_min_resources", 1)
+        p = self.load_policy(
+            {
+                "name": "iam-admin-users",
+                "resource": "iam-user",
+                "filters": [
+                    {"type": "group", "key": "GroupName", "value": "admins"},
+                    {"type": "policy", "key": "PolicyName",
+                     "value": "AdministratorAccess", "include-via": True},
+                    {"type": "has-inline-policy", "value": False},
+                ],
+            },
+            session_factory=session_factory,
+        )
+        plan = ResourceFetchPlan([p])
+        resources = p.run()
+        # group, attached policy and inline policy lookups are all served
+        # by the account details snapshot, without per user calls.
+        self.assertEqual([r["UserName"] for r in resources], ["alice"])
+        self.assertEqual(
+            [g["GroupName"] for g in resources[0]["c7n:Groups"]], ["admins"])
+        self.assertEqual(
+            [p["PolicyName"] for p in resources[0]["c7n:Policies"]],
+            ["AdministratorAccess"])
+        self.assertEqual(resources[0]["c7n:InlinePolicies"], [])
+        # the snapshot is held on the run, not the resource cache
+        self.assertEqual(len(plan.indexes), 1)
+
+    def test_iam_account_details_denied(self):
+        calls = []
+
+        class Client:
+
+            def get_paginator(self, op):
+                calls.append(op)
+                raise ClientError(
+                    {'Error': {'Code': 'AccessDenied'}}, 'GetAccountAuthorizationDetails')
+
+            def list_user_policies(self, UserName):
+                calls.append(UserName)
+                return {'PolicyNames': UserName == 'bob' and ['bob-inline'] or []}
+
+        self.patch(AccountDetailsMixin, "executor_factory", MainThreadExecutor)
+        self.patch(AccountDetailsMixin, "account_details_min_resources", 1)
+        self.patch(iam, "local_session", lambda factory: mock.Mock(client=lambda s: Client()))
+        p = self.load_policy({
+            "name": "iam-inline", "resource": "iam-user",
+            "filters": [{"type": "has-inline-policy"}]})
+        ResourceFetchPlan([p])
+        f = p.resource_manager.filters[0]
+        users = [{"UserName": "alice"}, {"UserName": "bob"}]
+        # without permission for the snapshot, users are checked individually
+        self.assertEqual([r["UserName"] for r in f.process(users)], ["bob"])
+        self.assertEqual([r["UserName"] for r in f.process(users)], ["bob"])
+        self.assertEqual(
+            calls, ['get_account_authorization_details', 'alice', 'bob', 'alice', 'bob'])
+
 
 class IamInstanceProfileFilterUsage(BaseTest):
 
@@ -2506,6 +2569,17 @@ class CrossAccountChecker(TestCase):
             violations = checker.check(p)
             self.assertEqual(bool(violations), expected)
 
+    def test_check_memoized_by_document(self):
+        policies = load_data("iam/sqs-policies.json")
+        checker = PolicyChecker({"allowed_accounts": {"221800032964"}})
+        first = [checker.check(p) for p in policies]
+        second = [checker.check(p) for p in policies]
+        self.assertEqual(first, second)
+        self.assertIsNot(first[1], second[1])
+        distinct = len({json.dumps(p, sort_keys=True) for p in policies})
+        self.assertEqual(checker.cache_stats['misses'], distinct)
+        self.assertEqual(checker.cache_stats['hits'], len(policies) * 2 - distinct)
+
     def test_iam_policies(self):
         policies = load_data("iam/iam-policies.json")
 
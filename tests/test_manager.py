@@ -4,6 +4,7 @@ from copy import deepcopy
 from c7n.ctx import ExecutionContext
 from c7n.filters import Filter
 from c7n.filters.core import trim_runtime
+from c7n.manager import iter_filters
 from c7n.resources.ec2 import EC2
 from c7n.tags import Tag
 from .common import BaseTest, instance, Bag
@@ -95,6 +96,77 @@ class TestEC2Manager(BaseTest):
         m.filters[1].filters.append(f)
         self.assertEqual(f.get_block_operator(), 'not')
 
+    def test_filter_block_parent_parsed(self):
+        p = self.load_policy({
+            'name': 'xyz',
+            'resource': 'ec2',
+            'filters': [
+                {'tag:App': 'present'},
+                {'and': [{'or': [{'tag:Env': 'present'}]}]},
+                {'not': [{'tag:Owner': 'absent'}]}]})
+        m = p.resource_manager
+
+        # parents are resolved at parse time, without walking the filter tree
+        self.patch(m, 'iter_filters', None)
+        self.assertEqual(
+            [f.get_block_operator() for f in iter_filters(m.filters) if f.type == 'value'],
+            ['and', 'or', 'not'])
+        self.assertIs(m.filters[0].get_block_parent(), m)
+        self.assertIs(
+            m.filters[1].filters[0].filters[0].get_block_parent(),
+            m.filters[1].filters[0])
+
+    def test_required_fields(self):
+        p = self.load_policy({
+            'name': 'topics',
+            'resource': 'aws.sns',
+            'filters': [
+                {'KmsMasterKeyId': 'absent'},
+                {'or': [
+                    {'type': 'value', 'key': 'length(Policy.Statement[])', 'value': 2},
+                    {'type': 'marked-for-op', 'op': 'delete'}]}]},
+            config={'minimal_augment': True})
+        m = p.resource_manager
+        self.assertEqual(
+            m.get_required_fields(),
+            {'TopicArn', 'DisplayName', 'SubscriptionsConfirmed', 'SubscriptionsPending',
+             'SubscriptionsDeleted', 'KmsMasterKeyId', 'Policy', 'Statement', 'Tags'})
+        self.assertTrue(m.needs_fields(('Tags',)))
+        self.assertFalse(m.needs_fields(('Owner',)))
+
+        p = self.load_policy({
+            'name': 'topics',
+            'resource': 'aws.sns',
+            'filters': [{'KmsMasterKeyId': 'absent'}],
+            'actions': ['delete']},
+            config={'minimal_augment': True})
+        self.assertEqual(p.resource_manager.get_required_fields(), None)
+        self.assertTrue(p.resource_manager.needs_fields(('Owner',)))
+
+        p = self.load_policy({
+            'name': 'topics',
+            'resource': 'aws.sns',
+            'filters': [{
+                'type': 'value', 'key': 'DisplayName',
+                'value_type': 'expr', 'value': 'Owner'}]},
+            config={'minimal_augment': True})
+        self.assertIn('Owner', p.resource_manager.get_required_fields())
+
+        # without minimal augmentation every field is needed
+        p = self.load_policy({'name': 'topics', 'resource': 'aws.sns'})
+        self.assertTrue(p.resource_manager.needs_fields(('Owner',)))
+
+    def test_required_fields_related_manager(self):
+        p = self.load_policy({
+            'name': 'subscriptions',
+            'resource': 'aws.sns-subscription',
+            'filters': [{'type': 'topic', 'key': 'tag:Owner', 'value': 'kapil'}]},
+            config={'minimal_augment': True})
+        # the related topics are read by the filter, so they're fully augmented
+        topics = p.resource_manager.filters[0].get_resource_manager()
+        self.assertEqual(topics.get_required_fields(), None)
+        self.assertTrue(topics.needs_fields(('Tags',)))
+
     def test_get_resource_manager(self):
         p = self.load_policy(
             {'resource': 'ec2',
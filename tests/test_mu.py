@@ -20,6 +20,7 @@ import zipfile
 from c7n.config import Config
 from c7n.mu import (
     custodian_archive,
+    get_base_archive,
     generate_requirements,
     get_exec_options,
     normalize_arn,
@@ -52,6 +53,8 @@ def test_get_exec_options():
             'tracer': 'default',
             'output_dir': 'gs://mybucket/myprefix',
             'log_group': 'gcp'}
+    assert get_exec_options(Config().empty(cache_max_size=64)) == {
+        'tracer': 'default', 'cache_max_size': 64}
 
 
 def test_normalize_arn():
@@ -1448,6 +1451,19 @@ class PythonArchiveTest(unittest.TestCase):
         filenames = archive.get_filenames()
         self.assertTrue("c7n/__init__.py" in filenames)
 
+    def test_custodian_archive_reuses_base_archive(self):
+        base = get_base_archive(['c7n'])
+        self.assertIs(get_base_archive(['c7n']), base)
+        archives = [custodian_archive(), custodian_archive()]
+        for archive in archives:
+            self.addCleanup(archive.remove)
+            archive.add_contents('config.json', '{}')
+            archive.close()
+        self.assertNotEqual(archives[0].path, base.path)
+        self.assertEqual(archives[0].get_checksum(), archives[1].get_checksum())
+        self.assertEqual(
+            archives[0].get_filenames(), base.get_filenames() + ['config.json'])
+
     def make_file(self):
         bench = tempfile.mkdtemp()
         path = os.path.join(bench, "foo.txt")
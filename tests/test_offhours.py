@@ -3,12 +3,14 @@
 import datetime
 import json
 import os
+from unittest import mock
 
 from dateutil import tz as tzutil
 
 from .common import BaseTest, instance
 
 from c7n.exceptions import PolicyValidationError
+from c7n.filters import offhours
 from c7n.filters.offhours import OffHour, OnHour, ScheduleParser, Time
 from c7n.testing import mock_datetime_now
 
@@ -656,6 +658,29 @@ class ScheduleParserTest(BaseTest):
             )
             self.assertEqual(OffHour({"skip-days": ["2015-12-02"]})(i), True)
 
+    def test_offhours_skip_from_resolved_once(self):
+        t = datetime.datetime(
+            year=2015,
+            month=12,
+            day=1,
+            hour=19,
+            minute=5,
+            tzinfo=tzutil.gettz("America/New_York"),
+        )
+        values_from = mock.MagicMock()
+        values_from.return_value.get_values.return_value = ["2015-12-02"]
+        self.patch(offhours, "ValuesFrom", values_from)
+        f = OffHour({"skip-days-from": {"url": "s3://test-dest/holidays.csv", "format": "csv"}})
+        resources = [
+            instance(InstanceId="i-%d" % n, Tags=[{"Key": "maid_offhours", "Value": "tz=est"}])
+            for n in range(5)]
+        with mock_datetime_now(t, datetime):
+            self.assertEqual(len(f.process(resources)), 5)
+            self.assertEqual(len(f.process(resources)), 5)
+        # skip days are fetched once per run, not per resource
+        self.assertEqual(values_from.return_value.get_values.call_count, 2)
+        self.assertEqual(list(f.schedules), [("tz=est", "off")])
+
     def test_onhour_skip(self):
         t = datetime.datetime(
             year=2015,
@@ -11,7 +11,8 @@ from dateutil.parser import parse as date_parse
 
 from c7n.ctx import ExecutionContext
 from c7n.config import Config
-from c7n.output import DirectoryOutput, BlobOutput, LogFile, metrics_outputs
+from c7n.output import (
+    DirectoryOutput, BlobOutput, LogFile, active_contexts, metrics_outputs)
 from c7n.resources.aws import S3Output, MetricsOutput, inspect_bucket_region
 from c7n.testing import mock_datetime_now, TestUtils
 
@@ -121,6 +122,20 @@ class S3OutputTest(TestUtils):
             content = fh.read().strip()
             self.assertTrue(content.endswith("hello world"))
 
+    def test_log_filter_concurrent_context(self):
+        ctx, other = Bag(log_dir='xyz'), Bag(log_dir='abc')
+        output = LogFile(ctx, {})
+        record = logging.LogRecord('custodian.s3', logging.INFO, '', 0, 'hi', (), None)
+        self.assertTrue(output.filter_record(record))
+
+        token = active_contexts.set((ctx,))
+        self.assertTrue(output.filter_record(record))
+        active_contexts.reset(token)
+
+        token = active_contexts.set((other,))
+        self.assertFalse(output.filter_record(record))
+        active_contexts.reset(token)
+
     def test_compress(self):
         output = self.get_s3_output()
 
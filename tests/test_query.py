@@ -5,7 +5,13 @@ import logging
 import os
 
 
-from c7n.query import ResourceQuery, RetryPageIterator, TypeInfo
+from c7n import query
+from c7n.exceptions import ClientError
+from c7n.executor import MainThreadExecutor
+from c7n.query import (
+    ChildResourceQuery, ResourceQuery, ResourceFetchPlan, RetryPageIterator, THROTTLE_CODES,
+    DescribeSource, TypeInfo, get_operation_limit)
+from c7n.utils import get_retry
 from c7n.resources.vpc import InternetGateway
 
 from botocore.config import Config
@@ -99,6 +105,48 @@ class ResourceQueryTest(BaseTest):
         assert repr(TypeInfo) == "<TypeInfo TypeInfo>"
 
 
+class ChildResourceQueryTest(BaseTest):
+
+    def test_concurrent_parents_with_throttles(self):
+        throttled = set()
+
+        class Client:
+
+            def can_paginate(self, op):
+                return False
+
+            def list_services(self, cluster):
+                # throttle the first call for each parent
+                if cluster not in throttled:
+                    throttled.add(cluster)
+                    raise ClientError(
+                        {'Error': {'Code': 'ThrottlingException'}}, 'ListServices')
+                return {'serviceArns': ['%s/svc-%d' % (cluster, i) for i in range(2)]}
+
+        p = self.load_policy(
+            {'name': 'ecs-svc', 'resource': 'aws.ecs-service'},
+            config={'child_workers': 4})
+        manager = p.resource_manager
+        manager.get_client = Client
+        manager.retry = get_retry(THROTTLE_CODES, min_delay=0.01)
+        query = ChildResourceQuery(manager.session_factory, manager, capture_parent_id=True)
+        clusters = ['c-%d' % i for i in range(10)]
+        results = query.filter(manager, parent_ids=list(clusters))
+        self.assertEqual(throttled, set(clusters))
+        self.assertEqual(
+            results,
+            [(c, '%s/svc-%d' % (c, i)) for c in clusters for i in range(2)])
+
+
+class Session:
+
+    def __init__(self, client):
+        self._client = client
+
+    def client(self, service_name):
+        return self._client
+
+
 class ConfigSourceTest(BaseTest):
 
     def test_config_select(self):
@@ -128,6 +176,105 @@ class ConfigSourceTest(BaseTest):
         p.data['query'] = [{'clause': "configuration.imageId = 'xyz'"}]
         self.assertIn("imageId = 'xyz'", source.get_query_params(None)['expr'])
 
+    def test_config_batch_get_resources(self):
+        calls = []
+        embedded_tags = [True]
+
+        def item(rid, **config):
+            return {'resourceId': rid, 'supplementaryConfiguration': {},
+                    'configuration': json.dumps(dict(TopicArn=rid, **config))}
+
+        class Client:
+
+            def batch_get_resource_config(self, resourceKeys):
+                ids = [k['resourceId'] for k in resourceKeys]
+                calls.append(('batch', len(ids)))
+                config = embedded_tags[0] and {'Tags': []} or {}
+                return {'baseConfigurationItems': [
+                    item(i, **config) for i in ids if i != 't-5'],
+                    'unprocessedResourceKeys': [
+                        k for k in resourceKeys if k['resourceId'] == 't-5']}
+
+            def get_resource_config_history(self, resourceId, resourceType, limit):
+                calls.append(('history', resourceId))
+                return {'configurationItems': [
+                    dict(item(resourceId), tags={'App': resourceId})]}
+
+        def get_source(minimal_augment=False):
+            p = self.load_policy(
+                {'name': 'x', 'resource': 'aws.sns'}, config={'minimal_augment': minimal_augment})
+            self.patch(p.resource_manager, 'executor_factory', MainThreadExecutor)
+            source = p.resource_manager.get_source('config')
+            self.patch(source, 'batch_size', 4)
+            return source
+
+        self.patch(query.ConfigSource, 'batch_unsupported', set())
+        self.patch(query.ConfigSource, 'batch_untagged', set())
+        self.patch(query, 'local_session', lambda factory: Session(Client()))
+
+        ids = ['t-%d' % i for i in range(10)]
+        resources = get_source().get_resources(ids)
+        self.assertEqual([r['TopicArn'] for r in resources], ids)
+        self.assertEqual(
+            calls, [('batch', 4), ('batch', 4), ('history', 't-5'), ('batch', 2)])
+
+        # a policy not using tags is served by the batch items of a type
+        # that doesn't embed its tags.
+        embedded_tags[0] = False
+        calls.clear()
+        resources = get_source(minimal_augment=True).get_resources(ids[:4])
+        self.assertNotIn('Tags', resources[0])
+        self.assertEqual(calls, [('batch', 4)])
+
+        # when tags are used, they come from history, and the type goes
+        # straight to history from then on.
+        calls.clear()
+        resources = get_source().get_resources(ids[:6])
+        self.assertEqual([r['TopicArn'] for r in resources], ids[:6])
+        self.assertEqual(resources[3]['Tags'], [{'Key': 'App', 'Value': 't-3'}])
+        self.assertEqual(
+            calls, [('batch', 4)] + [('history', i) for i in ids[:6]])
+        self.assertEqual(query.ConfigSource.batch_untagged, {'AWS::SNS::Topic'})
+
+    def test_config_batch_unsupported_type(self):
+        calls = []
+
+        class Client:
+
+            def batch_get_resource_config(self, resourceKeys):
+                calls.append('batch')
+                if resourceKeys[0]['resourceId'] == 'bad':
+                    message = "Value at 'resourceKeys.1.member.resourceId' failed"
+                else:
+                    message = "Value at 'resourceKeys.1.member.resourceType' failed"
+                raise ClientError(
+                    {'Error': {'Code': 'ValidationException', 'Message': message}},
+                    'BatchGetResourceConfig')
+
+            def get_resource_config_history(self, resourceId, resourceType, limit):
+                calls.append('history')
+                return {'configurationItems': [{
+                    'resourceId': resourceId, 'supplementaryConfiguration': {},
+                    'configuration': {'InstanceId': resourceId}}]}
+
+        p = self.load_policy({'name': 'x', 'resource': 'ec2'})
+        self.patch(p.resource_manager, 'executor_factory', MainThreadExecutor)
+        source = p.resource_manager.get_source('config')
+        self.patch(source, 'batch_size', 2)
+        self.patch(source, 'batch_unsupported', set())
+        self.patch(source, 'batch_untagged', set())
+        self.patch(query, 'local_session', lambda factory: Session(Client()))
+
+        # a rejected id isn't held against the resource type
+        self.assertEqual(len(source.get_resources(['bad'])), 1)
+        self.assertEqual(source.batch_unsupported, set())
+
+        calls.clear()
+        resources = source.get_resources(['i-1', 'i-2', 'i-3'])
+        self.assertEqual(len(resources), 3)
+        # the rejected type is remembered, later batches go straight to history
+        self.assertEqual(calls, ['batch', 'history', 'history', 'history'])
+
 
 class QueryResourceManagerTest(BaseTest):
 
@@ -154,6 +301,145 @@ class QueryResourceManagerTest(BaseTest):
         p.run()
         self.assertTrue("Using cached internet-gateway: 3", output.getvalue())
 
+    def test_fetch_plan_shares_resources(self):
+        session_factory = self.replay_flight_data("test_query_manager")
+        policies = [
+            self.load_policy(
+                {"name": "igw-%d" % i,
+                 "resource": "internet-gateway",
+                 "filters": [{"InternetGatewayId": "igw-2e65104a"}]},
+                session_factory=session_factory)
+            for i in range(3)]
+        other = self.load_policy(
+            {"name": "igw-query", "resource": "internet-gateway",
+             "source": "config"},
+            session_factory=session_factory)
+
+        fetches = []
+        for p in policies:
+            source = p.resource_manager.source
+            self.patch(
+                source, 'resources',
+                lambda query, resources=source.resources: fetches.append(1) or resources(query))
+
+        plan = ResourceFetchPlan(policies + [other])
+        self.assertEqual(len(plan.pending), 1)
+        self.assertNotIn(id(other), plan.policy_keys)
+
+        for p in policies:
+            resources = p.run()
+            self.assertEqual(len(resources), 1)
+            # annotations by one policy should not leak into another's set
+            resources[0]['c7n:test'] = p.name
+            plan.release(p)
+        self.assertEqual(len(fetches), 1)
+        self.assertEqual(plan.resources, {})
+
+    def test_stream_resources(self):
+        session_factory = self.replay_flight_data("test_query_model")
+        p = self.load_policy(
+            {
+                "name": "igw-check",
+                "resource": "internet-gateway",
+                "filters": [{"InternetGatewayId": "igw-3d9e3d56"}],
+            },
+            config={"batch_size": 2},
+            session_factory=session_factory,
+        )
+        batches = []
+        augment = p.resource_manager.augment
+        self.patch(
+            p.resource_manager, 'augment',
+            lambda resources: batches.append(len(resources)) or augment(resources))
+        resources = p.run()
+        self.assertEqual(len(resources), 1)
+        self.assertEqual(batches, [2, 1])
+
+    def test_stream_set_scoped_filter(self):
+        p = self.load_policy(
+            {
+                "name": "igw-check",
+                "resource": "internet-gateway",
+                "filters": [{"type": "reduce", "limit": 1}],
+            },
+            config={"batch_size": 2},
+        )
+        self.assertEqual(p.resource_manager.get_batch_size(), None)
+
+    def test_stream_related_manager(self):
+        p = self.load_policy(
+            {"name": "igw-check", "resource": "internet-gateway"},
+            config={"batch_size": 2})
+        self.assertEqual(p.resource_manager.get_batch_size(), 2)
+        # related managers enumerate in full, populating the cache
+        self.assertEqual(
+            p.resource_manager.get_resource_manager('vpc').get_batch_size(), None)
+
+    def test_scalar_augment_adaptive_limit(self):
+        throttled = set()
+
+        class Client:
+
+            def get_topic_attributes(self, TopicArn):
+                if TopicArn not in throttled:
+                    throttled.add(TopicArn)
+                    raise ClientError(
+                        {'Error': {'Code': 'Throttling'}}, 'GetTopicAttributes')
+                return {'Attributes': {'DisplayName': TopicArn.rsplit(':', 1)[-1]}}
+
+        p = self.load_policy(
+            {'name': 'sns', 'resource': 'aws.sns'},
+            config={'augment_workers': 4, 'region': 'eu-south-2'})
+        manager = p.resource_manager
+        manager.get_client = Client
+        manager.retry = get_retry(THROTTLE_CODES, min_delay=0.01)
+        topics = [{'TopicArn': 'arn:aws:sns:eu-south-2:644160558196:t%d' % i} for i in range(12)]
+        resources = DescribeSource(manager).augment(topics)
+        self.assertEqual(
+            [r['DisplayName'] for r in resources], ['t%d' % i for i in range(12)])
+
+        limit = get_operation_limit(
+            (manager.config.account_id, 'eu-south-2', 'sns', 'get_topic_attributes'), 8)
+        self.assertEqual(limit.calls, 24)
+        self.assertEqual(limit.throttles, 12)
+        self.assertEqual(limit.active, 0)
+        self.assertTrue(1 <= limit.limit < 4)
+        # the limit is shared per account, and not resized by later callers
+        self.assertEqual(limit.max_limit, 4)
+        self.assertIsNot(
+            get_operation_limit(('123456789012', 'eu-south-2', 'sns', 'get_topic_attributes'), 4),
+            limit)
+
+    def test_minimal_augment_skips_detail(self):
+        p = self.load_policy(
+            {'name': 'sns', 'resource': 'aws.sns',
+             'filters': [{'TopicArn': 'present'}]},
+            config={'minimal_augment': True})
+        manager = p.resource_manager
+        # report fields are missing from the listing, so details are fetched
+        manager.get_client = lambda: self.fail('unexpected detail call')
+        self.assertFalse(DescribeSource(manager).has_required_fields([{'TopicArn': 'a'}]))
+
+        self.patch(manager.resource_type, 'default_report_fields', ('TopicArn',))
+        manager._required_fields = ()
+        topics = [{'TopicArn': 'arn:aws:sns:us-east-1:644160558196:t1', 'DisplayName': 't1'}]
+        self.assertEqual(DescribeSource(manager).augment(topics), topics)
+
+    def test_minimal_augment_cache_key(self):
+        present, tagged, full = [
+            self.load_policy(
+                {'name': 'sns', 'resource': 'aws.sns', 'filters': [f]},
+                config={'minimal_augment': minimal})
+            for f, minimal in (
+                ({'TopicArn': 'present'}, True),
+                ({'tag:Env': 'prod'}, True),
+                ({'TopicArn': 'present'}, False))]
+        keys = [
+            ResourceFetchPlan.get_plan_key(p) for p in (present, tagged, full)]
+        self.assertEqual(len(set(keys)), 3)
+        self.assertIn('Tags', tagged.resource_manager.get_cache_key(None)['fields'])
+        self.assertNotIn('fields', full.resource_manager.get_cache_key(None))
+
     def test_get_resources(self):
         session_factory = self.replay_flight_data("test_query_manager_get")
         p = self.load_policy(
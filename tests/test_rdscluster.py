@@ -7,6 +7,7 @@ import c7n.resources.rdscluster
 import pytest
 from c7n.executor import MainThreadExecutor
 from c7n.exceptions import PolicyValidationError
+from c7n.query import ConfigSource
 from c7n.resources.rdscluster import RDSCluster, _run_cluster_method
 from c7n.testing import mock_datetime_now
 from dateutil import parser
@@ -553,8 +554,22 @@ class RDSClusterTest(BaseTest):
 
 class RDSClusterSnapshotTest(BaseTest):
 
+    def test_rdscluster_snapshot_config_batch(self):
+        session_factory = self.replay_flight_data("test_rdscluster_snapshot_config_batch")
+        p = self.load_policy(
+            {"name": "rdscluster-snapshot-simple",
+             "source": "config",
+             "resource": "rds-cluster-snapshot"},
+            session_factory=session_factory,
+        )
+        resources = p.run()
+        self.assertEqual(len(resources), 2)
+        self.assertEqual(resources[-1]['Tags'], [{'Key': 'Owner', 'Value': 'kapil'}])
+
     def test_rdscluster_snapshot_config(self):
         session_factory = self.replay_flight_data("test_rdscluster_snapshot_config")
+        # recorded before batch retrieval, so exercises config history
+        self.patch(ConfigSource, 'batch_unsupported', {'AWS::RDS::DBClusterSnapshot'})
         p = self.load_policy(
             {"name": "rdscluster-snapshot-simple",
              "source": "config",
@@ -13,7 +13,7 @@ from .test_s3 import destroyBucket
 
 from c7n.cache import SqlKvCache
 from c7n.config import Config
-from c7n.resolver import ValuesFrom, URIResolver
+from c7n.resolver import DocumentRegistry, ValuesFrom, URIResolver
 
 from pytest_terraform import terraform
 
@@ -148,6 +148,37 @@ def test_value_from_sqlkv(tmp_path):
     assert values.get_values() == {"magic"}
 
 
+def test_value_from_document_registry():
+    fetches = []
+
+    class Resolver:
+        def fetch(self, uri, headers, etag=None):
+            fetches.append((uri, etag))
+            if etag == "v1":
+                return None, etag
+            return json.dumps([{"bean": "magic", "pod": "pea"}]), "v1"
+
+    documents = DocumentRegistry()
+    mgr = Bag({"session_factory": None, "_cache": None,
+               "config": Config.empty(account_id=ACCOUNT_ID),
+               "value_documents": documents})
+
+    def get_values(expr):
+        values = ValuesFrom({"url": "moon", "expr": expr, "format": "json"}, mgr)
+        values.resolver = Resolver()
+        return values.get_values()
+
+    assert get_values("[].bean") == {"magic"}
+    assert get_values("[].pod") == {"pea"}
+    assert get_values("[].bean") == {"magic"}
+    assert fetches == [("moon", None)]
+
+    # later runs revalidate the document
+    documents.start_run()
+    assert get_values("[].pod") == {"pea"}
+    assert fetches == [("moon", None), ("moon", "v1")]
+
+
 class UrlValueTest(BaseTest):
 
     def setUp(self):
@@ -124,6 +124,27 @@ def test_s3_assembly_detect_denied(test):
         'Logging', 'Notification', 'Lifecycle']
 
 
+def test_s3_assembly_minimal_augment(test):
+    policy = test.load_policy(
+        {'name': 's3-attrs',
+         'resource': 's3',
+         'filters': [
+             {'Versioning.Status': 'Enabled'},
+             {'type': 'value', 'key': 'Logging', 'value': 'absent'}]},
+        config={'minimal_augment': True})
+    assembly = s3.BucketAssembly(policy.resource_manager)
+    assert assembly.detect_augment_fields() == ['Versioning', 'Logging']
+    assert policy.resource_manager.needs_fields(('Tags',)) is False
+
+    policy = test.load_policy(
+        {'name': 's3-attrs',
+         'resource': 's3',
+         'filters': [{'type': 'cross-account'}]},
+        config={'minimal_augment': True})
+    assembly = s3.BucketAssembly(policy.resource_manager)
+    assert len(assembly.detect_augment_fields()) == len(s3.S3_AUGMENT_TABLE)
+
+
 def test_s3_express(test):
     session_factory = test.replay_flight_data('test_s3_express')
     p = test.load_policy(
@@ -7,7 +7,8 @@ import time
 from freezegun import freeze_time
 from unittest.mock import MagicMock, call
 
-from c7n.tags import universal_retry, coalesce_copy_user_tags
+from c7n import utils
+from c7n.tags import universal_augment, universal_retry, coalesce_copy_user_tags, TagPrefetch
 from c7n.exceptions import PolicyExecutionError, PolicyValidationError
 from c7n.utils import yaml_load
 
@@ -163,6 +164,49 @@ class UniversalTagTest(BaseTest):
         results = policy.run()
         self.assertTrue('Tags' in results[0])
 
+    def test_universal_augment_tag_prefetch(self):
+        calls = []
+
+        class Client:
+
+            def get_paginator(self, op):
+                return self
+
+            def paginate(self, ResourceTypeFilters):
+                calls.append(('sweep', ResourceTypeFilters))
+                return [{'ResourceTagMappingList': [
+                    {'ResourceARN': arns[0], 'Tags': [{'Key': 'App', 'Value': 'one'}]}]}]
+
+            def get_resources(self, ResourceARNList):
+                calls.append(('arns', ResourceARNList))
+                return {'ResourceTagMappingList': [
+                    {'ResourceARN': arn, 'Tags': []} for arn in ResourceARNList]}
+
+        class Session:
+
+            def client(self, service_name, region_name=None):
+                return Client()
+
+        self.patch(utils, 'local_session', lambda factory: Session())
+        policies = [
+            self.load_policy({'name': 'streams', 'resource': 'aws.kinesis'}),
+            self.load_policy({'name': 'firehose', 'resource': 'aws.firehose'})]
+        TagPrefetch(policies)
+        manager = policies[0].resource_manager
+        resources = [{'StreamName': 'one'}, {'StreamName': 'two'}]
+        arns = manager.get_arns(resources)
+
+        universal_augment(manager, resources)
+        self.assertEqual(resources[0]['Tags'], [{'Key': 'App', 'Value': 'one'}])
+        self.assertEqual(resources[1]['Tags'], [])
+        self.assertEqual(calls, [
+            ('sweep', ['firehose:deliverystream', 'kinesis:stream']),
+            ('arns', [arns[1]])])
+
+        # the region is swept once for every planned type
+        universal_augment(policies[1].resource_manager, [{'DeliveryStreamName': 'three'}])
+        self.assertEqual(len([c for c in calls if c[0] == 'sweep']), 1)
+
     def test_retry_no_error(self):
         mock = MagicMock()
         mock.side_effect = [{"Result": 42}]
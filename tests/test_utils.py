@@ -1,5 +1,6 @@
 # Copyright The Cloud Custodian Authors.
 # SPDX-License-Identifier: Apache-2.0
+import copy
 import json
 import pytest
 import ipaddress
@@ -965,6 +966,30 @@ def test_parse_date_floor():
     assert utils.parse_date('30') is None
 
 
+def test_get_tag_map():
+    r = {'Tags': [
+        {'Key': 'App', 'Value': 'web'},
+        {'Key': ' Env', 'Value': 'prod'},
+        {'Key': 'App', 'Value': 'db'}]}
+    assert utils.get_tag_map(r) == {'App': 'web', ' Env': 'prod'}
+    assert isinstance(r['Tags'], utils.TagList)
+    assert utils.get_tag_map(r) is utils.get_tag_map(r)
+    assert utils.get_tag_map(r, str.strip) == {'App': 'web', 'Env': 'prod'}
+
+    # modifying the tag list drops the cached maps
+    r['Tags'].append({'Key': 'Owner', 'Value': 'ops'})
+    assert utils.get_tag_map(r)['Owner'] == 'ops'
+    r['Tags'][0] = {'Key': 'App', 'Value': 'api'}
+    assert utils.get_tag_map(r)['App'] == 'api'
+
+    # copies and serialization carry just the tags
+    assert json.loads(utils.dumps(r))['Tags'] == list(r['Tags'])
+    assert '_maps' not in copy.deepcopy(r)['Tags'].__dict__
+
+    assert utils.get_tag_map({}) == {}
+    assert utils.get_tag_map({'Tags': {'App': 'web'}}) == {}
+
+
 def test_output_path_join():
     assert utils.join_output_path(
         's3://cross-region-c7n/iam-check?region=us-east-2',
@@ -3,10 +3,13 @@
 import logging
 import time
 from .common import BaseTest, functional, event_data, load_data
+from unittest import mock
 from unittest.mock import MagicMock
 
 from botocore.exceptions import ClientError as BotoClientError
 from c7n.exceptions import PolicyValidationError
+from c7n.query import ResourceFetchPlan
+from c7n.resources import vpc
 from c7n.resources.aws import shape_validate
 from pytest_terraform import terraform
 
@@ -2412,6 +2415,41 @@ class SecurityGroupTest(BaseTest):
         self.assertNotEqual(resources[0]["GroupId"], "sg-0f026884bba48e351")  # used
         self.assertEqual(resources[0]["GroupId"], "sg-e2842c8b")             # not used
 
+    def test_usage_scan_shared(self):
+        scans = []
+
+        def scanner():
+            scans.append(1)
+            return {'sg-used'}
+
+        resources = [
+            {'GroupId': 'sg-used', 'VpcId': 'vpc-1'},
+            {'GroupId': 'sg-peered', 'VpcId': 'vpc-1'},
+            {'GroupId': 'sg-unused', 'VpcId': 'vpc-1'}]
+        peer_lookups = []
+
+        class Client:
+            def describe_security_group_references(self, GroupId):
+                peer_lookups.append(GroupId)
+                return {'SecurityGroupReferenceSet': [
+                    {'GroupId': 'sg-peered'}] if 'sg-peered' in GroupId else []}
+
+        self.patch(vpc, 'local_session', lambda factory: mock.Mock(client=lambda s: Client()))
+        policies = []
+        for name in ('sg-unused-1', 'sg-unused-2', 'sg-unused-3'):
+            p = self.load_policy(
+                {'name': name, 'resource': 'security-group', 'filters': ['unused']})
+            self.patch(p.resource_manager.filters[0], 'get_scanners', lambda: (('nics', scanner),))
+            policies.append(p)
+        ResourceFetchPlan(policies[:2])
+
+        results = [p.resource_manager.filters[0].process(list(resources)) for p in policies]
+        self.assertEqual(results, [[{'GroupId': 'sg-unused', 'VpcId': 'vpc-1'}]] * 3)
+        # the second policy of the run reuses the usage scan and peered
+        # reference lookups, a policy outside the run scans for itself.
+        self.assertEqual(len(scans), 2)
+        self.assertEqual(peer_lookups, [['sg-peered', 'sg-unused']] * 2)
+
     def test_unused(self):
         factory = self.replay_flight_data("test_security_group_unused")
         p = self.load_policy(
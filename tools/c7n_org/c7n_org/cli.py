@@ -3,6 +3,7 @@
 """Run a custodian policy across an organization's accounts
 """
 
+import copy
 import csv
 from collections import Counter
 from datetime import timedelta, datetime
@@ -26,17 +27,21 @@ import jsonschema
 
 from c7n.credentials import assumed_session, SessionFactory
 from c7n.executor import MainThreadExecutor
-from c7n.exceptions import InvalidOutputConfig
+from c7n.exceptions import InvalidOutputConfig, PolicyValidationError
 from c7n.config import Config
 from c7n.policy import PolicyCollection
 from c7n.provider import get_resource_class, clouds as cloud_providers
+from c7n.query import THROTTLE_CODES
 from c7n.reports.csvout import Formatter, fs_record_set, record_set, strip_output_path
-from c7n.resources import load_available
+from c7n.resources import load_resources
+from c7n.schema import validate as schema_validate
+from c7n.structure import StructureParser
 from c7n.utils import (
     CONN_CACHE, dumps, filter_empty, format_string_values, get_policy_provider, join_output_path)
 
 from c7n_org.utils import environ, account_tags
 from c7n_org import orgaccounts
+from c7n_org.scheduler import Scheduler, TaskDurations
 
 log = logging.getLogger('c7n_org')
 
@@ -212,12 +217,62 @@ def init(config, use, debug, verbose, accounts, tags, policies,
     filter_policies(custodian_config, policy_tags, policies, resource)
     filter_accounts(accounts_config, tags, accounts, not_accounts)
 
-    load_available()
+    init_worker(get_resource_types(custodian_config))
     MainThreadExecutor.c7n_async = False
     executor = debug and MainThreadExecutor or ProcessPoolExecutor
     return accounts_config, custodian_config, executor
 
 
+def get_resource_types(policies_config):
+    return sorted(StructureParser().get_resource_types(policies_config))
+
+
+# resource types loaded in this process
+LOADED_RESOURCE_TYPES = set()
+
+
+def init_worker(resource_types):
+    """Load the providers and resource types used by a run's policies.
+
+    Used as the process pool initializer, so each worker process imports
+    just these once rather than every installed provider per account.
+    Other resource types referenced by filters load lazily on use.
+    """
+    missing = set(resource_types).difference(LOADED_RESOURCE_TYPES)
+    if missing:
+        load_resources(sorted(missing))
+        LOADED_RESOURCE_TYPES.update(missing)
+
+
+def validate_policies(policies_config):
+    """Validate policies once, before fanning out.
+
+    As with ``custodian validate``, policies are checked against the
+    schema and then loaded and validated with account variables still
+    unexpanded.
+    """
+    structure = StructureParser()
+    structure.validate(policies_config)
+    resource_types = get_resource_types(policies_config)
+    missing = load_resources(resource_types)
+    if missing:
+        raise PolicyValidationError(
+            "Policies reference unknown resources: %s" % ", ".join(missing))
+    errors = schema_validate(policies_config, resource_types=resource_types)
+    if errors:
+        raise PolicyValidationError(
+            "Failed to validate policy %s\n %s\n" % (errors[1], errors[0]))
+
+    null_config = Config.empty(dryrun=True, account_id='na', region='na')
+    for p in policies_config.get('policies', ()):
+        try:
+            PolicyCollection.from_data(
+                {'policies': [copy.deepcopy(p)]}, null_config).policies[0].validate()
+        except Exception as e:
+            raise PolicyValidationError(
+                "Policy: %s is invalid: %s" % (p.get('name', 'unknown'), e))
+
+
 def resolve_regions(regions, account):
     if 'all' in regions:
         try:
@@ -324,7 +379,7 @@ def report_account(account, region, policies_config, output_path, cache_path, de
     output_path = os.path.join(output_path, account['name'], region)
     cache_path = os.path.join(cache_path, "%s-%s.cache" % (account['name'], region))
 
-    load_available()
+    init_worker(get_resource_types(policies_config))
     config = Config.empty(
         region=region,
         output_dir=output_path,
@@ -612,11 +667,15 @@ def _update(old, new):
 def run_account(account, region, policies_config, output_path,
                 cache_period, cache_path, metrics, dryrun, debug):
     """Execute a set of policies on an account.
+
+    Policy errors are logged, except for a throttled assume of the account
+    role before any policy has run, which is raised so the execution can
+    be retried.
     """
     logging.getLogger('custodian.output').setLevel(logging.ERROR + 1)
     CONN_CACHE.session = None
     CONN_CACHE.time = None
-    load_available()
+    init_worker(get_resource_types(policies_config))
 
     output_path = join_output_path(output_path, account['name'], region)
 
@@ -673,6 +732,12 @@ def run_account(account, region, policies_config, output_path,
                     account['name'], region, p.name, len(resources),
                     time.time() - st)
             except ClientError as e:
+                if (success and not policy_counts and e.operation_name == 'AssumeRole' and
+                        e.response['Error']['Code'] in THROTTLE_CODES):
+                    # the account role is assumed on the first policy's first
+                    # api call, so no policy has run yet and the scheduler
+                    # can retry the execution.
+                    raise
                 success = False
                 if e.response['Error']['Code'] == 'AccessDenied':
                     log.warning('Access denied api:%s policy:%s account:%s region:%s',
@@ -737,11 +802,15 @@ def initialize_provider_output(policies_config, output_dir, regions):
 @click.option("--metrics", default=False, is_flag=True)
 @click.option("--metrics-uri", default=None, help="Configure provider metrics target")
 @click.option("--dryrun", default=False, is_flag=True)
+@click.option('--account-workers', default=None, type=int,
+              help="Max regions executing concurrently per account")
+@click.option('--region-workers', default=None, type=int,
+              help="Max accounts executing concurrently per region")
 @click.option('--debug', default=False, is_flag=True)
 @click.option('-v', '--verbose', default=False, help="Verbose", is_flag=True)
 def run(config, use, output_dir, accounts, not_accounts, tags, region,
         policy, policy_tags, cache_period, cache_path, metrics,
-        dryrun, debug, verbose, metrics_uri):
+        dryrun, account_workers, region_workers, debug, verbose, metrics_uri):
     """run a custodian policy across accounts"""
     accounts_config, custodian_config, executor = init(
         config, use, debug, verbose, accounts, tags, policy, policy_tags=policy_tags,
@@ -764,14 +833,25 @@ def run(config, use, output_dir, accounts, not_accounts, tags, region,
         if not os.path.exists(cache_path):
             os.makedirs(cache_path)
 
+    try:
+        validate_policies(custodian_config)
+    except PolicyValidationError as e:
+        log.error("Invalid policies: %s", e)
+        sys.exit(1)
+
     output_dir = initialize_provider_output(custodian_config, output_dir, region)
 
-    with executor(max_workers=WORKER_COUNT) as w:
-        futures = {}
+    durations = TaskDurations(cache_path).load()
+    with executor(
+            max_workers=WORKER_COUNT, initializer=init_worker,
+            initargs=(get_resource_types(custodian_config),)) as w:
+        scheduler = Scheduler(
+            w, WORKER_COUNT, durations,
+            account_limit=account_workers, region_limit=region_workers)
         for a in accounts_config['accounts']:
             for r in resolve_regions(region or a.get('regions', ()), a):
-                futures[w.submit(
-                    run_account,
+                scheduler.add(
+                    a, r, run_account,
                     a, r,
                     custodian_config,
                     output_dir,
@@ -779,10 +859,9 @@ def run(config, use, output_dir, accounts, not_accounts, tags, region,
                     cache_path,
                     metrics,
                     dryrun,
-                    debug)] = (a, r)
+                    debug)
 
-        for f in as_completed(futures):
-            a, r = futures[f]
+        for a, r, f in scheduler.run():
             if f.exception():
                 if debug:
                     raise
@@ -797,6 +876,7 @@ def run(config, use, output_dir, accounts, not_accounts, tags, region,
 
             if not account_region_success:
                 success = False
+    durations.save()
 
     log.info("Policy resource counts %s" % policy_counts)
 
@@ -0,0 +1,203 @@
+# Copyright The Cloud Custodian Authors.
+# SPDX-License-Identifier: Apache-2.0
+"""Schedule account/region executions across a worker pool.
+"""
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, wait
+import json
+import logging
+import os
+import time
+
+from botocore.exceptions import ClientError
+
+from c7n.query import THROTTLE_CODES
+from c7n.utils import backoff_delays
+
+log = logging.getLogger('c7n_org')
+
+
+class TaskDurations:
+    """Execution time of previous runs by account and region.
+
+    Persisted as json in the c7n-org cache directory, and used to
+    start the longest running account/regions first.
+    """
+
+    file_name = 'durations.json'
+
+    def __init__(self, cache_path=None):
+        self.path = cache_path and os.path.join(cache_path, self.file_name) or None
+        self.data = {}
+
+    @staticmethod
+    def get_key(account, region):
+        return "%s:%s" % (account['name'], region)
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return self
+        try:
+            with open(self.path) as fh:
+                self.data = json.load(fh)
+        except ValueError:
+            log.warning("ignoring invalid task durations file %s", self.path)
+        return self
+
+    def save(self):
+        if not self.path:
+            return
+        with open(self.path, 'w') as fh:
+            json.dump(self.data, fh, indent=2, sort_keys=True)
+
+    def get(self, account, region):
+        return self.data.get(self.get_key(account, region))
+
+    def set(self, account, region, duration):
+        self.data[self.get_key(account, region)] = round(duration, 2)
+
+
+class Task:
+
+    def __init__(self, account, region, func, args, estimate):
+        self.account = account
+        self.region = region
+        self.func = func
+        self.args = args
+        self.estimate = estimate
+        self.attempts = 0
+        self.delays = None
+        self.not_before = 0
+        self.started = None
+
+
+class Scheduler:
+    """Run account/region tasks longest first with concurrency caps.
+
+    Tasks are ordered by their previous duration, with account/regions
+    that have no history treated as the longest, so large accounts start
+    early rather than forming the tail of the run. Concurrent tasks are
+    additionally capped per account and per region to stay under api
+    rate limits. Tasks that raise a throttling error, which for run_account
+    is only a throttled role assumption before any policy has run, are
+    retried with backoff, and progress with an estimated time remaining is
+    logged periodically.
+    """
+
+    max_attempts = 3
+    min_delay = 5
+    max_delay = 120
+    progress_interval = 60
+
+    def __init__(self, executor, workers, durations=None,
+                 account_limit=None, region_limit=None):
+        self.executor = executor
+        self.workers = workers
+        self.durations = durations or TaskDurations()
+        self.account_limit = account_limit or workers
+        self.region_limit = region_limit or workers
+        self.tasks = []
+        self.completed = 0
+        self.completed_duration = 0
+        self.started = None
+        self.last_progress = 0
+
+    def add(self, account, region, func, *args):
+        self.tasks.append(Task(
+            account, region, func, args, self.durations.get(account, region)))
+
+    def get_slots(self, task):
+        return ('account', task.account['name']), ('region', task.region)
+
+    def run(self):
+        """Execute tasks, yielding (account, region, future) as each completes."""
+        known = [t.estimate for t in self.tasks if t.estimate is not None]
+        longest = known and max(known) or 0
+        for t in self.tasks:
+            if t.estimate is None:
+                t.estimate = longest
+        queue = sorted(self.tasks, key=lambda t: t.estimate, reverse=True)
+        running = {}
+        active = Counter()
+        self.started = self.last_progress = time.time()
+
+        while queue or running:
+            now = time.time()
+            remaining = []
+            for task in queue:
+                account, region = self.get_slots(task)
+                if (len(running) >= self.workers or task.not_before > now or
+                        active[account] >= self.account_limit or
+                        active[region] >= self.region_limit):
+                    remaining.append(task)
+                    continue
+                active[account] += 1
+                active[region] += 1
+                task.started = now
+                running[self.executor.submit(task.func, *task.args)] = task
+            queue = remaining
+
+            timeout = None
+            waiting = [t.not_before for t in queue if t.not_before > now]
+            if waiting:
+                timeout = max(min(waiting) - now, 0)
+            if not running:
+                time.sleep(timeout or 0)
+                continue
+
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            for f in [f for f in running if f in done]:
+                task = running.pop(f)
+                for slot in self.get_slots(task):
+                    active[slot] -= 1
+                if self.should_retry(task, f):
+                    queue.append(task)
+                    queue.sort(key=lambda t: t.estimate, reverse=True)
+                    continue
+                duration = time.time() - task.started
+                self.durations.set(task.account, task.region, duration)
+                self.completed += 1
+                self.completed_duration += duration
+                yield task.account, task.region, f
+            self.report_progress(queue, running)
+
+    def should_retry(self, task, future):
+        error = future.exception()
+        if not isinstance(error, ClientError):
+            return False
+        if error.response['Error']['Code'] not in THROTTLE_CODES:
+            return False
+        task.attempts += 1
+        if task.attempts >= self.max_attempts:
+            return False
+        if task.delays is None:
+            task.delays = backoff_delays(self.min_delay, self.max_delay, jitter=True)
+        delay = next(task.delays, self.max_delay)
+        task.not_before = time.time() + delay
+        log.warning(
+            "Throttled account:%s region:%s attempt:%d retrying in %0.1fs",
+            task.account['name'], task.region, task.attempts, delay)
+        return True
+
+    def get_eta(self, queue, running):
+        """Estimated seconds remaining, from previous durations.
+
+        Tasks without history are estimated at the mean duration of the
+        tasks completed so far in this run.
+        """
+        now = time.time()
+        mean = self.completed and self.completed_duration / self.completed or 0
+        work = sum(t.estimate or mean for t in queue)
+        work += sum(
+            max((t.estimate or mean) - (now - t.started), 0) for t in running.values())
+        return work / self.workers
+
+    def report_progress(self, queue, running):
+        now = time.time()
+        if now - self.last_progress < self.progress_interval:
+            return
+        self.last_progress = now
+        log.info(
+            "Progress completed:%d total:%d running:%d queued:%d elapsed:%0.1f eta:%0.1f",
+            self.completed, len(self.tasks), len(running), len(queue),
+            now - self.started, self.get_eta(queue, running))
@@ -7,10 +7,14 @@ import os
 import pytest
 import yaml
 
+from botocore.exceptions import ClientError
+from c7n.executor import MainThreadExecutor
+from c7n.policy import Policy
 from c7n.testing import TestUtils
 from click.testing import CliRunner
 
 from c7n_org import cli as org
+from c7n_org.scheduler import Scheduler, TaskDurations
 
 
 ACCOUNTS_AWS_DEFAULT = yaml.safe_dump({
@@ -184,6 +188,63 @@ class OrgTest(TestUtils):
             log_output.getvalue().strip(),
             "Policy resource counts Counter({'compute': 96, 'serverless': 48})")
 
+    def test_cli_run_invalid_policy(self):
+        run_dir = self.setup_run_dir(
+            policies={'policies': [{
+                'name': 'compute',
+                'resource': 'aws.ec2',
+                'filters': [{'type': 'not-a-filter'}]}]})
+        logger = mock.MagicMock()
+        run_account = mock.MagicMock()
+        run_account.return_value = ({}, True)
+        self.patch(org, 'logging', logger)
+        self.patch(org, 'run_account', run_account)
+        self.change_cwd(run_dir)
+        log_output = self.capture_logging('c7n_org')
+        runner = CliRunner()
+        result = runner.invoke(
+            org.cli,
+            ['run', '-c', 'accounts.yml', '-u', 'policies.yml',
+             '--debug', '-s', 'output', '--cache-path', 'cache'],
+            catch_exceptions=False)
+        # policies are validated once up front, not per account
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn('Invalid policies', log_output.getvalue())
+        run_account.assert_not_called()
+
+    def test_init_worker(self):
+        load_resources = mock.MagicMock()
+        self.patch(org, 'load_resources', load_resources)
+        self.patch(org, 'LOADED_RESOURCE_TYPES', set())
+        org.init_worker(['aws.ec2', 'aws.lambda'])
+        org.init_worker(['aws.ec2'])
+        org.init_worker(['aws.ec2', 'aws.sqs'])
+        self.assertEqual(
+            load_resources.call_args_list,
+            [mock.call(['aws.ec2', 'aws.lambda']), mock.call(['aws.sqs'])])
+
+    def test_run_account_assume_throttle(self):
+        account = {
+            'name': 'dev', 'account_id': '112233445566',
+            'role': 'arn:aws:iam::112233445566:role/foobar'}
+        policies = yaml.safe_load(POLICIES_AWS_DEFAULT)
+        root = self.get_temp_dir()
+        throttle = ClientError(
+            {'Error': {'Code': 'Throttling', 'Message': 'Rate exceeded'}}, 'AssumeRole')
+
+        # raised for the scheduler to retry when no policy has run yet
+        self.patch(Policy, 'run', mock.MagicMock(side_effect=[throttle]))
+        with self.assertRaises(ClientError):
+            org.run_account(
+                account, 'us-east-1', policies, root, 0, root, False, True, False)
+
+        # once a policy has run, the throttle is a policy error
+        self.patch(Policy, 'run', mock.MagicMock(side_effect=[[], throttle]))
+        self.assertEqual(
+            org.run_account(
+                account, 'us-east-1', policies, root, 0, root, False, True, False),
+            ({'compute': 0}, False))
+
     def test_filter_policies(self):
         d = {'policies': [
             {'name': 'find-ml',
@@ -366,3 +427,61 @@ class OrgTest(TestUtils):
              "--debug", "-s", "output", "--cache-path", "cache"],
             catch_exceptions=False)
         self.assertEqual(result.exit_code, 0)
+
+
+class SchedulerTest(TestUtils):
+
+    def get_scheduler(self, **kw):
+        self.patch(MainThreadExecutor, 'c7n_async', True)
+        durations = TaskDurations(self.get_temp_dir())
+        durations.data = {'dev:us-east-1': 10, 'dev:us-west-2': 300, 'qa:us-east-1': 60}
+        return Scheduler(MainThreadExecutor(), 4, durations, **kw)
+
+    def test_longest_first(self):
+        scheduler = self.get_scheduler()
+        for name in ('dev', 'qa'):
+            for region in ('us-east-1', 'us-west-2'):
+                scheduler.add({'name': name}, region, lambda n, r: (n, r), name, region)
+        results = [f.result() for _, _, f in scheduler.run()]
+        # qa:us-west-2 has no history and is treated as the longest
+        self.assertEqual(results, [
+            ('dev', 'us-west-2'), ('qa', 'us-west-2'),
+            ('qa', 'us-east-1'), ('dev', 'us-east-1')])
+
+        scheduler.durations.save()
+        durations = TaskDurations(os.path.dirname(scheduler.durations.path)).load()
+        self.assertEqual(set(durations.data), {
+            'dev:us-east-1', 'dev:us-west-2', 'qa:us-east-1', 'qa:us-west-2'})
+
+    def test_region_limit(self):
+        scheduler = self.get_scheduler(region_limit=1)
+        running = []
+
+        def task(name, region):
+            running.append(region)
+            return name
+
+        for name in ('dev', 'qa'):
+            scheduler.add({'name': name}, 'us-east-1', task, name, 'us-east-1')
+        for _ in scheduler.run():
+            # only one task per region is in flight per scheduling pass
+            self.assertEqual(running, ['us-east-1'])
+            running.clear()
+
+    def test_throttle_retry(self):
+        scheduler = self.get_scheduler()
+        scheduler.min_delay = 0.01
+        attempts = []
+
+        def task():
+            attempts.append(1)
+            if len(attempts) < 2:
+                raise ClientError(
+                    {'Error': {'Code': 'Throttling', 'Message': 'Rate exceeded'}}, 'AssumeRole')
+            return True
+
+        scheduler.add({'name': 'dev'}, 'us-east-1', task)
+        results = list(scheduler.run())
+        self.assertEqual(len(results), 1)
+        self.assertTrue(results[0][2].result())
+        self.assertEqual(len(attempts), 2)
@@ -0,0 +1,58 @@
+# /// script
+# dependencies = [
+#   "c7n",
+# ]
+# ///
+"""Micro-benchmark for filter annotation merging.
+
+Times Filter.merge_annotation over growing resource and filter counts,
+the per resource cost should stay flat as either grows.
+"""
+import argparse
+import timeit
+
+from c7n.config import Config
+from c7n.policy import Policy
+from c7n.resources import load_resources
+
+
+def build_policy(filter_count):
+    # nest value filters in alternating blocks to give the tree some depth
+    filters = []
+    for idx in range(filter_count):
+        block = ('and', 'or', 'not')[idx % 3]
+        filters.append({block: [{'tag:Key%d' % idx: 'present'}]})
+    return Policy(
+        {'name': 'bench', 'resource': 'aws.ec2', 'filters': filters},
+        Config.empty(region='us-east-1', account_id='123456789012'))
+
+
+def bench(filter_count, resource_count, repeat):
+    p = build_policy(filter_count)
+    leaves = [f for f in p.resource_manager.iter_filters() if f.type == 'value']
+    f = leaves[-1]
+    f.matched_annotation_key = 'c7n:matched-bench'
+    resources = [{'InstanceId': 'i-%d' % i} for i in range(resource_count)]
+
+    def run():
+        for r in resources:
+            f.merge_annotation(r, f.matched_annotation_key, [r['InstanceId']])
+
+    return min(timeit.repeat(run, number=1, repeat=repeat)) / resource_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=5)
+    options = parser.parse_args()
+    load_resources(('aws.ec2',))
+
+    print('%8s %10s %14s' % ('filters', 'resources', 'usec/resource'))
+    for filter_count in (10, 100, 1000):
+        for resource_count in (1000, 10000):
+            per_resource = bench(filter_count, resource_count, options.repeat)
+            print('%8d %10d %14.2f' % (filter_count, resource_count, per_resource * 1e6))
+
+
+if __name__ == '__main__':
+    main()